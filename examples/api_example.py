@@ -5,39 +5,108 @@ This example demonstrates how to interact with the FLAMEHAVEN FileSearch API ser
 using Python requests library.
 """
 
+import json
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:  # Optional: stream uploads from disk instead of buffering the body
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+try:  # Optional: faster JSON encode/decode for large search responses
+    import orjson
+except ImportError:
+    orjson = None
+
+try:  # Optional: parse sources incrementally while the body is still arriving
+    import ijson
+except ImportError:
+    ijson = None
 
 
 class FlamehavenAPIClient:
-    """Simple API client for FLAMEHAVEN FileSearch"""
+    """Simple API client for FLAMEHAVEN FileSearch
+
+    A single ``requests.Session`` is reused for every call so the TCP/TLS
+    connection to ``base_url`` stays alive across requests.
+    """
 
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        """Close the underlying HTTP session"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @staticmethod
+    def _json(response):
+        """Decode a JSON response body (orjson when available)"""
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return json.loads(response.content)
+
+    def _post_json(self, path: str, payload: dict, stream: bool = False):
+        """POST a JSON body (orjson-encoded when available)"""
+        url = f"{self.base_url}{path}"
+        if orjson is None:
+            return self.session.post(url, json=payload, stream=stream)
+        return self.session.post(
+            url,
+            data=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
+            stream=stream,
+        )
 
     def health_check(self):
         """Check API health"""
-        response = requests.get(f"{self.base_url}/health")
-        return response.json()
+        response = self.session.get(f"{self.base_url}/health")
+        return self._json(response)
+
+    def _post_multipart(self, path: str, fields: list, files: list):
+        """POST form fields + files, streaming them when requests_toolbelt exists"""
+        url = f"{self.base_url}{path}"
+        if MultipartEncoder is None:
+            return self.session.post(url, files=files, data=dict(fields))
+        encoder = MultipartEncoder(
+            fields=fields
+            + [
+                (name, (Path(f.name).name, f, "application/octet-stream"))
+                for name, f in files
+            ]
+        )
+        return self.session.post(
+            url, data=encoder, headers={"Content-Type": encoder.content_type}
+        )
 
     def upload_file(self, file_path: str, store: str = "default"):
         """Upload a file to the API"""
         with open(file_path, "rb") as f:
-            files = {"file": f}
-            data = {"store": store}
-            response = requests.post(f"{self.base_url}/upload", files=files, data=data)
-        return response.json()
+            response = self._post_multipart(
+                "/upload", [("store", store)], [("file", f)]
+            )
+        return self._json(response)
 
     def upload_multiple_files(self, file_paths: list, store: str = "default"):
         """Upload multiple files"""
         files = [("files", open(fp, "rb")) for fp in file_paths]
-        data = {"store": store}
         try:
-            response = requests.post(
-                f"{self.base_url}/upload-multiple", files=files, data=data
+            response = self._post_multipart(
+                "/upload-multiple", [("store", store)], files
             )
-            return response.json()
+            return self._json(response)
         finally:
             for _, f in files:
                 f.close()
@@ -49,42 +118,73 @@ class FlamehavenAPIClient:
             payload["model"] = model
         payload.update(kwargs)
 
-        response = requests.post(f"{self.base_url}/search", json=payload)
-        return response.json()
+        response = self._post_json("/search", payload)
+        return self._json(response)
+
+    def search_batch(self, queries: list, store: str = "default", max_results=5):
+        """Run several queries in one HTTP round trip (server runs them in parallel)"""
+        payload = {
+            "queries": [{"query": q, "store": store} for q in queries],
+            "mode": "parallel",
+            "max_results": max_results,
+        }
+        response = self._post_json("/api/batch-search", payload)
+        return self._json(response)
+
+    def search_stream(self, query: str, store: str = "default", **kwargs):
+        """Search using POST and yield sources as they are parsed
+
+        With ``ijson`` installed the response body is read in chunks and each
+        entry of ``sources`` is yielded as soon as it is complete; otherwise
+        the body is decoded in one go and its sources are yielded.
+        """
+        payload = {"query": query, "store_name": store}
+        payload.update(kwargs)
+
+        with self._post_json("/search", payload, stream=True) as response:
+            if ijson is None:
+                yield from self._json(response).get("sources", [])
+                return
+            response.raw.decode_content = True
+            yield from ijson.items(response.raw, "sources.item")
 
     def search_get(self, query: str, store: str = "default"):
         """Search using GET method (simple)"""
         params = {"q": query, "store": store}
-        response = requests.get(f"{self.base_url}/search", params=params)
-        return response.json()
+        response = self.session.get(f"{self.base_url}/search", params=params)
+        return self._json(response)
 
     def list_stores(self):
         """List all stores"""
-        response = requests.get(f"{self.base_url}/stores")
-        return response.json()
+        response = self.session.get(f"{self.base_url}/stores")
+        return self._json(response)
 
     def create_store(self, name: str):
         """Create a new store"""
         payload = {"name": name}
-        response = requests.post(f"{self.base_url}/stores", json=payload)
-        return response.json()
+        response = self._post_json("/stores", payload)
+        return self._json(response)
 
     def delete_store(self, name: str):
         """Delete a store"""
-        response = requests.delete(f"{self.base_url}/stores/{name}")
-        return response.json()
+        response = self.session.delete(f"{self.base_url}/stores/{name}")
+        return self._json(response)
 
     def get_metrics(self):
         """Get API metrics"""
-        response = requests.get(f"{self.base_url}/metrics")
-        return response.json()
+        response = self.session.get(f"{self.base_url}/metrics")
+        return self._json(response)
 
 
 def main():
     """Example usage"""
-    # Initialize client
-    client = FlamehavenAPIClient("http://localhost:8000")
+    # Initialize client (closes its connection pool on exit)
+    with FlamehavenAPIClient("http://localhost:8000") as client:
+        _run_example(client)
+
 
+def _run_example(client: FlamehavenAPIClient):
+    """Walk through the API using a shared client"""
     print("FLAMEHAVEN FileSearch API Client Example")
     print("=" * 50)
 
@@ -142,6 +242,16 @@ def main():
     except Exception as e:
         print(f"   Error: {e}")
 
+    # 4b. Search (streamed sources)
+    print("\n4b. Streaming sources")
+    try:
+        for source in client.search_stream(
+            query="What are the main topics?", store="api-example"
+        ):
+            print(f"   - {source.get('title')}")
+    except Exception as e:
+        print(f"   Error: {e}")
+
     # 5. Search (GET)
     print("\n5. Searching (GET method)")
     try:
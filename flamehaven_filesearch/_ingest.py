@@ -8,6 +8,7 @@ import os
 import time
 import hashlib
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 from urllib.parse import quote
@@ -17,20 +18,24 @@ from .engine.knowledge_atom import chunk_and_inject, inject_chunks
 logger = logging.getLogger(__name__)
 _FILENAME_ALIAS_SPLIT_RE = re.compile(r"[\s._\-]+")
 
-_SUPPORTED_EXTS = {
-    ".pdf",
-    ".docx",
-    ".doc",
-    ".hwp",
-    ".hwpx",
-    ".md",
-    ".txt",
-    ".xlsx",
-    ".xls",
-    ".pptx",
-    ".ppt",
-    ".rtf",
-}
+_SUPPORTED_EXTS = frozenset(
+    {
+        ".pdf",
+        ".docx",
+        ".doc",
+        ".hwp",
+        ".hwpx",
+        ".md",
+        ".txt",
+        ".xlsx",
+        ".xls",
+        ".pptx",
+        ".ppt",
+        ".rtf",
+    }
+)
+_IMAGE_EXTS = frozenset({".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp"})
+_ALL_EXTS = _SUPPORTED_EXTS | _IMAGE_EXTS
 
 
 class IngestMixin:
@@ -162,8 +167,16 @@ class IngestMixin:
         self._metadata_store.add_doc(store_name, doc)
 
     @staticmethod
-    def _image_extensions() -> set:
-        return {".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp"}
+    def _file_sha256(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _image_extensions() -> frozenset:
+        return _IMAGE_EXTS
 
     def upload_file(
         self,
@@ -174,29 +187,71 @@ class IngestMixin:
         """Upload and index a file. Returns status dict."""
         max_size_mb = max_size_mb or self.config.max_file_size_mb
 
-        if not os.path.exists(file_path):
+        path = Path(file_path)
+        try:
+            # One stat for existence + size (no exists/getsize race)
+            st = path.stat()
+        except OSError:
             return {"status": "error", "message": f"File not found: {file_path}"}
 
-        size_mb = os.path.getsize(file_path) / (1024 * 1024)
+        size_mb = st.st_size / (1024 * 1024)
         if size_mb > max_size_mb:
             return {
                 "status": "error",
                 "message": f"File too large: {size_mb:.1f}MB > {max_size_mb}MB",
             }
 
-        ext = Path(file_path).suffix.lower()
-        supported = _SUPPORTED_EXTS | self._image_extensions()
-        if ext not in supported:
+        ext = path.suffix.lower()
+        if ext not in _ALL_EXTS:
             logger.warning("File extension '%s' may not be supported", ext)
 
+        # Identical bytes already uploaded to this store: skip parse + upload
+        try:
+            hash_key = (store_name, self._file_sha256(path))
+        except OSError:
+            return {"status": "error", "message": f"File not found: {file_path}"}
+        previous = self._upload_hashes.get(hash_key)
+        if previous is not None and store_name in self.stores:
+            logger.info(
+                "Skipped duplicate upload by content hash: %s -> %s",
+                file_path,
+                previous["file"],
+            )
+            return {
+                "status": "success",
+                "store": store_name,
+                "file": file_path,
+                "size_mb": round(size_mb, 2),
+                "indexed": False,
+                "deduplicated": True,
+                "existing_file": previous["file"],
+            }
+
+        result = self._upload_new_file(
+            file_path, path, ext, st.st_size, size_mb, store_name
+        )
+        if result.get("status") == "success" and not result.get("deduplicated"):
+            self._upload_hashes[hash_key] = result
+        return result
+
+    def _upload_new_file(
+        self,
+        file_path: str,
+        path: Path,
+        ext: str,
+        size_bytes: int,
+        size_mb: float,
+        store_name: str,
+    ) -> Dict[str, Any]:
+        """Index (and, in Gemini mode, upload) a file not seen before."""
         if store_name not in self.stores:
             self.create_store(store_name)
 
         file_abs_path = os.path.abspath(file_path)
         file_metadata = {
-            "file_name": Path(file_path).name,
+            "file_name": path.name,
             "file_path": file_abs_path,
-            "size_bytes": os.path.getsize(file_path),
+            "size_bytes": size_bytes,
             "file_type": ext,
             "store": store_name,
             "timestamp": time.time(),
@@ -212,7 +267,7 @@ class IngestMixin:
         duplicate = self._find_duplicate_upload(
             store_name,
             file_abs_path=file_abs_path,
-            file_name=Path(file_path).name,
+            file_name=path.name,
             content=(
                 getattr(obsidian_note, "body", "") if obsidian_note is not None else ""
             )
@@ -261,12 +316,18 @@ class IngestMixin:
                     file_search_store_name=self.stores[store_name], file=file_path
                 )
                 timeout = self.config.upload_timeout_sec
+                delay = self.config.upload_poll_initial_sec
                 start = time.time()
                 while not upload_op.done:
                     if time.time() - start > timeout:
                         return {"status": "error", "message": "Upload timeout"}
-                    time.sleep(3)
+                    # Exponential backoff: fast first answer for small files,
+                    # fewer polls for slow ones.
+                    time.sleep(delay)
+                    delay = min(delay * 2, self.config.upload_poll_max_sec)
                     upload_op = self.client.operations.get(upload_op)
+                if getattr(self, "_response_cache", None):
+                    self._response_cache.invalidate(store_name)
                 return {
                     "status": "success",
                     "store": store_name,
@@ -339,10 +400,26 @@ class IngestMixin:
     def upload_files(
         self, file_paths: List[str], store_name: str = "default"
     ) -> Dict[str, Any]:
-        """Upload multiple files sequentially."""
+        """Upload multiple files.
+
+        Remote (Gemini) uploads are network-bound, so they run concurrently up
+        to ``config.max_concurrent_uploads``. Local indexing mutates in-memory
+        indices and stays sequential.
+        """
+        if store_name not in self.stores:
+            self.create_store(store_name)
+
+        workers = min(self.config.max_concurrent_uploads, len(file_paths))
+        if self._use_native_client and workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(
+                    pool.map(lambda fp: self.upload_file(fp, store_name), file_paths)
+                )
+        else:
+            outcomes = [self.upload_file(fp, store_name) for fp in file_paths]
+
         results = [
-            {"file": fp, "result": self.upload_file(fp, store_name)}
-            for fp in file_paths
+            {"file": fp, "result": result} for fp, result in zip(file_paths, outcomes)
         ]
         success_count = sum(1 for r in results if r["result"]["status"] == "success")
         return {
@@ -4,6 +4,8 @@ Extracted from core.py. Eliminates duplicated param/store/vector/driftlock block
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
 from typing import Any, Dict, List, Optional
 
 try:
@@ -13,6 +15,8 @@ except ImportError:  # pragma: no cover - optional dependency
 
 logger = logging.getLogger(__name__)
 
+_chunk_title_uri = attrgetter("retrieved_context.title", "retrieved_context.uri")
+
 
 class CloudSearchMixin:
     """Mixin: search, search_stream, search_multimodal + shared helpers."""
@@ -64,24 +68,23 @@ class CloudSearchMixin:
         if len(answer) > self.config.max_answer_length:
             logger.warning("Answer too long: %d chars, truncating", len(answer))
             answer = answer[: self.config.max_answer_length]
-        for term in self.config.banned_terms:
-            if term.lower() in answer.lower():
-                logger.error("Banned term detected: %s", term)
-                return "", f"Response contains banned term: {term}"
+        term = self.config.find_banned_term(answer)
+        if term is not None:
+            logger.error("Banned term detected: %s", term)
+            return "", f"Response contains banned term: {term}"
         return answer, ""
 
     def _extract_grounding_sources(self, response: Any) -> List[Dict[str, str]]:
-        """Pull grounding chunks from a Gemini response."""
+        """Pull up to config.max_sources grounding chunks from a Gemini response."""
         try:
             grounding = response.candidates[0].grounding_metadata
         except (IndexError, AttributeError):
             return []
         if not grounding:
             return []
-        return [
-            {"title": c.retrieved_context.title, "uri": c.retrieved_context.uri}
-            for c in grounding.grounding_chunks
-        ]
+        # Slice before building dicts: only max_sources are ever returned
+        chunks = grounding.grounding_chunks[: self.config.max_sources]
+        return [{"title": t, "uri": u} for t, u in map(_chunk_title_uri, chunks)]
 
     def _gemini_search_call(
         self,
@@ -109,6 +112,48 @@ class CloudSearchMixin:
             ),
         )
 
+    def _cached_gemini_answer(
+        self,
+        store_name: str,
+        query: str,
+        model: str,
+        max_tokens: int,
+        temperature: float,
+        query_vec: Any = None,
+    ) -> Dict[str, Any]:
+        """Gemini answer + sources, served from the response cache when possible.
+
+        Returns {"answer", "sources"} or {"error"} if Driftlock rejected it.
+        Rejected answers are not cached. Pass `query_vec` when the caller
+        already embedded `query`; otherwise it is embedded only if the
+        semantic cache tier needs it.
+        """
+        cache = getattr(self, "_response_cache", None)
+        embedded: List[Any] = [] if query_vec is None else [query_vec]
+
+        def embed() -> Any:
+            # At most once per call, and only when the cache asks for it
+            if not embedded:
+                embedded.append(self.embedding_generator.generate(query))
+            return embedded[0]
+
+        if cache is not None:
+            hit = cache.get(store_name, model, query, max_tokens, temperature, embed)
+            if hit is not None:
+                return hit
+
+        response = self._gemini_search_call(
+            store_name, query, model, max_tokens, temperature
+        )
+        answer, err_msg = self._driftlock_validate(response.text)
+        if err_msg:
+            return {"error": err_msg}
+        sources = self._extract_grounding_sources(response)
+        result = {"answer": answer, "sources": sources}
+        if cache is not None:
+            cache.set(store_name, model, query, max_tokens, temperature, result, embed)
+        return result
+
     # ------------------------------------------------------------------
     # Public search methods
     # ------------------------------------------------------------------
@@ -135,6 +180,7 @@ class CloudSearchMixin:
         logger.info("[>] Query: %s -> %s", query, refined)
 
         semantic_results = []
+        q_vec = None
         backend_choice = self._resolve_vector_backend(vector_backend)
         if search_mode in ["semantic", "hybrid"]:
             q_vec = self.embedding_generator.generate(refined)
@@ -165,17 +211,15 @@ class CloudSearchMixin:
             )
 
         try:
-            response = self._gemini_search_call(
-                store_name, refined, model, max_tokens, temperature
+            cached = self._cached_gemini_answer(
+                store_name, refined, model, max_tokens, temperature, q_vec
             )
-            answer, err_msg = self._driftlock_validate(response.text)
-            if err_msg:
-                return {"status": "error", "message": err_msg}
-            sources = self._extract_grounding_sources(response)
+            if "error" in cached:
+                return {"status": "error", "message": cached["error"]}
             return {
                 "status": "success",
-                "answer": answer,
-                "sources": sources[: self.config.max_sources],
+                "answer": cached["answer"],
+                "sources": list(cached["sources"]),
                 "model": model,
                 "query": query,
                 "refined_query": refined if intent.is_corrected else None,
@@ -198,6 +242,44 @@ class CloudSearchMixin:
             logger.error("Search failed: %s", e)
             return {"status": "error", "message": str(e)}
 
+    def search_batch(
+        self,
+        queries: List[str],
+        store_name: str = "default",
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        search_mode: str = "keyword",
+    ) -> List[Dict[str, Any]]:
+        """Run several queries against one store; results follow input order.
+
+        Repeated queries are answered once. Gemini calls are network-bound,
+        so distinct queries run concurrently up to
+        ``config.max_concurrent_searches``; local and provider search stay
+        sequential.
+        """
+        unique = list(dict.fromkeys(queries))
+
+        def run(query: str) -> Dict[str, Any]:
+            return self.search(
+                query,
+                store_name=store_name,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                search_mode=search_mode,
+            )
+
+        workers = min(self.config.max_concurrent_searches, len(unique))
+        if self._use_native_client and workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                answers = list(pool.map(run, unique))
+        else:
+            answers = [run(q) for q in unique]
+
+        by_query = dict(zip(unique, answers))
+        return [dict(by_query[q]) for q in queries]
+
     def search_stream(
         self,
         query: str,
@@ -325,7 +407,7 @@ class CloudSearchMixin:
             return {
                 "status": "success",
                 "answer": answer,
-                "sources": sources[: self.config.max_sources],
+                "sources": sources,
                 "model": model,
                 "query": query,
                 "refined_query": refined if intent.is_corrected else None,
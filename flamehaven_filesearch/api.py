@@ -76,12 +76,14 @@ from .middlewares import (
 from .security import get_current_api_key, optional_api_key
 from . import __version__ as _VERSION
 from .usage_middleware import UsageTrackingMiddleware
+from .usage_tracker import close_usage_tracker
 from .validators import (
     FileSizeValidator,
     ImageValidator,
     validate_search_request,
     validate_upload_file,
 )
+from .vector_store import close_vector_stores
 
 # Configure structured JSON logging for production
 # Use ENVIRONMENT=development for human-readable logs
@@ -184,6 +186,8 @@ async def lifespan(app: FastAPI):
     initialize_services(force=True)
     yield
     logger.info("Shutting down FLAMEHAVEN FileSearch API")
+    close_usage_tracker()
+    close_vector_stores()
 
 
 # Initialize app (lifespan replaces startup/shutdown on_event)
@@ -222,14 +226,16 @@ app.add_middleware(RequestIDMiddleware)
 app.add_middleware(CORSHeadersMiddleware)
 
 # Add usage tracking middleware
-# Enabled by default, can be disabled via USAGE_TRACKING_ENABLED=false
+# Enabled by default, can be disabled via USAGE_TRACKING_ENABLED=false.
+# When disabled it is left out of the stack entirely, so it costs nothing.
 usage_tracking_enabled = os.getenv("USAGE_TRACKING_ENABLED", "true").lower() in {
     "1",
     "true",
     "yes",
     "on",
 }
-app.add_middleware(UsageTrackingMiddleware, enabled=usage_tracking_enabled)
+if usage_tracking_enabled:
+    app.add_middleware(UsageTrackingMiddleware)
 
 # Include routers (API key management, batch search, dashboard)
 app.include_router(admin_router)
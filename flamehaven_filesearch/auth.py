@@ -77,13 +77,19 @@ class APIKeyManager:
     def __init__(self, db_path: str = "./data/flamehaven.db"):
         """Initialize API key manager with database"""
         self.db_path = db_path
+        # "file:..." paths are SQLite URIs, e.g. a shared in-memory database
+        self._uri = db_path.startswith("file:")
         self._ensure_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, uri=self._uri)
+
     def _ensure_db(self):
         """Ensure database and tables exist"""
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        if not self._uri:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
 
             # Create api_keys table
@@ -189,7 +195,7 @@ class APIKeyManager:
             if metadata:
                 enc_metadata = encryption_service.encrypt(json.dumps(metadata))
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -230,7 +236,7 @@ class APIKeyManager:
         key_hash = self._hash_key(plain_key)
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -304,7 +310,7 @@ class APIKeyManager:
     def revoke_key(self, key_id: str) -> bool:
         """Revoke API key"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     "UPDATE api_keys SET is_active = 0 WHERE id = ?",
@@ -352,7 +358,7 @@ class APIKeyManager:
     def list_keys(self, user_id: str) -> List[APIKeyInfo]:
         """List all keys for user (without secret)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -381,7 +387,7 @@ class APIKeyManager:
     ):
         """Log API key usage for audit trail"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 timestamp = (
                     datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
@@ -413,7 +419,7 @@ class APIKeyManager:
     def get_usage_stats(self, user_id: Optional[str] = None, days: int = 30) -> dict:
         """Get usage statistics"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
 
                 # Total requests
@@ -529,7 +535,7 @@ def bootstrap_api_key(plain_key: str, name: str = "env-bootstrap") -> bool:
     mgr = get_key_manager()
     key_hash = mgr._hash_key(plain_key)
     try:
-        with sqlite3.connect(mgr.db_path) as conn:
+        with mgr._connect() as conn:
             if conn.execute(
                 "SELECT id FROM api_keys WHERE key_hash = ?", (key_hash,)
             ).fetchone():
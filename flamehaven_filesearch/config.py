@@ -3,13 +3,33 @@ Configuration management for FLAMEHAVEN FileSearch
 """
 
 import os
+import re
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, Dict, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Optional, Pattern, Tuple
 
 if TYPE_CHECKING:
     from .cache import AbstractSearchCache
 
 
+@lru_cache(maxsize=16)
+def _compile_banned_terms(
+    terms: Tuple[str, ...],
+) -> Tuple[Optional[Pattern[str]], Dict[str, str]]:
+    """Compile banned terms into one case-insensitive alternation.
+
+    Returns the pattern (None when there are no terms) and a lowercase ->
+    configured-term map used to report which term matched.
+    """
+    terms = tuple(t for t in terms if t)
+    if not terms:
+        return None, {}
+    # Longest first so overlapping terms report the most specific match
+    ordered = sorted(terms, key=len, reverse=True)
+    pattern = re.compile("|".join(map(re.escape, ordered)), re.IGNORECASE)
+    return pattern, {t.lower(): t for t in reversed(terms)}
+
+
 @dataclass
 class Config:
     """
@@ -19,6 +39,10 @@ class Config:
         api_key: Google GenAI API key
         max_file_size_mb: Maximum file size in MB (Lite tier: 50MB)
         upload_timeout_sec: Upload operation timeout
+        max_concurrent_uploads: Parallel remote uploads in upload_files
+        upload_poll_initial_sec: First poll delay for remote upload operations
+        upload_poll_max_sec: Cap for the exponential upload poll backoff
+        max_concurrent_searches: Parallel remote queries in search_batch
         default_model: Default Gemini model to use
         max_output_tokens: Maximum tokens for response
         temperature: Model temperature (0.0-1.0)
@@ -26,6 +50,9 @@ class Config:
         cache_ttl_sec: Retrieval cache TTL
         cache_max_size: Maximum cache size
         cache_backend: Cache backend type ('memory' or 'redis')
+        response_cache_enabled: Cache Gemini answers inside search()
+        semantic_cache_threshold: Cosine similarity for semantic cache hits
+            (0 disables the semantic tier)
         redis_host: Redis host for distributed caching
         redis_port: Redis port
         redis_password: Redis password (optional)
@@ -48,6 +75,10 @@ class Config:
 
     max_file_size_mb: int = 50
     upload_timeout_sec: int = 60
+    max_concurrent_uploads: int = 4
+    upload_poll_initial_sec: float = 0.25
+    upload_poll_max_sec: float = 4.0
+    max_concurrent_searches: int = 4
     default_model: str = "gemini-2.5-flash"
     max_output_tokens: int = 1024
     temperature: float = 0.5
@@ -55,6 +86,8 @@ class Config:
     cache_ttl_sec: int = 600
     cache_max_size: int = 1024
     cache_backend: str = "memory"  # 'memory' or 'redis'
+    response_cache_enabled: bool = True
+    semantic_cache_threshold: float = 0.0  # 0 disables the semantic tier
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_password: Optional[str] = None
@@ -66,7 +99,10 @@ class Config:
     vector_hnsw_m: int = 16
     vector_hnsw_ef_construction: int = 200
     vector_hnsw_ef_search: int = 50
+    vector_hnsw_iterative_scan: str = "strict_order"  # pgvector >= 0.8
     vector_postgres_table: str = "flamehaven_vectors"
+    vector_precision: str = "float32"  # "float32" or "float16" (pgvector halfvec)
+    vector_distance: str = "cosine"  # "cosine" or "inner_product" (normalized)
 
     # Multimodal configuration
     multimodal_enabled: bool = False
@@ -76,6 +112,7 @@ class Config:
     vision_enabled: bool = False
     vision_strategy: str = "fast"
     vision_provider: str = "auto"
+    vision_ocr_max_dim: int = 1200
 
     # Obsidian light ingest
     obsidian_light_mode: bool = False
@@ -98,6 +135,9 @@ class Config:
     postgres_enabled: bool = False
     postgres_dsn: Optional[str] = None
     postgres_schema: str = "public"
+    postgres_pool_max_size: int = 10
+    postgres_maintenance_workers: int = 7  # parallel HNSW index builds
+    postgres_maintenance_work_mem: str = ""  # e.g. "2GB"; empty = server default
 
     # Driftlock configuration
     min_answer_length: int = 10
@@ -145,6 +185,16 @@ class Config:
         if self.openai_base_url is None:
             self.openai_base_url = os.getenv("OPENAI_BASE_URL") or None
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            self.__dict__.pop("_dict_cache", None)
+        if name == "banned_terms":
+            # Resolve the matcher once per assignment, not once per answer
+            super().__setattr__(
+                "_banned_matcher", _compile_banned_terms(tuple(value or ()))
+            )
+
     def validate(self, require_api_key: bool = True) -> bool:
         """
         Validate configuration.
@@ -166,15 +216,51 @@ class Config:
         if self.max_file_size_mb <= 0:
             raise ValueError("max_file_size_mb must be positive")
 
+        if self.max_concurrent_uploads <= 0:
+            raise ValueError("max_concurrent_uploads must be positive")
+
+        if self.max_concurrent_searches <= 0:
+            raise ValueError("max_concurrent_searches must be positive")
+
+        if not 0 < self.upload_poll_initial_sec <= self.upload_poll_max_sec:
+            raise ValueError(
+                "upload_poll_initial_sec must be positive and <= upload_poll_max_sec"
+            )
+
         if not 0.0 <= self.temperature <= 1.0:
             raise ValueError("temperature must be between 0.0 and 1.0")
 
+        if not 0.0 <= self.semantic_cache_threshold <= 1.0:
+            raise ValueError("semantic_cache_threshold must be between 0.0 and 1.0")
+
         if self.vector_backend not in {"memory", "postgres"}:
             raise ValueError("vector_backend must be 'memory' or 'postgres'")
 
         if self.vector_index_backend not in {"brute", "hnsw"}:
             raise ValueError("vector_index_backend must be 'brute' or 'hnsw'")
 
+        if self.vector_precision not in {"float32", "float16"}:
+            raise ValueError("vector_precision must be 'float32' or 'float16'")
+
+        if self.vector_distance not in {"cosine", "inner_product"}:
+            raise ValueError("vector_distance must be 'cosine' or 'inner_product'")
+
+        if self.vector_hnsw_iterative_scan not in {
+            "off",
+            "strict_order",
+            "relaxed_order",
+        }:
+            raise ValueError(
+                "vector_hnsw_iterative_scan must be 'off', 'strict_order' "
+                "or 'relaxed_order'"
+            )
+
+        if self.postgres_pool_max_size < 1:
+            raise ValueError("postgres_pool_max_size must be at least 1")
+
+        if self.postgres_maintenance_workers < 0:
+            raise ValueError("postgres_maintenance_workers must be non-negative")
+
         if self.multimodal_text_weight <= 0 or self.multimodal_image_weight <= 0:
             raise ValueError("multimodal weights must be positive")
 
@@ -185,6 +271,9 @@ class Config:
                 "vision_provider must be 'auto', 'pillow', 'tesseract', or 'none'"
             )
 
+        if self.vision_ocr_max_dim <= 0:
+            raise ValueError("vision_ocr_max_dim must be positive")
+
         if self.obsidian_chunk_max_tokens <= 0:
             raise ValueError("obsidian_chunk_max_tokens must be positive")
         if self.obsidian_chunk_min_tokens <= 0:
@@ -198,8 +287,37 @@ class Config:
 
         return True
 
+    def find_banned_term(self, text: str) -> Optional[str]:
+        """Return the first banned term found in text (case-insensitive).
+
+        Scans text once with a regex compiled from banned_terms. The pattern
+        and lowercase lookup are resolved when banned_terms is assigned, so
+        in-place edits to the list need a reassignment to take effect.
+        """
+        matcher = self.__dict__.get("_banned_matcher")
+        if matcher is None:
+            matcher = _compile_banned_terms(tuple(self.banned_terms or ()))
+        pattern, lookup = matcher
+        if pattern is None:
+            return None
+        match = pattern.search(text)
+        if match is None:
+            return None
+        found = match.group(0)
+        return lookup.get(found.lower(), found)
+
     def to_dict(self) -> Dict[str, Any]:
-        """Convert config to dictionary"""
+        """Convert config to dictionary
+
+        The result is built once and reused until a field is reassigned;
+        each call returns a shallow copy.
+        """
+        cached = self.__dict__.get("_dict_cache")
+        if cached is None:
+            cached = self._dict_cache = self._build_dict()
+        return dict(cached)
+
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             "api_key": "***" if self.api_key else None,
             "llm_provider": self.llm_provider,
@@ -207,15 +325,23 @@ class Config:
             "ollama_base_url": self.ollama_base_url,
             "max_file_size_mb": self.max_file_size_mb,
             "upload_timeout_sec": self.upload_timeout_sec,
+            "max_concurrent_uploads": self.max_concurrent_uploads,
+            "upload_poll_initial_sec": self.upload_poll_initial_sec,
+            "upload_poll_max_sec": self.upload_poll_max_sec,
+            "max_concurrent_searches": self.max_concurrent_searches,
             "default_model": self.default_model,
             "max_output_tokens": self.max_output_tokens,
             "temperature": self.temperature,
             "max_sources": self.max_sources,
             "cache_ttl_sec": self.cache_ttl_sec,
             "cache_max_size": self.cache_max_size,
+            "response_cache_enabled": self.response_cache_enabled,
+            "semantic_cache_threshold": self.semantic_cache_threshold,
             "vector_backend": self.vector_backend,
             "vector_index_backend": self.vector_index_backend,
             "vector_postgres_table": self.vector_postgres_table,
+            "vector_precision": self.vector_precision,
+            "vector_distance": self.vector_distance,
             "multimodal_enabled": self.multimodal_enabled,
             "multimodal_text_weight": self.multimodal_text_weight,
             "multimodal_image_weight": self.multimodal_image_weight,
@@ -223,6 +349,7 @@ class Config:
             "vision_enabled": self.vision_enabled,
             "vision_strategy": self.vision_strategy,
             "vision_provider": self.vision_provider,
+            "vision_ocr_max_dim": self.vision_ocr_max_dim,
             "obsidian_light_mode": self.obsidian_light_mode,
             "obsidian_chunk_max_tokens": self.obsidian_chunk_max_tokens,
             "obsidian_chunk_min_tokens": self.obsidian_chunk_min_tokens,
@@ -239,6 +366,9 @@ class Config:
             "postgres_enabled": self.postgres_enabled,
             "postgres_dsn": "***" if self.postgres_dsn else None,
             "postgres_schema": self.postgres_schema,
+            "postgres_pool_max_size": self.postgres_pool_max_size,
+            "postgres_maintenance_workers": self.postgres_maintenance_workers,
+            "postgres_maintenance_work_mem": self.postgres_maintenance_work_mem,
             "persist_path": self.persist_path or None,
             "embedding_provider": self.embedding_provider,
             "ollama_embedding_model": self.ollama_embedding_model,
@@ -299,11 +429,20 @@ class Config:
             openai_base_url=os.getenv("OPENAI_BASE_URL") or None,
             max_file_size_mb=int(os.getenv("MAX_FILE_SIZE_MB", "50")),
             upload_timeout_sec=int(os.getenv("UPLOAD_TIMEOUT_SEC", "60")),
+            max_concurrent_uploads=int(os.getenv("MAX_CONCURRENT_UPLOADS", "4")),
+            upload_poll_initial_sec=float(os.getenv("UPLOAD_POLL_INITIAL_SEC", "0.25")),
+            upload_poll_max_sec=float(os.getenv("UPLOAD_POLL_MAX_SEC", "4.0")),
+            max_concurrent_searches=int(os.getenv("MAX_CONCURRENT_SEARCHES", "4")),
             default_model=os.getenv("DEFAULT_MODEL", "gemini-2.5-flash"),
             max_output_tokens=int(os.getenv("MAX_OUTPUT_TOKENS", "1024")),
             temperature=float(os.getenv("TEMPERATURE", "0.5")),
             max_sources=int(os.getenv("MAX_SOURCES", "5")),
             cache_backend=os.getenv("CACHE_BACKEND", "memory"),
+            response_cache_enabled=os.getenv("RESPONSE_CACHE_ENABLED", "true").lower()
+            in {"1", "true", "yes", "on"},
+            semantic_cache_threshold=float(
+                os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.0")
+            ),
             redis_host=os.getenv("REDIS_HOST", "localhost"),
             redis_port=int(os.getenv("REDIS_PORT", "6379")),
             redis_password=os.getenv("REDIS_PASSWORD"),
@@ -315,9 +454,16 @@ class Config:
                 os.getenv("VECTOR_HNSW_EF_CONSTRUCTION", "200")
             ),
             vector_hnsw_ef_search=int(os.getenv("VECTOR_HNSW_EF_SEARCH", "50")),
+            vector_hnsw_iterative_scan=os.getenv(
+                "VECTOR_HNSW_ITERATIVE_SCAN", "strict_order"
+            )
+            .strip()
+            .lower(),
             vector_postgres_table=os.getenv(
                 "VECTOR_POSTGRES_TABLE", "flamehaven_vectors"
             ),
+            vector_precision=os.getenv("VECTOR_PRECISION", "float32").strip().lower(),
+            vector_distance=os.getenv("VECTOR_DISTANCE", "cosine").strip().lower(),
             multimodal_enabled=os.getenv("MULTIMODAL_ENABLED", "false").lower()
             in {"1", "true", "yes", "on"},
             multimodal_text_weight=float(os.getenv("MULTIMODAL_TEXT_WEIGHT", "1.0")),
@@ -327,6 +473,7 @@ class Config:
             in {"1", "true", "yes", "on"},
             vision_strategy=os.getenv("VISION_STRATEGY", "fast").strip().lower(),
             vision_provider=os.getenv("VISION_PROVIDER", "auto").strip().lower(),
+            vision_ocr_max_dim=int(os.getenv("VISION_OCR_MAX_DIM", "1200")),
             obsidian_light_mode=os.getenv("OBSIDIAN_LIGHT_MODE", "false").lower()
             in {"1", "true", "yes", "on"},
             obsidian_chunk_max_tokens=int(
@@ -356,6 +503,13 @@ class Config:
             in {"1", "true", "yes", "on"},
             postgres_dsn=os.getenv("POSTGRES_DSN"),
             postgres_schema=os.getenv("POSTGRES_SCHEMA", "public"),
+            postgres_pool_max_size=int(os.getenv("POSTGRES_POOL_MAX_SIZE", "10")),
+            postgres_maintenance_workers=int(
+                os.getenv("POSTGRES_MAINTENANCE_WORKERS", "7")
+            ),
+            postgres_maintenance_work_mem=os.getenv(
+                "POSTGRES_MAINTENANCE_WORK_MEM", ""
+            ).strip(),
             # P4: persistence
             persist_path=os.getenv("PERSIST_PATH") or None,
             # P3: embedding provider
@@ -367,3 +521,19 @@ class Config:
             query_expansion_path=os.getenv("QUERY_EXPANSION_PATH") or None,
             query_expansion_max_extra=int(os.getenv("QUERY_EXPANSION_MAX_EXTRA", "6")),
         )
+
+
+@lru_cache(maxsize=1)
+def get_default_config() -> Config:
+    """Process-wide ``Config.from_env()``, parsed once.
+
+    Used by helpers that accept an optional config on hot paths. Call
+    ``reload_config()`` after changing the environment.
+    """
+    return Config.from_env()
+
+
+def reload_config() -> Config:
+    """Drop the cached default config and re-read the environment."""
+    get_default_config.cache_clear()
+    return get_default_config()
@@ -6,7 +6,9 @@ Intent-Refiner (query optimization)
 """
 
 import logging
-from typing import Any, Dict, List, Optional, Set
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
 
 try:
     from google import genai as google_genai
@@ -18,6 +20,7 @@ except ImportError:  # pragma: no cover - optional dependency
 from .config import Config
 from .engine import ChronosConfig, ChronosGrid, GravitasPacker, IntentRefiner
 from .engine.quality_gate import SearchQualityGate, SearchMetaLearner
+from .engine.response_cache import ResponseCache
 from .engine.llm_providers import AbstractLLMProvider, create_llm_provider
 from .engine.embedding_generator import (
     create_embedding_provider,
@@ -71,6 +74,8 @@ class FlamehavenFileSearch(IngestMixin, LocalSearchMixin, CloudSearchMixin):
         self.config.validate(require_api_key=not allow_offline)
 
         self._local_store_docs: Dict[str, List[Dict[str, str]]] = {}
+        # (store_name, sha256 of file bytes) -> result of the first upload
+        self._upload_hashes: Dict[Tuple[str, str], Dict[str, Any]] = {}
         self._metadata_store = None
         self.client = None
 
@@ -87,12 +92,15 @@ class FlamehavenFileSearch(IngestMixin, LocalSearchMixin, CloudSearchMixin):
             )
 
         self.stores: Dict[str, str] = {}  # Track remote IDs or local handles
+        # Immutable snapshot handed to readers; rebuilt on every mutation
+        self._stores_lock = threading.Lock()
+        self._stores_view: Mapping[str, str] = MappingProxyType({})
 
         if not self._use_native_client:
             if self.config.postgres_enabled:
                 self._metadata_store = create_metadata_store(self.config)
                 for store_name in self._metadata_store.list_store_names():
-                    self.stores[store_name] = f"local://{store_name}"
+                    self._set_store(store_name, f"local://{store_name}")
             else:
                 self._metadata_store = MemoryMetadataStore(self._local_store_docs)
 
@@ -149,6 +157,16 @@ class FlamehavenFileSearch(IngestMixin, LocalSearchMixin, CloudSearchMixin):
         self._quality_gate = SearchQualityGate()
         self._meta_learner = SearchMetaLearner()
         self._meta_alpha: Dict[str, float] = {}
+        # Gemini answer cache (exact + optional semantic tier)
+        self._response_cache: Optional[ResponseCache] = (
+            ResponseCache(
+                maxsize=self.config.cache_max_size,
+                ttl_sec=self.config.cache_ttl_sec,
+                semantic_threshold=self.config.semantic_cache_threshold,
+            )
+            if self.config.response_cache_enabled
+            else None
+        )
 
         if not self._use_native_client and "default" not in self.stores:
             self.create_store("default")
@@ -177,6 +195,20 @@ class FlamehavenFileSearch(IngestMixin, LocalSearchMixin, CloudSearchMixin):
             return "postgres" if self.vector_store else "memory"
         return "memory"
 
+    def _forget_upload_hashes(self, store_name: str) -> None:
+        for key in [k for k in self._upload_hashes if k[0] == store_name]:
+            del self._upload_hashes[key]
+
+    def _set_store(self, name: str, store_id: str) -> None:
+        with self._stores_lock:
+            self.stores[name] = store_id
+            self._stores_view = MappingProxyType(dict(self.stores))
+
+    def _remove_store(self, name: str) -> None:
+        with self._stores_lock:
+            del self.stores[name]
+            self._stores_view = MappingProxyType(dict(self.stores))
+
     def create_store(self, name: str = "default") -> str:
         """Create a file search store. Returns store resource name."""
         if name in self.stores:
@@ -186,7 +218,7 @@ class FlamehavenFileSearch(IngestMixin, LocalSearchMixin, CloudSearchMixin):
         if self._use_native_client:
             try:
                 store = self.client.file_search_stores.create()
-                self.stores[name] = store.name
+                self._set_store(name, store.name)
                 logger.info("Created store '%s': %s", name, store.name)
                 if self.vector_store:
                     self.vector_store.ensure_store(name)
@@ -196,7 +228,7 @@ class FlamehavenFileSearch(IngestMixin, LocalSearchMixin, CloudSearchMixin):
                 raise
 
         store_id = f"local://{name}"
-        self.stores[name] = store_id
+        self._set_store(name, store_id)
         self._local_store_docs.setdefault(name, [])
         if self._metadata_store:
             self._metadata_store.ensure_store(name)
@@ -205,9 +237,17 @@ class FlamehavenFileSearch(IngestMixin, LocalSearchMixin, CloudSearchMixin):
         logger.info("Created local store '%s' (fallback mode)", name)
         return store_id
 
-    def list_stores(self) -> Dict[str, str]:
-        """Return a copy of the store name -> resource ID mapping."""
-        return self.stores.copy()
+    def list_stores(self) -> Mapping[str, str]:
+        """Return a read-only snapshot of the store name -> resource ID mapping.
+
+        The snapshot is shared, not copied, and never changes after it is
+        returned. Use stores_snapshot() for a mutable copy.
+        """
+        return self._stores_view
+
+    def stores_snapshot(self) -> Dict[str, str]:
+        """Return a mutable copy of the store name -> resource ID mapping."""
+        return dict(self._stores_view)
 
     def delete_store(self, store_name: str) -> Dict[str, Any]:
         """Delete a store and all associated resources."""
@@ -217,16 +257,20 @@ class FlamehavenFileSearch(IngestMixin, LocalSearchMixin, CloudSearchMixin):
         if self._use_native_client:
             try:
                 self.client.file_search_stores.delete(name=self.stores[store_name])
-                del self.stores[store_name]
+                self._remove_store(store_name)
+                self._forget_upload_hashes(store_name)
                 if self.vector_store:
                     self.vector_store.delete_store(store_name)
+                if self._response_cache:
+                    self._response_cache.invalidate(store_name)
                 logger.info("Deleted store: %s", store_name)
                 return {"status": "success", "store": store_name}
             except Exception as e:
                 logger.error("Failed to delete store '%s': %s", store_name, e)
                 return {"status": "error", "message": str(e)}
 
-        del self.stores[store_name]
+        self._remove_store(store_name)
+        self._forget_upload_hashes(store_name)
         if self._metadata_store:
             self._metadata_store.delete_store(store_name)
         self._local_store_docs.pop(store_name, None)
@@ -318,8 +362,8 @@ class FlamehavenFileSearch(IngestMixin, LocalSearchMixin, CloudSearchMixin):
     def get_metrics(self) -> Dict[str, Any]:
         """Return metrics from all engine components."""
         return {
-            "stores_count": len(self.stores),
-            "stores": list(self.stores.keys()),
+            "stores_count": len(self._stores_view),
+            "stores": list(self._stores_view),
             "config": self.config.to_dict(),
             "vector_store": (
                 self.vector_store.get_stats()
@@ -338,4 +382,9 @@ class FlamehavenFileSearch(IngestMixin, LocalSearchMixin, CloudSearchMixin):
             "intent_refiner": self.intent_refiner.get_stats(),
             "gravitas_packer": self.gravitas_packer.get_stats(),
             "embedding_generator": self.embedding_generator.get_cache_stats(),
+            "response_cache": (
+                self._response_cache.get_stats()
+                if self._response_cache
+                else {"enabled": False}
+            ),
         }
@@ -0,0 +1,205 @@
+"""
+Response cache for Gemini cloud search answers.
+
+Two tiers:
+  1. Exact match on (store, model, query, max_tokens, temperature) with TTL.
+  2. Optional semantic match: cosine similarity of the query embedding against
+     previously answered queries in the same (store, model, params) bucket.
+     Vectors are stored pre-normalised and stacked, so a lookup is a single
+     matrix-vector product.
+
+Zero external dependencies; the semantic tier is disabled without NumPy.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:  # pragma: no cover - numpy ships with the dev extras
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+class ResponseCache:
+    """Thread-safe exact + semantic cache for search responses."""
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl_sec: float = 600,
+        semantic_threshold: float = 0.0,
+    ):
+        """
+        Args:
+            maxsize: Maximum cached responses (LRU eviction).
+            ttl_sec: Entry lifetime in seconds.
+            semantic_threshold: Minimum cosine similarity for a semantic hit.
+                0 disables the semantic tier.
+        """
+        self.maxsize = maxsize
+        self.ttl_sec = ttl_sec
+        self.semantic_threshold = semantic_threshold
+        self._entries: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        # bucket -> (stacked unit vectors, entry keys row-aligned with them)
+        self._semantic: Dict[Tuple, Tuple[Any, List[Tuple]]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "semantic_hits": 0, "misses": 0}
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return NUMPY_AVAILABLE and self.semantic_threshold > 0
+
+    @staticmethod
+    def _bucket(
+        store_name: str, model: str, max_tokens: int, temperature: float
+    ) -> Tuple:
+        return (store_name, model, max_tokens, round(temperature, 3))
+
+    def _live(self, key: Tuple, now: float) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def get(
+        self,
+        store_name: str,
+        model: str,
+        query: str,
+        max_tokens: int,
+        temperature: float,
+        query_vec: Any = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Return a cached response, or None on miss.
+
+        `query_vec` may be a zero-argument callable; it is called only when
+        the exact tier misses and the semantic tier has rows to compare.
+        """
+        bucket = self._bucket(store_name, model, max_tokens, temperature)
+        now = time.monotonic()
+        with self._lock:
+            value = self._live(bucket + (query,), now)
+            if value is not None:
+                self._stats["hits"] += 1
+                return value
+            if not (
+                self.semantic_enabled
+                and query_vec is not None
+                and bucket in self._semantic
+            ):
+                self._stats["misses"] += 1
+                return None
+
+        # Embedding can be slow; resolve the vector outside the lock
+        unit = self._normalize(self._resolve(query_vec))
+        with self._lock:
+            rows = self._semantic.get(bucket)
+            if rows is not None and unit is not None:
+                sims = rows[0] @ unit
+                best = int(np.argmax(sims))
+                if sims[best] >= self.semantic_threshold:
+                    value = self._live(rows[1][best], now)
+                    if value is not None:
+                        self._stats["semantic_hits"] += 1
+                        logger.debug(
+                            "[ResponseCache] semantic hit sim=%.3f",
+                            float(sims[best]),
+                        )
+                        return value
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(
+        self,
+        store_name: str,
+        model: str,
+        query: str,
+        max_tokens: int,
+        temperature: float,
+        value: Dict[str, Any],
+        query_vec: Any = None,
+    ) -> None:
+        """Cache a response for the given query parameters.
+
+        A callable `query_vec` is called only if the semantic tier is on.
+        """
+        bucket = self._bucket(store_name, model, max_tokens, temperature)
+        key = bucket + (query,)
+        unit = None
+        if self.semantic_enabled and query_vec is not None:
+            unit = self._normalize(self._resolve(query_vec))
+        with self._lock:
+            is_new = key not in self._entries
+            self._entries[key] = (time.monotonic() + self.ttl_sec, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+            if is_new and unit is not None:
+                self._add_semantic_row(bucket, key, unit)
+
+    @staticmethod
+    def _resolve(query_vec: Any) -> Any:
+        return query_vec() if callable(query_vec) else query_vec
+
+    def _add_semantic_row(self, bucket: Tuple, key: Tuple, unit: Any) -> None:
+        matrix, keys = self._semantic.get(bucket, (None, []))
+        if matrix is not None and matrix.shape[1] != unit.shape[0]:
+            matrix, keys = None, []
+        if len(keys) >= self.maxsize:
+            # Drop rows whose exact entry was evicted or expired
+            alive = [i for i, k in enumerate(keys) if k in self._entries]
+            matrix = matrix[alive] if alive else None
+            keys = [keys[i] for i in alive]
+        row = unit[np.newaxis, :]
+        matrix = row if matrix is None else np.vstack((matrix, row))
+        self._semantic[bucket] = (matrix, keys + [key])
+
+    @staticmethod
+    def _normalize(vec: Any) -> Any:
+        arr = np.asarray(vec, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(arr))
+        if norm == 0.0:
+            return None
+        return arr / norm
+
+    def invalidate(self, store_name: Optional[str] = None) -> None:
+        """Drop cached responses for one store, or everything."""
+        with self._lock:
+            if store_name is None:
+                self._entries.clear()
+                self._semantic.clear()
+                return
+            for key in [k for k in self._entries if k[0] == store_name]:
+                del self._entries[key]
+            for bucket in [b for b in self._semantic if b[0] == store_name]:
+                del self._semantic[bucket]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self._stats["hits"] + self._stats["semantic_hits"]
+            total = hits + self._stats["misses"]
+            return {
+                "hits": self._stats["hits"],
+                "semantic_hits": self._stats["semantic_hits"],
+                "misses": self._stats["misses"],
+                "hit_rate": round(hits / total, 3) if total else 0.0,
+                "cached_entries": len(self._entries),
+                "semantic_enabled": self.semantic_enabled,
+            }
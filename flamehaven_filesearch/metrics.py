@@ -302,8 +302,9 @@ class MetricsCollector:
         Should be called periodically (e.g., every 15 seconds)
         """
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=0.1)
+            # CPU usage since the previous call; a sampling interval would
+            # block startup and every /prometheus scrape for its duration
+            cpu_percent = psutil.cpu_percent(interval=None)
             system_cpu_usage_percent.set(cpu_percent)
 
             # Memory usage
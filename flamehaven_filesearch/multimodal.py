@@ -12,13 +12,15 @@ from enum import Enum
 from io import BytesIO
 from typing import Any, Dict, Optional, Protocol
 
-from .config import Config
+from .config import Config, get_default_config
 from .exceptions import FileSizeExceededError
 
 logger = logging.getLogger(__name__)
 
 # Default timeout for vision processing (seconds)
 DEFAULT_VISION_TIMEOUT = 30
+# Long-edge pixel cap for FAST OCR input
+DEFAULT_OCR_MAX_DIM = 1200
 
 
 @contextmanager
@@ -63,23 +65,40 @@ class NoopVisionModal:
 
 
 class PillowVisionModal:
+    # Requested decode size for the colour average. JPEG sources honour this
+    # via draft(), decoding at up to 1/8 scale in the DCT domain.
+    _AVG_DRAFT_SIZE = (32, 32)
+
     def __init__(self):
         try:
             from PIL import Image
         except Exception as exc:
             raise RuntimeError("Pillow is required for vision provider") from exc
         self._image = Image
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        self._np = numpy
+
+    def _average_rgb(self, image: Any) -> tuple:
+        image.draft("RGB", self._AVG_DRAFT_SIZE)  # no-op for non-JPEG
+        rgb = image.convert("RGB")
+        if self._np is None:
+            return rgb.resize((1, 1)).getpixel((0, 0))
+        pixels = self._np.asarray(rgb, dtype=self._np.uint8).reshape(-1, 3)
+        return tuple(int(round(v)) for v in pixels.mean(axis=0))
 
     def describe_image(self, image_bytes: bytes, strategy: VisionStrategy) -> str:
         image = self._image.open(BytesIO(image_bytes))
+        # Header fields only; read before draft() can shrink the image
         width, height = image.size
         mode = image.mode
         fmt = image.format or "unknown"
         description = f"Image {width}x{height} mode={mode} format={fmt}"
         if strategy == VisionStrategy.DETAIL:
             try:
-                sample = image.convert("RGB").resize((1, 1))
-                r, g, b = sample.getpixel((0, 0))
+                r, g, b = self._average_rgb(image)
                 description += f" avg_rgb={r},{g},{b}"
             except Exception as exc:
                 logger.debug("[Vision] avg_rgb extraction failed: %s", exc)
@@ -87,7 +106,12 @@ class PillowVisionModal:
 
 
 class TesseractVisionModal:
-    def __init__(self):
+    # FAST: LSTM engine only, one uniform text block (skips layout analysis)
+    _FAST_OCR_CONFIG = "--oem 1 --psm 6"
+    # DETAIL: words below this Tesseract confidence (0-100) are dropped
+    _MIN_WORD_CONFIDENCE = 30
+
+    def __init__(self, max_dim: int = DEFAULT_OCR_MAX_DIM):
         try:
             from PIL import Image
         except Exception as exc:
@@ -98,17 +122,44 @@ class TesseractVisionModal:
             raise RuntimeError("pytesseract is required for OCR provider") from exc
         self._image = Image
         self._tesseract = pytesseract
+        self.max_dim = max_dim
+
+    def _prepare_fast(self, image: Any) -> Any:
+        """Downscale to max_dim on the long edge and drop to greyscale."""
+        scale = max(image.size) / self.max_dim if self.max_dim > 0 else 1.0
+        if scale > 1:
+            image = image.resize(
+                (int(image.width / scale), int(image.height / scale)),
+                self._image.LANCZOS,
+            )
+        return image.convert("L")
+
+    def _confident_text(self, image: Any) -> str:
+        data = self._tesseract.image_to_data(
+            image, output_type=self._tesseract.Output.DICT
+        )
+        lines: Dict[tuple, list] = {}
+        for i, word in enumerate(data.get("text", [])):
+            if not word or not word.strip():
+                continue
+            if float(data["conf"][i]) < self._MIN_WORD_CONFIDENCE:
+                continue
+            line = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            lines.setdefault(line, []).append(word)
+        return "\n".join(" ".join(words) for words in lines.values())
 
     def describe_image(self, image_bytes: bytes, strategy: VisionStrategy) -> str:
         image = self._image.open(BytesIO(image_bytes))
-        text = self._tesseract.image_to_string(image) or ""
         if strategy == VisionStrategy.DETAIL:
             width, height = image.size
-            text = text.strip()
+            text = self._confident_text(image).strip()
             if text:
                 return f"{text}\nImage {width}x{height}"
             return f"Image {width}x{height}"
-        return text.strip()
+        text = self._tesseract.image_to_string(
+            self._prepare_fast(image), config=self._FAST_OCR_CONFIG
+        )
+        return (text or "").strip()
 
 
 class MultimodalProcessor:
@@ -167,13 +218,11 @@ class MultimodalProcessor:
         )
 
 
+_STRATEGY_BY_NAME = {strategy.value: strategy for strategy in VisionStrategy}
+
+
 def _parse_strategy(value: Optional[str]) -> VisionStrategy:
-    if not value:
-        return VisionStrategy.FAST
-    try:
-        return VisionStrategy(value.strip().lower())
-    except ValueError:
-        return VisionStrategy.FAST
+    return _STRATEGY_BY_NAME.get((value or "").strip().lower(), VisionStrategy.FAST)
 
 
 def _select_vision_modal(
@@ -193,7 +242,9 @@ def _select_vision_modal(
                 return NoopVisionModal()
     if provider == "tesseract":
         try:
-            return TesseractVisionModal()
+            return TesseractVisionModal(
+                max_dim=getattr(config, "vision_ocr_max_dim", DEFAULT_OCR_MAX_DIM)
+            )
         except Exception as exc:
             logger.warning("OCR provider unavailable: %s", exc)
             return NoopVisionModal()
@@ -204,7 +255,7 @@ def get_multimodal_processor(
     config: Optional[Config] = None,
     vision_modal: Optional[VisionModal] = None,
 ) -> Optional[MultimodalProcessor]:
-    config = config or Config.from_env()
+    config = config or get_default_config()
     if not config.vision_enabled and vision_modal is None:
         return None
     return MultimodalProcessor(
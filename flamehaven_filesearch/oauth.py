@@ -3,12 +3,15 @@ OAuth2/OIDC token validation helpers for FLAMEHAVEN FileSearch.
 """
 
 import logging
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import jwt
 
-from .config import Config
+from .config import Config, get_default_config
 
 logger = logging.getLogger(__name__)
 
@@ -23,22 +26,66 @@ class OAuthTokenInfo:
     claims: Dict[str, Any]
 
 
+_DEFAULT_JWKS_TTL_SEC = 300
+_MAX_CACHED_SIGNING_KEYS = 32
+
 _jwks_client = None
 _jwks_client_url = None
+# (jwks_url, kid) -> (signing key, expires_at monotonic), least recently used first
+_signing_key_cache: "OrderedDict[Tuple[str, str], Tuple[Any, float]]" = OrderedDict()
+_signing_key_lock = threading.Lock()
 
 
 def is_jwt_format(token: str) -> bool:
     return token.count(".") == 2
 
 
-def _get_jwks_client(jwks_url: str) -> jwt.PyJWKClient:
+def _get_jwks_client(
+    jwks_url: str, lifespan: float = _DEFAULT_JWKS_TTL_SEC
+) -> jwt.PyJWKClient:
     global _jwks_client, _jwks_client_url
     if _jwks_client is None or _jwks_client_url != jwks_url:
-        _jwks_client = jwt.PyJWKClient(jwks_url)
+        _jwks_client = jwt.PyJWKClient(
+            jwks_url,
+            cache_keys=True,
+            max_cached_keys=_MAX_CACHED_SIGNING_KEYS,
+            lifespan=lifespan,
+        )
         _jwks_client_url = jwks_url
+        with _signing_key_lock:
+            _signing_key_cache.clear()
     return _jwks_client
 
 
+def _get_signing_key(token: str, jwks_url: str, ttl_sec: float) -> Any:
+    """Resolve the token's signing key, caching it by ``kid`` for ttl_sec.
+
+    A cache hit skips PyJWKClient entirely, so steady-state verification never
+    touches the JWKS endpoint.
+    """
+    kid = jwt.get_unverified_header(token).get("kid")
+    cache_key = (jwks_url, kid) if kid else None
+    now = time.monotonic()
+    if cache_key is not None:
+        with _signing_key_lock:
+            cached = _signing_key_cache.get(cache_key)
+            if cached is not None and cached[1] > now:
+                _signing_key_cache.move_to_end(cache_key)
+                return cached[0]
+
+    key = _get_jwks_client(jwks_url, ttl_sec).get_signing_key_from_jwt(token).key
+    if cache_key is not None:
+        with _signing_key_lock:
+            _signing_key_cache[cache_key] = (key, now + ttl_sec)
+            _signing_key_cache.move_to_end(cache_key)
+            expired = [k for k, (_, exp) in _signing_key_cache.items() if exp <= now]
+            for stale in expired:
+                del _signing_key_cache[stale]
+            while len(_signing_key_cache) > _MAX_CACHED_SIGNING_KEYS:
+                _signing_key_cache.popitem(last=False)
+    return key
+
+
 def _normalize_list(value: Any) -> List[str]:
     if value is None:
         return []
@@ -52,7 +99,7 @@ def _normalize_list(value: Any) -> List[str]:
 def validate_oauth_token(
     token: str, config: Optional[Config] = None
 ) -> Optional[OAuthTokenInfo]:
-    config = config or Config.from_env()
+    config = config or get_default_config()
     if not config.oauth_enabled:
         return None
     if not token or not is_jwt_format(token):
@@ -72,11 +119,14 @@ def validate_oauth_token(
                 options=options,
             )
         elif config.oauth_jwks_url:
-            client = _get_jwks_client(config.oauth_jwks_url)
-            signing_key = client.get_signing_key_from_jwt(token)
+            signing_key = _get_signing_key(
+                token,
+                config.oauth_jwks_url,
+                config.oauth_cache_ttl_sec,
+            )
             payload = jwt.decode(
                 token,
-                signing_key.key,
+                signing_key,
                 algorithms=["RS256", "RS384", "RS512"],
                 audience=config.oauth_audience,
                 issuer=config.oauth_issuer,
@@ -112,7 +162,7 @@ def validate_oauth_token(
 def oauth_permissions(
     oauth_info: OAuthTokenInfo, config: Optional[Config] = None
 ) -> List[str]:
-    config = config or Config.from_env()
+    config = config or get_default_config()
     permissions: List[str] = []
 
     scope_map = {
@@ -142,6 +192,6 @@ def oauth_permissions(
 def oauth_has_admin(
     oauth_info: OAuthTokenInfo, config: Optional[Config] = None
 ) -> bool:
-    config = config or Config.from_env()
+    config = config or get_default_config()
     perms = oauth_permissions(oauth_info, config)
     return "admin" in perms
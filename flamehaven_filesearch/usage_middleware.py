@@ -6,14 +6,13 @@ Automatically tracks all API requests and enforces quotas.
 
 import logging
 import time
-from datetime import datetime, timezone
+from typing import Optional
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.concurrency import run_in_threadpool
 
 from .exceptions import RateLimitExceededError
 from .security import REQUEST_CONTEXT_KEY
-from .usage_tracker import UsageRecord, get_usage_tracker
+from .usage_tracker import UsageRecord, get_usage_tracker, utc_now
 
 logger = logging.getLogger(__name__)
 
@@ -31,46 +30,96 @@ def _collect_exceeded_quotas(quota_status: dict) -> list:
     return exceeded
 
 
-class UsageTrackingMiddleware(BaseHTTPMiddleware):
-    """Middleware to track API usage and enforce quotas"""
+def _content_length(headers) -> Optional[int]:
+    """Read content-length from raw ASGI headers (None when absent or invalid).
+
+    The raw bytes value goes straight to int(); the isdigit() guard keeps a
+    malformed header from raising inside the request path.
+    """
+    for name, value in headers:
+        if name == b"content-length":
+            return int(value) if value.isdigit() else None
+    return None
+
+
+class UsageTrackingMiddleware:
+    """
+    Middleware to track API usage and enforce quotas
+
+    Pure ASGI: it only looks at headers and the response status, so the body
+    streams straight through instead of being buffered by BaseHTTPMiddleware.
+    """
 
     def __init__(self, app, enabled: bool = True):
-        super().__init__(app)
+        self.app = app
         self.enabled = enabled
         if self.enabled:
             self.tracker = get_usage_tracker()
             logger.info("[UsageMiddleware] Usage tracking enabled")
 
-    async def dispatch(self, request: Request, call_next):
-        if not self.enabled:
-            return await call_next(request)
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http":
+            return await self.app(scope, receive, send)
 
         # Skip tracking for non-API routes
-        if not request.url.path.startswith("/api"):
-            return await call_next(request)
+        path = scope["path"]
+        if not path.startswith("/api"):
+            return await self.app(scope, receive, send)
 
         # Get API key ID from request context (if authenticated)
         api_key_id = None
-        if hasattr(request.state, REQUEST_CONTEXT_KEY):
-            context = getattr(request.state, REQUEST_CONTEXT_KEY)
+        state = scope.get("state")
+        context = state.get(REQUEST_CONTEXT_KEY) if state else None
+        if context is not None:
             api_key_id = context.api_key_id
 
         # If no API key, skip tracking (public endpoints)
         if not api_key_id:
-            return await call_next(request)
+            return await self.app(scope, receive, send)
+
+        # Keys the writer last saw well under every limit skip the checks.
+        # The rest run off the event loop: a counter rebuild from SQL may
+        # wait for the usage writer's commit.
+        if not self.tracker.has_quota_headroom(api_key_id):
+            await run_in_threadpool(self._enforce_quotas, api_key_id)
+
+        # Track request
+        start_time = time.time()
+        request_size = _content_length(scope["headers"]) or 0
+        # Streamed/chunked responses carry no content-length, so their size
+        # is the sum of the body chunks as they pass through
+        response = {"status": 0, "length": None, "body_bytes": 0}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["length"] = _content_length(message.get("headers", ()))
+            elif message["type"] == "http.response.body":
+                response["body_bytes"] += len(message.get("body", b""))
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                self._record(api_key_id, path, request_size, response, start_time)
+
+        # Process request
+        await self.app(scope, receive, send_wrapper)
 
+    def _enforce_quotas(self, api_key_id: str) -> None:
+        """Raise RateLimitExceededError if the global or per-key quota is spent"""
         # Check global system budget first
-        global_status = self.tracker.check_global_quota_exceeded()
-        if global_status["exceeded"]:
+        if self.tracker.get_global_quota_status().exceeded_mask:
             logger.warning(
-                f"[UsageMiddleware] Global budget exceeded for request from {api_key_id}"
+                "[UsageMiddleware] Global budget exceeded for request from %s",
+                api_key_id,
             )
             raise RateLimitExceededError("Global system budget exceeded")
 
         # Check per-key quota BEFORE processing request
-        quota_status = self.tracker.check_quota_exceeded(api_key_id)
-        if quota_status["exceeded"]:
-            exceeded_quotas = _collect_exceeded_quotas(quota_status)
+        quota_status = self.tracker.get_quota_status(api_key_id)
+        if quota_status.exceeded_mask:
+            # Only the rejection path pays for the nested report
+            exceeded_quotas = _collect_exceeded_quotas(quota_status.to_dict())
             logger.warning(
                 "[UsageMiddleware] Quota exceeded for %s: %s",
                 api_key_id,
@@ -80,20 +129,20 @@ class UsageTrackingMiddleware(BaseHTTPMiddleware):
                 f"Quota exceeded: {', '.join(exceeded_quotas)}"
             )
 
-        # Track request
-        start_time = time.time()
-        request_size = int(request.headers.get("content-length", 0))
-
-        # Process request
-        response = await call_next(request)
-
+    def _record(
+        self,
+        api_key_id: str,
+        path: str,
+        request_size: int,
+        response: dict,
+        start_time: float,
+    ) -> None:
+        """Record usage once the final response body chunk has been sent"""
         # Calculate metrics
         duration_ms = (time.time() - start_time) * 1000
-        response_size = 0
-
-        # Try to get response size from headers
-        if hasattr(response, "headers"):
-            response_size = int(response.headers.get("content-length", 0))
+        response_size = response["length"]
+        if response_size is None:
+            response_size = response["body_bytes"]
 
         # Estimate token usage (rough approximation: 1 token ≈ 4 characters)
         # For actual token counting, you would integrate with the LLM provider
@@ -103,14 +152,14 @@ class UsageTrackingMiddleware(BaseHTTPMiddleware):
         # Record usage
         record = UsageRecord(
             api_key_id=api_key_id,
-            endpoint=request.url.path,
+            endpoint=path,
             request_tokens=request_tokens,
             response_tokens=response_tokens,
             request_bytes=request_size,
             response_bytes=response_size,
             duration_ms=duration_ms,
-            status_code=response.status_code,
-            timestamp=datetime.now(timezone.utc),
+            status_code=response["status"],
+            timestamp=utc_now(),
         )
 
         try:
@@ -118,5 +167,3 @@ class UsageTrackingMiddleware(BaseHTTPMiddleware):
         except Exception as exc:
             # Don't fail request if usage tracking fails
             logger.error(f"[UsageMiddleware] Failed to record usage: {exc}")
-
-        return response
@@ -6,20 +6,204 @@ Provides:
 - Quota enforcement (daily/monthly limits)
 - Usage reporting and analytics
 - Alert thresholds
+
+Usage records are written by a background thread in batched transactions,
+so recording a request never waits on a SQLite commit. Quota checks count
+queued records in memory and never wait for the writer. Reporting reads
+flush pending records first, so they see every record queued before the
+call unless the writer falls more than READ_FLUSH_TIMEOUT_SEC behind.
 """
 
 import logging
+import queue
 import sqlite3
+import threading
+import time
+from collections import deque
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+def _to_ms(moment: datetime) -> int:
+    """Unix epoch milliseconds, the storage format of usage_records.ts_ms"""
+    return int(moment.timestamp() * 1000)
+
+
+def _partition_for(ts_ms: int) -> Tuple[str, int, int]:
+    """Monthly partition table holding `ts_ms`, with its [start, end) in ms"""
+    moment = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc)
+    start = moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    end = (start + timedelta(days=32)).replace(day=1)
+    return f"{_PARTITION_PREFIX}{start:%Y%m}", _to_ms(start), _to_ms(end)
+
+
+class _NowCache:
+    """Current UTC time, rebuilt at most once per wall-clock second.
+
+    Quota windows are days and months, so second resolution is plenty and
+    saves a tz-aware datetime construction on every request.
+    """
+
+    def __init__(self) -> None:
+        self._cached: Tuple[int, Optional[datetime]] = (-1, None)
+
+    def now(self) -> datetime:
+        second = int(time.time())
+        cached_second, cached = self._cached
+        if second != cached_second or cached is None:
+            cached = datetime.fromtimestamp(second, tz=timezone.utc)
+            self._cached = (second, cached)
+        return cached
+
+
+utc_now = _NowCache().now
+
+
+# (day start ms, next day start ms, (day start ms, month start ms))
+_period_starts_cache: Tuple[int, int, Tuple[int, int]] = (0, 0, (0, 0))
+
+
+def _period_starts(now: datetime) -> Tuple[int, int]:
+    """Epoch ms at the start of the UTC day and month containing `now`
+
+    Cached for the rest of the day, so the per-request path is one range
+    check instead of two datetime rebuilds.
+    """
+    global _period_starts_cache
+    now_ms = _to_ms(now)
+    day_start_ms, next_day_ms, starts = _period_starts_cache
+    if day_start_ms <= now_ms < next_day_ms:
+        return starts
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    starts = (_to_ms(day_start), _to_ms(day_start.replace(day=1)))
+    _period_starts_cache = (starts[0], starts[0] + 86_400_000, starts)
+    return starts
+
+
+_STOP_WRITER = object()
+
+# Quota configs and alerts live in their own files, attached to every
+# connection under these schema names; usage records stay in "main".
+_ATTACHED_SCHEMAS = ("cfg", "alerts")
+
+# Per-connection tuning. WAL itself is persistent and set once in _ensure_db.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+)
+# Applied to main and to each attached schema
+_SCHEMA_PRAGMAS = (
+    "synchronous=NORMAL",
+    "cache_size=-20000",
+    "mmap_size=268435456",
+)
+
+# usage_records is a view over one table per UTC month (usage_records_YYYYMM),
+# so retention cleanup drops whole months instead of deleting row by row.
+_PARTITION_PREFIX = "usage_records_"
+
+_PARTITION_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY,
+        api_key_id TEXT NOT NULL,
+        endpoint TEXT NOT NULL,
+        request_tokens INTEGER DEFAULT 0,
+        response_tokens INTEGER DEFAULT 0,
+        request_bytes INTEGER DEFAULT 0,
+        response_bytes INTEGER DEFAULT 0,
+        duration_ms REAL DEFAULT 0.0,
+        status_code INTEGER DEFAULT 200,
+        ts_ms INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_{table}_ts_ms ON {table}(ts_ms)",
+    # Covers the per-key quota and stats aggregates, so they are answered
+    # from the index without touching table pages
+    """
+    CREATE INDEX IF NOT EXISTS idx_{table}_covering ON {table}(
+        api_key_id, ts_ms, request_tokens, response_tokens,
+        request_bytes, response_bytes, duration_ms, status_code
+    )
+    """,
+)
+
+_USAGE_COLUMNS = """
+    api_key_id, endpoint, request_tokens, response_tokens,
+    request_bytes, response_bytes, duration_ms, status_code, ts_ms
+"""
+
+# Columns the aggregate queries read; all are in each partition's covering index
+_METRIC_COLUMNS = """
+    api_key_id, ts_ms, request_tokens, response_tokens,
+    request_bytes, response_bytes, duration_ms, status_code
+"""
+
+_INSERT_USAGE_SQL = f"""
+    INSERT INTO {{table}} ({_USAGE_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SET_QUOTA_SQL = """
+    INSERT OR REPLACE INTO cfg.quota_configs (
+        api_key_id, daily_requests, daily_tokens,
+        monthly_requests, monthly_tokens, alert_threshold_pct,
+        updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SELECT_QUOTA_SQL = """
+    SELECT daily_requests, daily_tokens, monthly_requests,
+           monthly_tokens, alert_threshold_pct
+    FROM cfg.quota_configs WHERE api_key_id = ?
+"""
+
+# Current-month usage in one pass; the daily figures are conditional sums.
+# Params: day start, day start, [api_key_id,] month start, now.
+# {source} comes from UsageTracker._usage_source().
+_PERIOD_USAGE_SQL = """
+    SELECT
+        SUM(CASE WHEN ts_ms >= ? THEN 1 ELSE 0 END),
+        SUM(
+            CASE WHEN ts_ms >= ?
+            THEN request_tokens + response_tokens ELSE 0 END
+        ),
+        COUNT(*),
+        SUM(request_tokens) + SUM(response_tokens)
+    FROM {source}
+    WHERE {key_filter}ts_ms >= ? AND ts_ms <= ?
+"""
+
+# idx_alerts_dedup makes this a no-op for a key/type already alerted
+# in the same UTC hour (hour_bucket = epoch seconds // 3600)
+_INSERT_ALERT_SQL = """
+    INSERT INTO alerts.usage_alerts (
+        api_key_id, alert_type, threshold_pct,
+        current_usage, quota_limit, hour_bucket
+    ) VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (api_key_id, alert_type, hour_bucket) DO NOTHING
+"""
+
+
 class UsageRecord:
     """Single usage record"""
 
+    # One is allocated per tracked request; slots keep it small
+    __slots__ = (
+        "api_key_id",
+        "endpoint",
+        "request_tokens",
+        "response_tokens",
+        "request_bytes",
+        "response_bytes",
+        "duration_ms",
+        "status_code",
+        "timestamp",
+    )
+
     def __init__(
         self,
         api_key_id: str,
@@ -36,18 +220,32 @@ class UsageRecord:
         self.endpoint = endpoint
         self.request_tokens = request_tokens
         self.response_tokens = response_tokens
-        self.total_tokens = request_tokens + response_tokens
         self.request_bytes = request_bytes
         self.response_bytes = response_bytes
-        self.total_bytes = request_bytes + response_bytes
         self.duration_ms = duration_ms
         self.status_code = status_code
-        self.timestamp = timestamp or datetime.now(timezone.utc)
+        self.timestamp = timestamp or utc_now()
+
+    @property
+    def total_tokens(self) -> int:
+        return self.request_tokens + self.response_tokens
+
+    @property
+    def total_bytes(self) -> int:
+        return self.request_bytes + self.response_bytes
 
 
 class QuotaConfig:
     """Quota configuration for an API key"""
 
+    __slots__ = (
+        "daily_requests",
+        "daily_tokens",
+        "monthly_requests",
+        "monthly_tokens",
+        "alert_threshold_pct",
+    )
+
     def __init__(
         self,
         daily_requests: int = 10000,
@@ -66,6 +264,15 @@ class QuotaConfig:
 class UsageStats:
     """Usage statistics for a time period"""
 
+    __slots__ = (
+        "total_requests",
+        "total_tokens",
+        "total_bytes",
+        "avg_duration_ms",
+        "success_rate",
+        "top_endpoints",
+    )
+
     def __init__(
         self,
         total_requests: int = 0,
@@ -83,64 +290,237 @@ class UsageStats:
         self.top_endpoints = top_endpoints or []
 
 
+# (period, metric) of each QuotaStatus usage field, in exceeded_mask bit order
+_QUOTA_FIELDS = (
+    ("daily", "requests"),
+    ("daily", "tokens"),
+    ("monthly", "requests"),
+    ("monthly", "tokens"),
+)
+
+
+def _usage_pct(current: int, limit: int) -> float:
+    return (current / limit * 100) if limit > 0 else 0.0
+
+
+class QuotaStatus:
+    """Period usage measured against a quota
+
+    Flat and slotted so the per-request check builds one small object;
+    bit i of `exceeded_mask` is set when _QUOTA_FIELDS[i] is at its limit.
+    to_dict() builds the nested report for the admin API and error messages.
+    """
+
+    __slots__ = (
+        "daily_requests",
+        "daily_tokens",
+        "monthly_requests",
+        "monthly_tokens",
+        "limits",
+        "exceeded_mask",
+    )
+
+    def __init__(self, limits: QuotaConfig, usage: Tuple[int, int, int, int]):
+        (
+            self.daily_requests,
+            self.daily_tokens,
+            self.monthly_requests,
+            self.monthly_tokens,
+        ) = usage
+        self.limits = limits
+        self.exceeded_mask = (
+            (self.daily_requests >= limits.daily_requests)
+            | (self.daily_tokens >= limits.daily_tokens) << 1
+            | (self.monthly_requests >= limits.monthly_requests) << 2
+            | (self.monthly_tokens >= limits.monthly_tokens) << 3
+        )
+
+    @property
+    def exceeded(self) -> bool:
+        return self.exceeded_mask != 0
+
+    def entries(self):
+        """Yield (period, metric, current, limit) for each quota field"""
+        for period, metric in _QUOTA_FIELDS:
+            name = f"{period}_{metric}"
+            yield period, metric, getattr(self, name), getattr(self.limits, name)
+
+    def peak_pct(self) -> float:
+        """Highest usage percentage across all four limits"""
+        return max(
+            _usage_pct(current, limit) for _, _, current, limit in self.entries()
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Nested {period: {metric: {current, limit, exceeded, pct}}} report"""
+        result: Dict[str, Any] = {"exceeded": self.exceeded}
+        for period, metric, current, limit in self.entries():
+            result.setdefault(period, {})[metric] = {
+                "current": current,
+                "limit": limit,
+                "exceeded": current >= limit,
+                "pct": _usage_pct(current, limit),
+            }
+        return result
+
+
+class _UsageCounter:
+    """Running request/token totals for the current day and month"""
+
+    def __init__(
+        self,
+        day_start_ms: int,
+        month_start_ms: int,
+        usage: Tuple[int, int, int, int],
+    ):
+        self.day_start_ms = day_start_ms
+        self.month_start_ms = month_start_ms
+        self.built_at = time.monotonic()
+        (
+            self.day_requests,
+            self.day_tokens,
+            self.month_requests,
+            self.month_tokens,
+        ) = usage
+
+    def add(self, ts_ms: int, tokens: int) -> None:
+        if ts_ms >= self.month_start_ms:
+            self.month_requests += 1
+            self.month_tokens += tokens
+            if ts_ms >= self.day_start_ms:
+                self.day_requests += 1
+                self.day_tokens += tokens
+
+    def totals(self) -> Tuple[int, int, int, int]:
+        return (
+            self.day_requests,
+            self.day_tokens,
+            self.month_requests,
+            self.month_tokens,
+        )
+
+
 class UsageTracker:
     """Track and enforce API usage quotas"""
 
     GLOBAL_QUOTA_KEY: str = "__global__"
-
-    def __init__(self, db_path: str = "./data/usage.db"):
+    # Keys below this share of every limit skip the pre-request quota checks
+    HEADROOM_PCT: float = 50.0
+    # Quota configs change rarely; other processes' edits show up after this
+    QUOTA_CACHE_TTL_SEC: float = 60.0
+    # Counters are rebuilt from SQL this often, so usage written by other
+    # worker processes sharing the database counts toward quotas too
+    COUNTER_REFRESH_SEC: float = 2.0
+    # Longest a report waits for queued records before reading without them
+    READ_FLUSH_TIMEOUT_SEC: float = 5.0
+
+    def __init__(self, db_path: str = "./data/usage.db", write_batch_size: int = 500):
         self.db_path = db_path
+        # Sibling files, e.g. usage.db -> usage_config.db / usage_alerts.db.
+        # Keeping them out of the records file keeps its WAL to usage writes.
+        base = Path(db_path)
+        self.config_db_path = str(base.with_name(f"{base.stem}_config{base.suffix}"))
+        self.alerts_db_path = str(base.with_name(f"{base.stem}_alerts{base.suffix}"))
+        self.write_batch_size = write_batch_size
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        # Guards the enqueued/written counters that flush() waits on
+        self._progress = threading.Condition()
+        self._enqueued = 0
+        self._written = 0
+        # One reusable connection per thread; bumping the generation makes
+        # every thread reconnect after _close_connections()
+        self._local = threading.local()
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+        self._conn_generation = 0
+        # Quota counters per key (None = all keys), bumped as records are
+        # queued. The writer holds _counters_lock across each commit and the
+        # matching _unwritten trim, so a counter rebuilt from SQL plus the
+        # still-unwritten records never misses or double-counts a batch.
+        self._counters: Dict[Optional[str], _UsageCounter] = {}
+        self._counters_lock = threading.Lock()
+        # (api_key_id, ts_ms, tokens) of queued records, in queue order
+        self._unwritten: Deque[Tuple[str, int, int]] = deque()
+        # Guards _counters contents and _unwritten; never held across I/O,
+        # so the request path can read counters while the writer commits
+        self._tally_lock = threading.Lock()
+        # Keys (and GLOBAL_QUOTA_KEY) found well under quota by the last
+        # write batch that touched them; see has_quota_headroom()
+        self._headroom: Set[str] = set()
+        # api_key_id -> (monotonic fetch time, quota)
+        self._quota_cache: Dict[str, Tuple[float, QuotaConfig]] = {}
+        # api_key_id -> alert_type -> start (ms) of the period last alerted
+        self._alerted: Dict[str, Dict[str, int]] = {}
+        # Partition table -> [start, end) ms. The writer creates and cleanup
+        # drops partitions under _counters_lock; readers hold it while they
+        # resolve and query partitions, so they never see a half-made change.
+        self._partitions: Dict[str, Tuple[int, int]] = {}
         self._ensure_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's tuned connection to the usage database"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.generation == self._conn_generation:
+            return conn
+
+        # A roomy statement cache keeps the hoisted *_SQL statements compiled
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=30,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        try:
+            for schema, path in zip(
+                _ATTACHED_SCHEMAS, (self.config_db_path, self.alerts_db_path)
+            ):
+                conn.execute(f"ATTACH DATABASE ? AS {schema}", (path,))
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            for schema in ("main",) + _ATTACHED_SCHEMAS:
+                for pragma in _SCHEMA_PRAGMAS:
+                    conn.execute(f"PRAGMA {schema}.{pragma}")
+        except Exception:
+            conn.close()
+            raise
+        with self._conns_lock:
+            self._conns.append(conn)
+            self._local.generation = self._conn_generation
+        self._local.conn = conn
+        return conn
+
+    def _close_connections(self) -> None:
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+            self._conn_generation += 1
+        for conn in conns:
+            conn.close()
+
     def _ensure_db(self) -> None:
         """Create usage database and tables"""
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
 
-        with sqlite3.connect(self.db_path) as conn:
-            # Usage records table
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS usage_records (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    api_key_id TEXT NOT NULL,
-                    endpoint TEXT NOT NULL,
-                    request_tokens INTEGER DEFAULT 0,
-                    response_tokens INTEGER DEFAULT 0,
-                    total_tokens INTEGER DEFAULT 0,
-                    request_bytes INTEGER DEFAULT 0,
-                    response_bytes INTEGER DEFAULT 0,
-                    total_bytes INTEGER DEFAULT 0,
-                    duration_ms REAL DEFAULT 0.0,
-                    status_code INTEGER DEFAULT 200,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-            )
+        with self._connect() as conn:
+            # WAL lets quota reads run alongside the batch writer
+            for schema in ("main",) + _ATTACHED_SCHEMAS:
+                conn.execute(f"PRAGMA {schema}.journal_mode=WAL")
 
-            # Create indexes for usage_records
-            conn.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_usage_api_key
-                ON usage_records(api_key_id)
-                """
-            )
-            conn.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_usage_timestamp
-                ON usage_records(timestamp)
-                """
-            )
-            conn.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_usage_api_key_timestamp
-                ON usage_records(api_key_id, timestamp)
-                """
-            )
+            # Usage records: monthly partitions behind the usage_records view
+            self._load_partitions(conn)
+            legacy = conn.execute(
+                "SELECT 1 FROM sqlite_master "
+                "WHERE type = 'table' AND name = 'usage_records'"
+            ).fetchone()
+            if legacy:
+                self._migrate_timestamps(conn)
+                self._partition_legacy_table(conn)
+            self._ensure_partition(conn, _to_ms(datetime.now(timezone.utc)))
 
             # Quota configurations table
             conn.execute(
                 """
-                CREATE TABLE IF NOT EXISTS quota_configs (
+                CREATE TABLE IF NOT EXISTS cfg.quota_configs (
                     api_key_id TEXT PRIMARY KEY,
                     daily_requests INTEGER DEFAULT 10000,
                     daily_tokens INTEGER DEFAULT 1000000,
@@ -155,14 +535,15 @@ class UsageTracker:
             # Alert history table
             conn.execute(
                 """
-                CREATE TABLE IF NOT EXISTS usage_alerts (
+                CREATE TABLE IF NOT EXISTS alerts.usage_alerts (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     api_key_id TEXT NOT NULL,
                     alert_type TEXT NOT NULL,
                     threshold_pct REAL NOT NULL,
                     current_usage INTEGER NOT NULL,
                     quota_limit INTEGER NOT NULL,
-                    triggered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    triggered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    hour_bucket INTEGER
                 )
                 """
             )
@@ -170,61 +551,384 @@ class UsageTracker:
             # Create indexes for usage_alerts
             conn.execute(
                 """
-                CREATE INDEX IF NOT EXISTS idx_alerts_api_key
+                CREATE INDEX IF NOT EXISTS alerts.idx_alerts_api_key
                 ON usage_alerts(api_key_id)
                 """
             )
             conn.execute(
                 """
-                CREATE INDEX IF NOT EXISTS idx_alerts_timestamp
+                CREATE INDEX IF NOT EXISTS alerts.idx_alerts_timestamp
                 ON usage_alerts(triggered_at)
                 """
             )
+            self._move_legacy_tables(conn)
+            self._migrate_alert_buckets(conn)
+            conn.execute(
+                """
+                CREATE UNIQUE INDEX IF NOT EXISTS alerts.idx_alerts_dedup
+                ON usage_alerts(api_key_id, alert_type, hour_bucket)
+                """
+            )
 
             conn.commit()
             logger.info(f"[UsageTracker] Database initialized at {self.db_path}")
 
-    def record_usage(self, record: UsageRecord) -> None:
-        """Record a single usage event"""
-        with sqlite3.connect(self.db_path) as conn:
+    @staticmethod
+    def _move_legacy_tables(conn: sqlite3.Connection) -> None:
+        """Move quota_configs/usage_alerts out of a single-file database"""
+        for schema, table in (("cfg", "quota_configs"), ("alerts", "usage_alerts")):
+            legacy = conn.execute(
+                "SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = ?",
+                (table,),
+            ).fetchone()
+            if legacy:
+                columns = ", ".join(
+                    row[1] for row in conn.execute(f"PRAGMA main.table_info({table})")
+                )
+                conn.execute(
+                    f"INSERT OR IGNORE INTO {schema}.{table} ({columns}) "
+                    f"SELECT {columns} FROM main.{table}"
+                )
+                conn.execute(f"DROP TABLE main.{table}")
+                logger.info(f"[UsageTracker] Moved {table} into its own file")
+
+    @staticmethod
+    def _migrate_alert_buckets(conn: sqlite3.Connection) -> None:
+        """Give pre-dedup alert rows an hour_bucket, keeping one per hour"""
+        columns = {
+            row[1] for row in conn.execute("PRAGMA alerts.table_info(usage_alerts)")
+        }
+        if "hour_bucket" not in columns:
+            conn.execute(
+                "ALTER TABLE alerts.usage_alerts ADD COLUMN hour_bucket INTEGER"
+            )
+
+        filled = conn.execute(
+            """
+            UPDATE alerts.usage_alerts
+            SET hour_bucket = CAST(strftime('%s', triggered_at) AS INTEGER) / 3600
+            WHERE hour_bucket IS NULL
+            """
+        ).rowcount
+        if filled:
             conn.execute(
                 """
-                INSERT INTO usage_records (
-                    api_key_id, endpoint, request_tokens, response_tokens,
-                    total_tokens, request_bytes, response_bytes, total_bytes,
-                    duration_ms, status_code, timestamp
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    record.api_key_id,
-                    record.endpoint,
-                    record.request_tokens,
-                    record.response_tokens,
-                    record.total_tokens,
-                    record.request_bytes,
-                    record.response_bytes,
-                    record.total_bytes,
-                    record.duration_ms,
-                    record.status_code,
-                    record.timestamp.isoformat(),
-                ),
+                DELETE FROM alerts.usage_alerts WHERE id NOT IN (
+                    SELECT MIN(id) FROM alerts.usage_alerts
+                    GROUP BY api_key_id, alert_type, hour_bucket
+                )
+                """
             )
-            conn.commit()
+            logger.info(f"[UsageTracker] Bucketed {filled} existing alerts by hour")
+
+    @staticmethod
+    def _migrate_timestamps(conn: sqlite3.Connection) -> None:
+        """Move legacy ISO-8601 `timestamp` text into integer `ts_ms`"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(usage_records)")}
+        if "ts_ms" in columns:
+            return
+
+        conn.execute("ALTER TABLE usage_records ADD COLUMN ts_ms INTEGER")
+        conn.execute(
+            """
+            UPDATE usage_records SET ts_ms = CAST(
+                ROUND((julianday(timestamp) - 2440587.5) * 86400000) AS INTEGER
+            )
+            """
+        )
+        conn.execute("DROP INDEX IF EXISTS idx_usage_timestamp")
+        conn.execute("DROP INDEX IF EXISTS idx_usage_api_key_timestamp")
+        try:
+            conn.execute("ALTER TABLE usage_records DROP COLUMN timestamp")
+        except sqlite3.OperationalError:
+            pass  # SQLite < 3.35 keeps the unused column
+        conn.commit()
+        logger.info("[UsageTracker] Migrated usage_records timestamps to ts_ms")
+
+    def _partition_legacy_table(self, conn: sqlite3.Connection) -> None:
+        """Move rows of a pre-partitioning usage_records table into partitions
+
+        Only the current columns are copied, so legacy total_* columns go
+        away with the old table.
+        """
+        conn.execute("ALTER TABLE usage_records RENAME TO usage_records_legacy")
+        first_ms, last_ms = conn.execute(
+            "SELECT MIN(ts_ms), MAX(ts_ms) FROM usage_records_legacy"
+        ).fetchone()
+        start_ms = first_ms
+        while start_ms is not None and start_ms <= last_ms:
+            table = self._ensure_partition(conn, start_ms)
+            start_ms, end_ms = self._partitions[table]
+            conn.execute(
+                f"INSERT INTO {table} ({_USAGE_COLUMNS}) "
+                f"SELECT {_USAGE_COLUMNS} FROM usage_records_legacy "
+                "WHERE ts_ms >= ? AND ts_ms < ?",
+                (start_ms, end_ms),
+            )
+            start_ms = end_ms
+        conn.execute("DROP TABLE usage_records_legacy")
+        self._refresh_view(conn)
+        conn.commit()
+        logger.info("[UsageTracker] Split usage_records into monthly partitions")
+
+    def _load_partitions(self, conn: sqlite3.Connection) -> None:
+        """Read the partition tables that exist in the database"""
+        rows = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ?",
+            (_PARTITION_PREFIX + "[0-9]*",),
+        ).fetchall()
+        partitions = {}
+        for (table,) in rows:
+            month = datetime.strptime(table[len(_PARTITION_PREFIX) :], "%Y%m")
+            _, start_ms, end_ms = _partition_for(
+                _to_ms(month.replace(tzinfo=timezone.utc))
+            )
+            partitions[table] = (start_ms, end_ms)
+        self._partitions = partitions
+
+    def _refresh_view(self, conn: sqlite3.Connection) -> None:
+        """Point the usage_records view at every partition table
+
+        Re-reads the schema so partitions made by other processes sharing
+        the file stay visible. Callers run this inside a transaction so
+        readers never see the view missing.
+        """
+        self._load_partitions(conn)
+        selects = " UNION ALL ".join(
+            f"SELECT * FROM {table}" for table in sorted(self._partitions)
+        )
+        conn.execute("DROP VIEW IF EXISTS usage_records")
+        conn.execute(f"CREATE VIEW usage_records AS {selects}")
+
+    def _ensure_partition(self, conn: sqlite3.Connection, ts_ms: int) -> str:
+        """Return the partition table for `ts_ms`, creating it if needed"""
+        table, _, _ = _partition_for(ts_ms)
+        if table not in self._partitions:
+            for ddl in _PARTITION_DDL:
+                conn.execute(ddl.format(table=table))
+            self._refresh_view(conn)
+        return table
+
+    def _usage_source(
+        self,
+        columns: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+    ) -> str:
+        """FROM-clause source covering only partitions that overlap the range
+
+        Selecting just `columns` (instead of the usage_records view's `*`)
+        keeps each partition's covering index usable.
+        """
+        tables = [
+            table
+            for table, (start, end) in sorted(self._partitions.items())
+            if (start_ms is None or end > start_ms)
+            and (end_ms is None or start <= end_ms)
+        ]
+        if not tables:
+            return "usage_records"
+        if len(tables) == 1:
+            return tables[0]
+        selects = " UNION ALL ".join(f"SELECT {columns} FROM {t}" for t in tables)
+        return f"({selects})"
+
+    def _route_rows(
+        self, conn: sqlite3.Connection, rows: List[Tuple[Any, ...]]
+    ) -> Dict[str, List[Tuple[Any, ...]]]:
+        """Group insert rows by partition table"""
+        routed: Dict[str, List[Tuple[Any, ...]]] = {}
+        table, start_ms, end_ms = "", 0, 0
+        for row in rows:
+            ts_ms = row[8]
+            if not start_ms <= ts_ms < end_ms:
+                table = self._ensure_partition(conn, ts_ms)
+                start_ms, end_ms = self._partitions[table]
+            routed.setdefault(table, []).append(row)
+        return routed
+
+    def record_usage(self, record: UsageRecord) -> None:
+        """Queue a single usage event for the background writer
+
+        The event counts toward quotas at once, before it is written.
+        """
+        ts_ms = _to_ms(record.timestamp)
+        tokens = record.request_tokens + record.response_tokens
+        with self._progress:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._writer_loop, name="usage-writer", daemon=True
+                )
+                self._writer.start()
+            with self._tally_lock:
+                # Same order as the queue, so the writer can trim from the left
+                self._unwritten.append((record.api_key_id, ts_ms, tokens))
+                for key in (record.api_key_id, None):
+                    counter = self._counters.get(key)
+                    if counter is not None:
+                        counter.add(ts_ms, tokens)
+            self._enqueued += 1
+            self._queue.put(record)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every record queued before this call is written.
+
+        Returns False if the timeout expired first.
+        """
+        if threading.current_thread() is self._writer:
+            return True  # quota checks on the writer already see its batch
+        with self._progress:
+            target = self._enqueued
+            return self._progress.wait_for(lambda: self._written >= target, timeout)
+
+    def _flush_for_read(self) -> None:
+        """flush() before a read, bounded by READ_FLUSH_TIMEOUT_SEC"""
+        if not self.flush(self.READ_FLUSH_TIMEOUT_SEC):
+            logger.warning(
+                "[UsageTracker] Usage writer is behind; reading without "
+                "the records still queued"
+            )
+
+    def close(self) -> None:
+        """Write any queued records, stop the writer and close connections"""
+        with self._progress:
+            writer = self._writer
+            if writer is not None and writer.is_alive():
+                self._queue.put(_STOP_WRITER)
+            else:
+                writer = None
+        if writer is not None:
+            writer.join()
+        self._close_connections()
+
+    def _writer_loop(self) -> None:
+        """Drain the queue into one transaction per batch."""
+        stop = False
+        while not stop:
+            batch = []
+            item = self._queue.get()
+            while True:
+                if item is _STOP_WRITER:
+                    stop = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.write_batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if not batch:
+                continue
+            try:
+                conn = self._connect()
+            except Exception as exc:
+                # Keep draining, so flush() callers are not left waiting
+                logger.error(
+                    f"[UsageTracker] Failed to write {len(batch)} usage records: {exc}"
+                )
+                with self._counters_lock:
+                    self._forget_unwritten(len(batch))
+                self._mark_written(len(batch))
+                continue
+            self._write_batch(conn, batch)
+
+    def _forget_unwritten(self, count: int) -> None:
+        """Drop the oldest `count` unwritten entries; caller holds _counters_lock
+
+        Records that failed to write stay in the counters until the next
+        rebuild from SQL.
+        """
+        with self._tally_lock:
+            for _ in range(count):
+                self._unwritten.popleft()
+
+    def _mark_written(self, count: int) -> None:
+        with self._progress:
+            self._written += count
+            self._progress.notify_all()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[UsageRecord]) -> None:
+        rows = [
+            (
+                record.api_key_id,
+                record.endpoint,
+                record.request_tokens,
+                record.response_tokens,
+                record.request_bytes,
+                record.response_bytes,
+                record.duration_ms,
+                record.status_code,
+                _to_ms(record.timestamp),
+            )
+            for record in batch
+        ]
+        try:
+            with self._counters_lock:
+                try:
+                    self._insert_rows(conn, rows)
+                except sqlite3.Error as exc:
+                    if len(rows) == 1:
+                        raise
+                    # Retry one row per transaction so a bad record only
+                    # costs itself, not the rest of the batch
+                    logger.warning(
+                        f"[UsageTracker] Batch of {len(rows)} usage records "
+                        f"failed, retrying row by row: {exc}"
+                    )
+                    rows = self._insert_rows_one_by_one(conn, rows)
+                finally:
+                    self._forget_unwritten(len(batch))
+            # Check quotas and trigger alerts once per key in the batch
+            for api_key_id in dict.fromkeys(row[0] for row in rows):
+                self._check_quotas(api_key_id)
+            self._update_headroom(self.GLOBAL_QUOTA_KEY, self.get_global_quota_status())
+        except Exception as exc:
+            logger.error(
+                f"[UsageTracker] Failed to write {len(batch)} usage records: {exc}"
+            )
+        finally:
+            self._mark_written(len(batch))
 
-        # Check quotas and trigger alerts if needed
-        self._check_quotas(record.api_key_id)
+    def _insert_rows(
+        self, conn: sqlite3.Connection, rows: List[Tuple[Any, ...]]
+    ) -> None:
+        """Insert rows in one transaction; caller holds _counters_lock"""
+        try:
+            with conn:
+                # One transaction, so a new partition and its view update
+                # land together with the rows. IMMEDIATE takes the write lock
+                # up front (waiting on busy_timeout) rather than failing a
+                # read-to-write upgrade mid-batch.
+                conn.execute("BEGIN IMMEDIATE")
+                for table, table_rows in self._route_rows(conn, rows).items():
+                    conn.executemany(_INSERT_USAGE_SQL.format(table=table), table_rows)
+        except Exception:
+            # The rollback also undid any partition this batch made
+            self._load_partitions(conn)
+            raise
+
+    def _insert_rows_one_by_one(
+        self, conn: sqlite3.Connection, rows: List[Tuple[Any, ...]]
+    ) -> List[Tuple[Any, ...]]:
+        """Insert each row in its own transaction; return the rows written"""
+        written = []
+        for row in rows:
+            try:
+                self._insert_rows(conn, [row])
+            except sqlite3.Error as exc:
+                logger.error(
+                    f"[UsageTracker] Failed to write usage record for {row[0]}: {exc}"
+                )
+            else:
+                written.append(row)
+        return written
 
     def set_quota(self, api_key_id: str, quota: QuotaConfig) -> None:
         """Set quota configuration for an API key"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute(
-                """
-                INSERT OR REPLACE INTO quota_configs (
-                    api_key_id, daily_requests, daily_tokens,
-                    monthly_requests, monthly_tokens, alert_threshold_pct,
-                    updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
+                _SET_QUOTA_SQL,
                 (
                     api_key_id,
                     quota.daily_requests,
@@ -237,99 +941,111 @@ class UsageTracker:
             )
             conn.commit()
             logger.info(f"[UsageTracker] Quota updated for {api_key_id}")
+        self._quota_cache.pop(api_key_id, None)
+        self._alerted.pop(api_key_id, None)
+        # A lowered limit may remove headroom; re-check on the next request
+        if api_key_id == self.GLOBAL_QUOTA_KEY:
+            self._headroom.clear()
+        else:
+            self._headroom.discard(api_key_id)
 
     def get_quota(self, api_key_id: str) -> QuotaConfig:
-        """Get quota configuration for an API key"""
-        with sqlite3.connect(self.db_path) as conn:
-            row = conn.execute(
-                """
-                SELECT daily_requests, daily_tokens, monthly_requests,
-                       monthly_tokens, alert_threshold_pct
-                FROM quota_configs WHERE api_key_id = ?
-                """,
-                (api_key_id,),
-            ).fetchone()
-
-        if row:
-            return QuotaConfig(*row)
-        return QuotaConfig()  # Default quota
-
-    def check_quota_exceeded(self, api_key_id: str) -> Dict[str, Any]:
-        """Check if any quota is exceeded"""
-        quota = self.get_quota(api_key_id)
-        now = datetime.now(timezone.utc)
-
-        # Daily usage
-        daily_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        daily_stats = self.get_usage_stats(
-            api_key_id, start_time=daily_start, end_time=now
-        )
-
-        # Monthly usage
-        monthly_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        monthly_stats = self.get_usage_stats(
-            api_key_id, start_time=monthly_start, end_time=now
-        )
-
-        result = {
-            "exceeded": False,
-            "daily": {
-                "requests": {
-                    "current": daily_stats.total_requests,
-                    "limit": quota.daily_requests,
-                    "exceeded": daily_stats.total_requests >= quota.daily_requests,
-                    "pct": (
-                        (daily_stats.total_requests / quota.daily_requests * 100)
-                        if quota.daily_requests > 0
-                        else 0
-                    ),
-                },
-                "tokens": {
-                    "current": daily_stats.total_tokens,
-                    "limit": quota.daily_tokens,
-                    "exceeded": daily_stats.total_tokens >= quota.daily_tokens,
-                    "pct": (
-                        (daily_stats.total_tokens / quota.daily_tokens * 100)
-                        if quota.daily_tokens > 0
-                        else 0
-                    ),
-                },
-            },
-            "monthly": {
-                "requests": {
-                    "current": monthly_stats.total_requests,
-                    "limit": quota.monthly_requests,
-                    "exceeded": monthly_stats.total_requests >= quota.monthly_requests,
-                    "pct": (
-                        (monthly_stats.total_requests / quota.monthly_requests * 100)
-                        if quota.monthly_requests > 0
-                        else 0
-                    ),
-                },
-                "tokens": {
-                    "current": monthly_stats.total_tokens,
-                    "limit": quota.monthly_tokens,
-                    "exceeded": monthly_stats.total_tokens >= quota.monthly_tokens,
-                    "pct": (
-                        (monthly_stats.total_tokens / quota.monthly_tokens * 100)
-                        if quota.monthly_tokens > 0
-                        else 0
-                    ),
-                },
-            },
-        }
-
-        # Set overall exceeded flag
-        result["exceeded"] = any(
-            [
-                result["daily"]["requests"]["exceeded"],
-                result["daily"]["tokens"]["exceeded"],
-                result["monthly"]["requests"]["exceeded"],
-                result["monthly"]["tokens"]["exceeded"],
-            ]
-        )
+        """Get quota configuration for an API key (cached for a short TTL)"""
+        now = time.monotonic()
+        cached = self._quota_cache.get(api_key_id)
+        if cached is not None and now - cached[0] < self.QUOTA_CACHE_TTL_SEC:
+            return cached[1]
+
+        with self._connect() as conn:
+            row = conn.execute(_SELECT_QUOTA_SQL, (api_key_id,)).fetchone()
+
+        quota = QuotaConfig(*row) if row else QuotaConfig()  # Default quota
+        self._quota_cache[api_key_id] = (now, quota)
+        return quota
+
+    def get_quota_status(
+        self, api_key_id: str, quota: Optional[QuotaConfig] = None
+    ) -> QuotaStatus:
+        """Current usage against the key's quota
+
+        Pass `quota` when the caller already holds the key's config.
+        """
+        if quota is None:
+            quota = self.get_quota(api_key_id)
+        return QuotaStatus(quota, self._period_usage(api_key_id))
+
+    def check_quota_exceeded(
+        self, api_key_id: str, quota: Optional[QuotaConfig] = None
+    ) -> Dict[str, Any]:
+        """Check if any quota is exceeded (see QuotaStatus.to_dict)"""
+        return self.get_quota_status(api_key_id, quota).to_dict()
+
+    def _period_usage(self, api_key_id: Optional[str]) -> Tuple[int, int, int, int]:
+        """Return (daily requests, daily tokens, monthly requests, monthly tokens).
+
+        Served from an in-memory counter that includes queued records, so
+        it never waits for the writer to flush. A key's counter is built
+        from SQL the first time it is needed, when the day rolls over, and
+        every COUNTER_REFRESH_SEC to pick up other processes' usage. Only a
+        missing or day-old counter waits for an in-progress commit; a stale
+        one is served as is until the writer's lock is free.
+        """
+        now = utc_now()
+        day_start_ms, month_start_ms = _period_starts(now)
+
+        with self._tally_lock:
+            counter = self._counters.get(api_key_id)
+            current = counter is not None and counter.day_start_ms == day_start_ms
+            if current and (
+                time.monotonic() - counter.built_at < self.COUNTER_REFRESH_SEC
+            ):
+                return counter.totals()
+
+        if not self._counters_lock.acquire(blocking=not current):
+            with self._tally_lock:
+                return counter.totals()
+        try:
+            # utc_now() is floored to the second; include all of it
+            usage = self._query_period_usage(
+                api_key_id, day_start_ms, month_start_ms, _to_ms(now) + 999
+            )
+            counter = _UsageCounter(day_start_ms, month_start_ms, usage)
+            with self._tally_lock:
+                for key, ts_ms, tokens in self._unwritten:
+                    if api_key_id is None or key == api_key_id:
+                        counter.add(ts_ms, tokens)
+                self._counters[api_key_id] = counter
+                return counter.totals()
+        finally:
+            self._counters_lock.release()
+
+    def _query_period_usage(
+        self,
+        api_key_id: Optional[str],
+        day_start_ms: int,
+        month_start_ms: int,
+        now_ms: int,
+    ) -> Tuple[int, int, int, int]:
+        """Aggregate the current month in one pass (see _PERIOD_USAGE_SQL)"""
+        source = self._usage_source(_METRIC_COLUMNS, month_start_ms, now_ms)
+        if api_key_id:
+            sql = _PERIOD_USAGE_SQL.format(
+                source=source, key_filter="api_key_id = ? AND "
+            )
+            params: Tuple[Any, ...] = (
+                day_start_ms,
+                day_start_ms,
+                api_key_id,
+                month_start_ms,
+                now_ms,
+            )
+        else:
+            sql = _PERIOD_USAGE_SQL.format(source=source, key_filter="")
+            params = (day_start_ms, day_start_ms, month_start_ms, now_ms)
 
-        return result
+        with self._connect() as conn:
+            row = conn.execute(sql, params).fetchone()
+        return tuple(value or 0 for value in row)
 
     def get_usage_stats(
         self,
@@ -338,7 +1054,8 @@ class UsageTracker:
         end_time: Optional[datetime] = None,
     ) -> UsageStats:
         """Get usage statistics for a time period"""
-        with sqlite3.connect(self.db_path) as conn:
+        self._flush_for_read()
+        with self._counters_lock, self._connect() as conn:
             # Build query
             where_clauses = []
             params = []
@@ -348,25 +1065,31 @@ class UsageTracker:
                 params.append(api_key_id)
 
             if start_time:
-                where_clauses.append("timestamp >= ?")
-                params.append(start_time.isoformat())
+                where_clauses.append("ts_ms >= ?")
+                params.append(_to_ms(start_time))
 
             if end_time:
-                where_clauses.append("timestamp <= ?")
-                params.append(end_time.isoformat())
+                where_clauses.append("ts_ms <= ?")
+                params.append(_to_ms(end_time))
 
             where_sql = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+            start_ms = _to_ms(start_time) if start_time else None
+            end_ms = _to_ms(end_time) if end_time else None
+            metric_source = self._usage_source(_METRIC_COLUMNS, start_ms, end_ms)
+            endpoint_source = self._usage_source(
+                "api_key_id, ts_ms, endpoint", start_ms, end_ms
+            )
 
             # Get aggregate stats
             row = conn.execute(
                 f"""
                 SELECT
                     COUNT(*) as total_requests,
-                    SUM(total_tokens) as total_tokens,
-                    SUM(total_bytes) as total_bytes,
+                    SUM(request_tokens) + SUM(response_tokens) as total_tokens,
+                    SUM(request_bytes) + SUM(response_bytes) as total_bytes,
                     AVG(duration_ms) as avg_duration,
                     SUM(CASE WHEN status_code >= 200 AND status_code < 300 THEN 1 ELSE 0 END) * 100.0 / COUNT(*) as success_rate
-                FROM usage_records
+                FROM {metric_source}
                 {where_sql}
                 """,
                 params,
@@ -382,7 +1105,7 @@ class UsageTracker:
             top_endpoints = conn.execute(
                 f"""
                 SELECT endpoint, COUNT(*) as count
-                FROM usage_records
+                FROM {endpoint_source}
                 {where_sql}
                 GROUP BY endpoint
                 ORDER BY count DESC
@@ -401,22 +1124,46 @@ class UsageTracker:
         )
 
     def _check_quotas(self, api_key_id: str) -> None:
-        """Check quotas and trigger alerts if threshold exceeded"""
+        """Check quotas and trigger alerts if threshold exceeded
+
+        Each alert fires once per period: when usage first crosses the
+        threshold, not again on every later write that day or month.
+        """
         quota = self.get_quota(api_key_id)
-        status = self.check_quota_exceeded(api_key_id)
+        status = self.get_quota_status(api_key_id, quota)
+        self._update_headroom(api_key_id, status)
+
+        day_start_ms, month_start_ms = _period_starts(utc_now())
+        period_starts = {"daily": day_start_ms, "monthly": month_start_ms}
+        alerted = self._alerted.setdefault(api_key_id, {})
 
         # Check alert thresholds
-        for period in ["daily", "monthly"]:
-            for metric in ["requests", "tokens"]:
-                usage_pct = status[period][metric]["pct"]
-                if usage_pct >= quota.alert_threshold_pct:
-                    self._trigger_alert(
-                        api_key_id,
-                        f"{period}_{metric}",
-                        usage_pct,
-                        status[period][metric]["current"],
-                        status[period][metric]["limit"],
-                    )
+        for period, metric, current, limit in status.entries():
+            usage_pct = _usage_pct(current, limit)
+            alert_type = f"{period}_{metric}"
+            if (
+                usage_pct >= quota.alert_threshold_pct
+                and alerted.get(alert_type) != period_starts[period]
+            ):
+                alerted[alert_type] = period_starts[period]
+                self._trigger_alert(api_key_id, alert_type, usage_pct, current, limit)
+
+    def _update_headroom(self, api_key_id: str, status: QuotaStatus) -> None:
+        """Remember whether a key is below HEADROOM_PCT of every limit"""
+        if status.peak_pct() < self.HEADROOM_PCT:
+            self._headroom.add(api_key_id)
+        else:
+            self._headroom.discard(api_key_id)
+
+    def has_quota_headroom(self, api_key_id: str) -> bool:
+        """
+        True when both the key and the global budget were well under quota
+        after the last write batch, so the pre-request checks can be skipped.
+
+        Unknown keys report False and take the full check once.
+        """
+        headroom = self._headroom
+        return api_key_id in headroom and self.GLOBAL_QUOTA_KEY in headroom
 
     def _trigger_alert(
         self,
@@ -426,35 +1173,25 @@ class UsageTracker:
         current_usage: int,
         quota_limit: int,
     ) -> None:
-        """Trigger usage alert"""
-        # Check if alert already triggered recently (within last hour)
-        with sqlite3.connect(self.db_path) as conn:
-            one_hour_ago = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
-
-            existing = conn.execute(
-                """
-                SELECT id FROM usage_alerts
-                WHERE api_key_id = ? AND alert_type = ?
-                AND triggered_at > ?
-                """,
-                (api_key_id, alert_type, one_hour_ago),
-            ).fetchone()
-
-            if existing:
-                return  # Alert already triggered recently
-
-            # Record new alert
-            conn.execute(
-                """
-                INSERT INTO usage_alerts (
-                    api_key_id, alert_type, threshold_pct,
-                    current_usage, quota_limit
-                ) VALUES (?, ?, ?, ?, ?)
-                """,
-                (api_key_id, alert_type, threshold_pct, current_usage, quota_limit),
-            )
+        """Trigger usage alert (at most once per key and type each UTC hour)"""
+        hour_bucket = _to_ms(utc_now()) // 3_600_000
+        with self._connect() as conn:
+            inserted = conn.execute(
+                _INSERT_ALERT_SQL,
+                (
+                    api_key_id,
+                    alert_type,
+                    threshold_pct,
+                    current_usage,
+                    quota_limit,
+                    hour_bucket,
+                ),
+            ).rowcount
             conn.commit()
 
+        if not inserted:
+            return  # Alert already triggered this hour
+
         logger.warning(
             f"[UsageAlert] {api_key_id}: {alert_type} at {threshold_pct:.1f}% "
             f"({current_usage}/{quota_limit})"
@@ -464,15 +1201,16 @@ class UsageTracker:
         self, api_key_id: Optional[str] = None, hours: int = 24
     ) -> List[Dict[str, Any]]:
         """Get recent usage alerts"""
-        with sqlite3.connect(self.db_path) as conn:
-            cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+        self._flush_for_read()
+        with self._connect() as conn:
+            cutoff = (utc_now() - timedelta(hours=hours)).isoformat()
 
             if api_key_id:
                 rows = conn.execute(
                     """
                     SELECT api_key_id, alert_type, threshold_pct,
                            current_usage, quota_limit, triggered_at
-                    FROM usage_alerts
+                    FROM alerts.usage_alerts
                     WHERE api_key_id = ? AND triggered_at > ?
                     ORDER BY triggered_at DESC
                     """,
@@ -483,7 +1221,7 @@ class UsageTracker:
                     """
                     SELECT api_key_id, alert_type, threshold_pct,
                            current_usage, quota_limit, triggered_at
-                    FROM usage_alerts
+                    FROM alerts.usage_alerts
                     WHERE triggered_at > ?
                     ORDER BY triggered_at DESC
                     """,
@@ -508,11 +1246,11 @@ class UsageTracker:
         days: int = 30,
     ) -> List[Dict[str, Any]]:
         """Get daily usage breakdown for trend visualization."""
-        with sqlite3.connect(self.db_path) as conn:
-            where_clauses = ["timestamp >= ?"]
-            params: List[Any] = [
-                (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
-            ]
+        self._flush_for_read()
+        with self._counters_lock, self._connect() as conn:
+            since_ms = _to_ms(datetime.now(timezone.utc) - timedelta(days=days))
+            where_clauses = ["ts_ms >= ?"]
+            params: List[Any] = [since_ms]
 
             if api_key_id:
                 where_clauses.append("api_key_id = ?")
@@ -523,19 +1261,21 @@ class UsageTracker:
             rows = conn.execute(
                 f"""
                 SELECT
-                    date(timestamp) as day,
+                    date(ts_ms / 1000, 'unixepoch') as day,
                     COUNT(*) as requests,
-                    COALESCE(SUM(total_tokens), 0) as tokens,
-                    COALESCE(SUM(total_bytes), 0) as bytes,
+                    COALESCE(SUM(request_tokens) + SUM(response_tokens), 0)
+                        as tokens,
+                    COALESCE(SUM(request_bytes) + SUM(response_bytes), 0)
+                        as bytes,
                     COALESCE(AVG(duration_ms), 0.0) as avg_duration_ms,
                     COALESCE(
                         SUM(CASE WHEN status_code >= 200 AND status_code < 300
                             THEN 1 ELSE 0 END) * 100.0 / COUNT(*),
                         100.0
                     ) as success_rate
-                FROM usage_records
+                FROM {self._usage_source(_METRIC_COLUMNS, since_ms)}
                 {where_sql}
-                GROUP BY date(timestamp)
+                GROUP BY day
                 ORDER BY day ASC
                 """,
                 params,
@@ -553,76 +1293,54 @@ class UsageTracker:
             for row in rows
         ]
 
-    def check_global_quota_exceeded(self) -> Dict[str, Any]:
-        """Check system-wide global quota against total usage across all keys."""
+    def get_global_quota_status(self) -> QuotaStatus:
+        """Total usage across all keys against the global quota"""
         quota = self.get_quota(self.GLOBAL_QUOTA_KEY)
-        now = datetime.now(timezone.utc)
+        return QuotaStatus(quota, self._period_usage(None))
 
-        daily_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        daily_stats = self.get_usage_stats(start_time=daily_start, end_time=now)
-
-        monthly_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        monthly_stats = self.get_usage_stats(start_time=monthly_start, end_time=now)
-
-        def _pct(current: int, limit: int) -> float:
-            return (current / limit * 100) if limit > 0 else 0.0
-
-        result: Dict[str, Any] = {
-            "exceeded": False,
-            "daily": {
-                "requests": {
-                    "current": daily_stats.total_requests,
-                    "limit": quota.daily_requests,
-                    "exceeded": daily_stats.total_requests >= quota.daily_requests,
-                    "pct": _pct(daily_stats.total_requests, quota.daily_requests),
-                },
-                "tokens": {
-                    "current": daily_stats.total_tokens,
-                    "limit": quota.daily_tokens,
-                    "exceeded": daily_stats.total_tokens >= quota.daily_tokens,
-                    "pct": _pct(daily_stats.total_tokens, quota.daily_tokens),
-                },
-            },
-            "monthly": {
-                "requests": {
-                    "current": monthly_stats.total_requests,
-                    "limit": quota.monthly_requests,
-                    "exceeded": monthly_stats.total_requests >= quota.monthly_requests,
-                    "pct": _pct(monthly_stats.total_requests, quota.monthly_requests),
-                },
-                "tokens": {
-                    "current": monthly_stats.total_tokens,
-                    "limit": quota.monthly_tokens,
-                    "exceeded": monthly_stats.total_tokens >= quota.monthly_tokens,
-                    "pct": _pct(monthly_stats.total_tokens, quota.monthly_tokens),
-                },
-            },
-        }
-
-        result["exceeded"] = any(
-            [
-                result["daily"]["requests"]["exceeded"],
-                result["daily"]["tokens"]["exceeded"],
-                result["monthly"]["requests"]["exceeded"],
-                result["monthly"]["tokens"]["exceeded"],
-            ]
-        )
-
-        return result
+    def check_global_quota_exceeded(self) -> Dict[str, Any]:
+        """Check system-wide global quota against total usage across all keys."""
+        return self.get_global_quota_status().to_dict()
 
     def cleanup_old_records(self, days: int = 90) -> int:
-        """Clean up usage records older than specified days"""
-        with sqlite3.connect(self.db_path) as conn:
-            cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+        """Clean up usage records older than specified days
 
-            cursor = conn.execute(
-                "DELETE FROM usage_records WHERE timestamp < ?", (cutoff,)
-            )
-            deleted = cursor.rowcount
-
-            conn.execute("DELETE FROM usage_alerts WHERE triggered_at < ?", (cutoff,))
+        Months entirely before the cutoff are dropped as whole partitions;
+        only the month straddling the cutoff is deleted row by row.
+        """
+        self._flush_for_read()
+        now = datetime.now(timezone.utc)
+        cutoff_time = now - timedelta(days=days)
+        cutoff_ms = _to_ms(cutoff_time)
+        deleted = 0
+
+        with self._counters_lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                self._load_partitions(conn)
+                for table, (start_ms, end_ms) in sorted(self._partitions.items()):
+                    if end_ms <= cutoff_ms:
+                        deleted += conn.execute(
+                            f"SELECT COUNT(*) FROM {table}"
+                        ).fetchone()[0]
+                        conn.execute(f"DROP TABLE {table}")
+                    elif start_ms < cutoff_ms:
+                        deleted += conn.execute(
+                            f"DELETE FROM {table} WHERE ts_ms < ?", (cutoff_ms,)
+                        ).rowcount
+                self._refresh_view(conn)
+                # The view needs at least one partition
+                self._ensure_partition(conn, _to_ms(now))
+
+                conn.execute(
+                    "DELETE FROM alerts.usage_alerts WHERE triggered_at < ?",
+                    (cutoff_time.isoformat(),),
+                )
 
-            conn.commit()
+            if deleted:
+                with self._tally_lock:
+                    self._counters.clear()
 
         logger.info(f"[UsageTracker] Cleaned up {deleted} old records (>{days} days)")
         return deleted
@@ -640,7 +1358,14 @@ def get_usage_tracker() -> UsageTracker:
     return _usage_tracker
 
 
+def close_usage_tracker() -> None:
+    """Flush and stop the singleton's writer, if one was created"""
+    if _usage_tracker is not None:
+        _usage_tracker.close()
+
+
 def reset_usage_tracker() -> None:
     """Reset singleton (for testing)"""
     global _usage_tracker
+    close_usage_tracker()
     _usage_tracker = None
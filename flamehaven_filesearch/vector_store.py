@@ -7,15 +7,38 @@ from __future__ import annotations
 import json
 import logging
 import re
+import threading
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
-from .config import Config
+from .config import Config, get_default_config
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _json_dumps(value: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode()
+        except TypeError:
+            pass  # e.g. non-str keys, which json.dumps coerces
+    return json.dumps(value)
+
+
+def _json_loads(text: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
 
 class CircuitState(str, Enum):
     """Circuit breaker states."""
@@ -132,6 +155,21 @@ def retry_with_backoff(
     return decorator
 
 
+# HNSW sizing by table size, largest first: (min rows, m, ef_construction,
+# ef_search). Used when an index is (re)built.
+_HNSW_TIERS = (
+    (1_000_000, 32, 128, 100),
+    (100_000, 24, 100, 64),
+    (0, 16, 64, 40),
+)
+
+_ITERATIVE_SCAN_MODES = ("off", "strict_order", "relaxed_order")
+
+# Unquoted identifier, within Postgres' 63-byte NAMEDATALEN limit (longer
+# names are silently truncated)
+_PG_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]{0,62}")
+
+
 class VectorStore(ABC):
     @abstractmethod
     def ensure_store(self, name: str) -> None: ...
@@ -145,6 +183,16 @@ class VectorStore(ABC):
         essence: Dict[str, Any],
     ) -> None: ...
 
+    def add_vectors(
+        self,
+        store_name: str,
+        items: Iterable[Tuple[str, Any, Dict[str, Any]]],
+        batch_size: int = 500,
+    ) -> None:
+        """Add many (glyph, vector, essence) items; backends may batch them."""
+        for glyph, vector, essence in items:
+            self.add_vector(store_name, glyph, vector, essence)
+
     @abstractmethod
     def query(
         self, store_name: str, vector: Any, top_k: int = 5
@@ -167,6 +215,12 @@ class PostgresVectorStore(VectorStore):
         hnsw_m: int,
         hnsw_ef_construction: int,
         hnsw_ef_search: int,
+        pool_max_size: int = 10,
+        precision: str = "float32",
+        iterative_scan: str = "strict_order",
+        distance: str = "cosine",
+        maintenance_workers: int = 7,
+        maintenance_work_mem: str = "",
     ):
         try:
             import psycopg
@@ -174,12 +228,52 @@ class PostgresVectorStore(VectorStore):
             raise RuntimeError("psycopg is required for PostgreSQL vector store") from e
 
         try:
+            from psycopg_pool import ConnectionPool
+        except Exception as e:
+            raise RuntimeError(
+                "psycopg_pool is required for PostgreSQL vector store"
+            ) from e
+
+        try:
+            import numpy as np
             from pgvector.psycopg import register_vector
         except Exception as e:
             raise RuntimeError(
                 "pgvector is required for PostgreSQL vector store"
             ) from e
 
+        if precision not in {"float32", "float16"}:
+            raise ValueError("precision must be 'float32' or 'float16'")
+        # float16 stores halfvec columns: half the bytes per dimension in the
+        # table, the HNSW graph and on the wire (pgvector >= 0.7 server side)
+        self._half_vector = None
+        if precision == "float16":
+            try:
+                from pgvector import HalfVector
+            except Exception as e:
+                raise RuntimeError(
+                    "pgvector>=0.3 is required for float16 vector precision"
+                ) from e
+            self._half_vector = HalfVector
+        self._vector_type = "halfvec" if precision == "float16" else "vector"
+
+        if distance not in {"cosine", "inner_product"}:
+            raise ValueError("distance must be 'cosine' or 'inner_product'")
+        # inner_product normalizes vectors here, so the server ranks by the
+        # cheaper <#> operator; on unit vectors it equals cosine similarity.
+        # <#> yields the negated product, hence the score base of 0.
+        self._normalize = distance == "inner_product"
+        ops, operator = ("ip", "<#>") if self._normalize else ("cosine", "<=>")
+        self._hnsw_opclass = f"{self._vector_type}_{ops}_ops"
+        self._score_base = 0.0 if self._normalize else 1.0
+
+        if iterative_scan not in _ITERATIVE_SCAN_MODES:
+            raise ValueError(
+                "iterative_scan must be 'off', 'strict_order' or 'relaxed_order'"
+            )
+        self._iterative_scan = iterative_scan
+
+        self._np = np
         self._psycopg = psycopg
         self._register_vector = register_vector
         self._dsn = dsn
@@ -189,6 +283,51 @@ class PostgresVectorStore(VectorStore):
         self._hnsw_m = int(hnsw_m)
         self._hnsw_ef_construction = int(hnsw_ef_construction)
         self._hnsw_ef_search = int(hnsw_ef_search)
+        self._maintenance_workers = max(0, int(maintenance_workers))
+        self._maintenance_work_mem = maintenance_work_mem.strip()
+
+        # Hot-path statements, built once; only their parameters vary, so
+        # psycopg can keep them prepared on each pooled connection.
+        # Embeddings are bound with %b: pgvector's binary vector format.
+        table = f"{self._schema}.{self._table}"
+        self._sql_upsert = f"""
+            INSERT INTO {table} (store_name, glyph, essence, embedding)
+            VALUES (%s, %s, %s, %b)
+            ON CONFLICT (store_name, glyph)
+            DO UPDATE SET essence = EXCLUDED.essence, embedding = EXCLUDED.embedding
+        """
+        # Ordering by the output column still uses the HNSW index, and the
+        # query vector is sent once instead of twice. essence comes back as
+        # text and is parsed here (orjson when installed) rather than by
+        # psycopg's json.loads-based JSONB loader.
+        self._sql_query = f"""
+            SELECT essence::text, embedding {operator} %b AS distance
+            FROM {table}
+            WHERE store_name = %s
+            ORDER BY distance
+            LIMIT %s
+        """
+        if iterative_scan == "relaxed_order":
+            # Relaxed scans may return neighbours slightly out of order
+            self._sql_query = f"""
+                WITH hits AS MATERIALIZED ({self._sql_query})
+                SELECT * FROM hits ORDER BY distance
+            """
+        self._sql_delete = f"DELETE FROM {table} WHERE store_name = %s"
+        self._sql_count = f"SELECT COUNT(*) FROM {table}"
+        # Planner row estimate: O(1), refreshed by autovacuum/ANALYZE.
+        # reltuples is -1 until the table is first analyzed.
+        self._sql_estimate = (
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)"
+        )
+        self._sql_store_counts = f"""
+            SELECT store_name, COUNT(*) AS count
+            FROM {table}
+            GROUP BY store_name
+            ORDER BY count DESC
+        """
+        # (expires_at, counts) memo for get_store_stats()
+        self._store_counts_memo: Optional[Tuple[float, Dict[str, int]]] = None
 
         # Circuit breaker for connection health
         self._circuit_breaker = CircuitBreaker(
@@ -197,26 +336,86 @@ class PostgresVectorStore(VectorStore):
             success_threshold=2,
         )
 
-        self._ensure_schema()
+        # Connections are opened once and reused; pgvector types are
+        # registered as each pooled connection is created.
+        self._pool = ConnectionPool(
+            dsn,
+            min_size=1,
+            max_size=max(1, int(pool_max_size)),
+            configure=self._configure_connection,
+            open=True,
+        )
+
+        try:
+            self._ensure_schema()
+        except Exception:
+            self._pool.close()
+            raise
 
     @staticmethod
     def _validate_identifier(identifier: str) -> str:
         if not identifier:
             return ""
-        if not re.match(r"^[A-Za-z_][A-Za-z0-9_]*$", identifier):
+        if not _PG_IDENTIFIER_RE.fullmatch(identifier):
             raise ValueError("Invalid PostgreSQL identifier")
         return identifier
 
+    def _configure_connection(self, conn) -> None:
+        """Pool hook: prepare a newly opened connection for vector I/O."""
+        self._register_vector(conn)
+        # Session-wide, so searches need no per-query SET. set_config()
+        # takes a bind parameter where SET does not; a dotted name is
+        # accepted even before pgvector is loaded. Iterative scans
+        # (pgvector >= 0.8) keep walking the graph until the store_name
+        # filter has yielded LIMIT rows, instead of filtering ef_search
+        # candidates after the fact; older servers ignore the setting.
+        conn.execute(
+            "SELECT set_config('hnsw.ef_search', %s, false),"
+            " set_config('hnsw.iterative_scan', %s, false)",
+            (str(self._hnsw_ef_search), self._iterative_scan),
+        )
+        # The pool only accepts connections handed back idle
+        conn.commit()
+
     @retry_with_backoff(max_retries=3, initial_delay=0.1, max_delay=2.0)
+    def _checkout(self):
+        """Borrow a pooled connection with retry and circuit breaker protection."""
+        return self._circuit_breaker.call(self._pool.getconn)
+
+    @contextmanager
     def _connect(self):
-        """Connect to PostgreSQL with retry and circuit breaker protection."""
+        """Pooled connection; commits on success and rolls back on error."""
+        conn = self._checkout()
+        try:
+            # A pooled connection's __exit__ ends the transaction but
+            # leaves the connection open for reuse
+            with conn:
+                yield conn
+        finally:
+            self._pool.putconn(conn)
+
+    def set_ef_search(self, value: int) -> None:
+        """
+        Change hnsw.ef_search for subsequent queries.
+
+        Pooled connections carry the value in their session, so they are
+        drained and reopened with the new one; in-flight queries finish
+        on their current connection.
+        """
+        value = int(value)
+        if value == self._hnsw_ef_search:
+            return
+        self._hnsw_ef_search = value
+        self._pool.drain()
+        logger.info("[PgVector] hnsw.ef_search set to %d", value)
 
-        def _do_connect():
-            conn = self._psycopg.connect(self._dsn)
-            self._register_vector(conn)
-            return conn
+    def close(self) -> None:
+        """Close the connection pool."""
+        self._pool.close()
 
-        return self._circuit_breaker.call(_do_connect)
+    @property
+    def closed(self) -> bool:
+        return self._pool.closed
 
     def health_check(self) -> Dict[str, Any]:
         """
@@ -251,6 +450,27 @@ class PostgresVectorStore(VectorStore):
         return health_info
 
     def _ensure_schema(self) -> None:
+        """Run migrate() unless the table and its indexes already exist."""
+        table = f"{self._schema}.{self._table}"
+        # One catalog lookup instead of DDL: CREATE ... IF NOT EXISTS still
+        # takes locks, which serializes workers starting together
+        with self._connect() as conn:
+            hnsw_index = conn.execute(
+                """
+                SELECT reloptions FROM pg_class
+                WHERE oid = to_regclass(%s)
+                  AND to_regclass(%s) IS NOT NULL
+                  AND to_regclass(%s) IS NOT NULL
+                """,
+                (f"{table}_hnsw_idx", table, f"{table}_store_idx"),
+            ).fetchone()
+        if hnsw_index is None:
+            self.migrate()
+        else:
+            self._adopt_hnsw_params(hnsw_index[0] or [])
+
+    def migrate(self) -> None:
+        """Create the extension, table and indexes (idempotent)."""
         with self._connect() as conn:
             conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
             conn.execute(f"CREATE SCHEMA IF NOT EXISTS {self._schema}")
@@ -261,7 +481,7 @@ class PostgresVectorStore(VectorStore):
                     store_name TEXT NOT NULL,
                     glyph TEXT NOT NULL,
                     essence JSONB,
-                    embedding vector({self._vector_dim}),
+                    embedding {self._vector_type}({self._vector_dim}),
                     created_at TIMESTAMP DEFAULT NOW(),
                     UNIQUE (store_name, glyph)
                 )
@@ -273,14 +493,81 @@ class PostgresVectorStore(VectorStore):
                 ON {self._schema}.{self._table}(store_name)
                 """
             )
+            hnsw_index = conn.execute(
+                "SELECT reloptions FROM pg_class WHERE oid = to_regclass(%s)",
+                (f"{self._schema}.{self._table}_hnsw_idx",),
+            ).fetchone()
+            if hnsw_index is None:
+                self._tune_hnsw_params(conn)
+            else:
+                self._adopt_hnsw_params(hnsw_index[0] or [])
+            self._create_hnsw_index(conn, if_not_exists=True)
+
+    def _create_hnsw_index(self, conn, if_not_exists: bool = False) -> None:
+        """Build the HNSW index inside the caller's transaction."""
+        # pgvector builds HNSW graphs in parallel; raise the worker cap (and
+        # optionally the build memory) for this transaction only
+        conn.execute(
+            "SELECT set_config('max_parallel_maintenance_workers', %s, true)",
+            (str(self._maintenance_workers),),
+        )
+        if self._maintenance_work_mem:
             conn.execute(
-                f"""
-                CREATE INDEX IF NOT EXISTS {self._table}_hnsw_idx
-                ON {self._schema}.{self._table}
-                USING hnsw (embedding vector_cosine_ops)
-                WITH (m = {self._hnsw_m}, ef_construction = {self._hnsw_ef_construction})
-                """
+                "SELECT set_config('maintenance_work_mem', %s, true)",
+                (self._maintenance_work_mem,),
             )
+        if_not_exists_sql = "IF NOT EXISTS " if if_not_exists else ""
+        conn.execute(
+            f"""
+            CREATE INDEX {if_not_exists_sql}{self._table}_hnsw_idx
+            ON {self._schema}.{self._table}
+            USING hnsw (embedding {self._hnsw_opclass})
+            WITH (m = {self._hnsw_m}, ef_construction = {self._hnsw_ef_construction})
+            """
+        )
+
+    @staticmethod
+    def _recommend_hnsw_params(count: int) -> Tuple[int, int, int]:
+        """(m, ef_construction, ef_search) suited to an index over `count` rows."""
+        for min_rows, m, ef_construction, ef_search in _HNSW_TIERS:
+            if count >= min_rows:
+                break
+        return m, ef_construction, ef_search
+
+    def _adopt_hnsw_params(self, reloptions: List[str]) -> None:
+        """Pick up the parameters an existing HNSW index was built with."""
+        options = dict(option.split("=", 1) for option in reloptions)
+        self._hnsw_m = int(options.get("m", self._hnsw_m))
+        self._hnsw_ef_construction = int(
+            options.get("ef_construction", self._hnsw_ef_construction)
+        )
+        # Search the graph as widely as its tier was meant to be searched
+        for _, m, _, ef_search in _HNSW_TIERS:
+            if self._hnsw_m >= m:
+                self.set_ef_search(max(self._hnsw_ef_search, ef_search))
+                break
+
+    def _tune_hnsw_params(self, conn) -> None:
+        """
+        Size the HNSW parameters for the rows about to be indexed.
+
+        Runs before an index build. Configured values act as a floor, so
+        explicit tuning is only ever raised; query() uses the paired
+        ef_search from then on.
+        """
+        count = int(conn.execute(self._sql_count).fetchone()[0])
+        m, ef_construction, ef_search = self._recommend_hnsw_params(count)
+        self._hnsw_m = max(self._hnsw_m, m)
+        self._hnsw_ef_construction = max(self._hnsw_ef_construction, ef_construction)
+        self.set_ef_search(max(self._hnsw_ef_search, ef_search))
+        logger.info(
+            "[PgVector] HNSW params for %d vectors: m=%d ef_construction=%d "
+            "ef_search=%d",
+            count,
+            self._hnsw_m,
+            self._hnsw_ef_construction,
+            self._hnsw_ef_search,
+        )
 
     def ensure_store(self, name: str) -> None:
         if not name:
@@ -288,15 +575,25 @@ class PostgresVectorStore(VectorStore):
         # Store rows are created on demand by insert; no explicit store table.
         return None
 
-    def _prepare_vector(self, vector: Any) -> List[float]:
-        if hasattr(vector, "tolist"):
-            vector = vector.tolist()
-        vector_list = [float(v) for v in vector]
-        if len(vector_list) != self._vector_dim:
+    def _prepare_vector(self, vector: Any) -> Any:
+        """Return the vector as a float32 ndarray, or a HalfVector for halfvec."""
+        # C-contiguous float32 is what pgvector's dumper copies into its
+        # buffer, so rows sliced out of an embedding matrix are copied once
+        array = self._np.ascontiguousarray(vector, dtype=self._np.float32)
+        if array.ndim != 1:
+            raise ValueError(f"Expected a 1-D vector, got shape {array.shape}")
+        if array.shape[0] != self._vector_dim:
             raise ValueError(
-                f"Vector dimension mismatch: expected {self._vector_dim}, got {len(vector_list)}"
+                f"Vector dimension mismatch: expected {self._vector_dim}, "
+                f"got {array.shape[0]}"
             )
-        return vector_list
+        if self._normalize:
+            norm = self._np.linalg.norm(array)
+            if norm > 0:
+                array = array / norm  # new array; the caller's is untouched
+        if self._half_vector is not None:
+            return self._half_vector(array)
+        return array
 
     def add_vector(
         self,
@@ -305,62 +602,66 @@ class PostgresVectorStore(VectorStore):
         vector: Any,
         essence: Dict[str, Any],
     ) -> None:
-        if not store_name or not glyph:
+        self.add_vectors(store_name, [(glyph, vector, essence)])
+
+    def add_vectors(
+        self,
+        store_name: str,
+        items: Iterable[Tuple[str, Any, Dict[str, Any]]],
+        batch_size: int = 500,
+    ) -> None:
+        """
+        Upsert many (glyph, vector, essence) items.
+
+        Every vector is validated before anything is written. Each batch
+        then goes out as one executemany() on one pooled connection and
+        commits once; psycopg pipelines the rows instead of waiting on a
+        round trip per row.
+        """
+        if not store_name:
             return
-        vector_list = self._prepare_vector(vector)
-        payload = json.dumps(essence) if essence is not None else None
-        with self._connect() as conn:
-            conn.execute(
-                f"""
-                INSERT INTO {self._schema}.{self._table}
-                (store_name, glyph, essence, embedding)
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (store_name, glyph)
-                DO UPDATE SET essence = EXCLUDED.essence, embedding = EXCLUDED.embedding
-                """,
-                (store_name, glyph, payload, vector_list),
+        rows = [
+            (
+                store_name,
+                glyph,
+                _json_dumps(essence) if essence is not None else None,
+                self._prepare_vector(vector),
             )
+            for glyph, vector, essence in items
+            if glyph
+        ]
+        batch_size = max(1, int(batch_size))
+        for start in range(0, len(rows), batch_size):
+            with self._connect() as conn, conn.cursor() as cur:
+                cur.executemany(self._sql_upsert, rows[start : start + batch_size])
+        self._store_counts_memo = None
 
     def query(
         self, store_name: str, vector: Any, top_k: int = 5
     ) -> List[Tuple[Dict[str, Any], float]]:
         if not store_name:
             return []
-        vector_list = self._prepare_vector(vector)
+        query_vec = self._prepare_vector(vector)
         top_k = max(1, int(top_k))
+        # hnsw.ef_search is already set on the pooled session
         with self._connect() as conn:
-            try:
-                conn.execute(
-                    "SET LOCAL hnsw.ef_search = %s",
-                    (self._hnsw_ef_search,),
-                )
-            except Exception as exc:
-                logger.debug(
-                    "[PgVector] hnsw.ef_search SET failed (non-fatal): %s", exc
-                )
             rows = conn.execute(
-                f"""
-                SELECT essence, 1 - (embedding <=> %s) AS score
-                FROM {self._schema}.{self._table}
-                WHERE store_name = %s
-                ORDER BY embedding <=> %s
-                LIMIT %s
-                """,
-                (vector_list, store_name, vector_list, top_k),
+                self._sql_query,
+                (query_vec, store_name, top_k),
+                prepare=True,
             ).fetchall()
         results: List[Tuple[Dict[str, Any], float]] = []
-        for row in rows:
-            essence = row[0] or {}
-            score = float(row[1]) if row[1] is not None else 0.0
-            if isinstance(essence, str):
+        for text, distance in rows:
+            score = self._score_base - float(distance) if distance is not None else 0.0
+            essence: Dict[str, Any] = {}
+            if text:
                 try:
-                    essence = json.loads(essence)
-                except Exception as exc:
+                    essence = _json_loads(text)
+                except ValueError as exc:
                     logger.debug(
                         "[PgVector] essence JSON parse failed, using empty dict: %s",
                         exc,
                     )
-                    essence = {}
             results.append((essence, score))
         return results
 
@@ -368,13 +669,16 @@ class PostgresVectorStore(VectorStore):
         if not name:
             return
         with self._connect() as conn:
-            conn.execute(
-                f"DELETE FROM {self._schema}.{self._table} WHERE store_name = %s",
-                (name,),
-            )
+            conn.execute(self._sql_delete, (name,), prepare=True)
+        self._store_counts_memo = None
+
+    def get_stats(self, exact: bool = False) -> Dict[str, Any]:
+        """
+        Get vector store statistics including health status.
 
-    def get_stats(self) -> Dict[str, Any]:
-        """Get vector store statistics including health status."""
+        total_vectors is the planner's row estimate unless `exact` is set
+        (or the table has never been analyzed); COUNT(*) scans the table.
+        """
         stats = {
             "backend": "postgres",
             "table": f"{self._schema}.{self._table}",
@@ -385,10 +689,19 @@ class PostgresVectorStore(VectorStore):
 
         try:
             with self._connect() as conn:
-                total = conn.execute(
-                    f"SELECT COUNT(*) FROM {self._schema}.{self._table}"
-                ).fetchone()[0]
+                total = -1
+                if not exact:
+                    row = conn.execute(
+                        self._sql_estimate,
+                        (f"{self._schema}.{self._table}",),
+                        prepare=True,
+                    ).fetchone()
+                    total = row[0] if row and row[0] is not None else -1
+                if total < 0:
+                    total = conn.execute(self._sql_count, prepare=True).fetchone()[0]
+                    exact = True
             stats["total_vectors"] = int(total)
+            stats["total_vectors_exact"] = exact
         except Exception as exc:
             logger.warning(f"[Stats] Failed to get vector count: {exc}")
             stats["total_vectors"] = -1
@@ -396,6 +709,23 @@ class PostgresVectorStore(VectorStore):
 
         return stats
 
+    def get_store_stats(self, ttl_sec: float = 30.0) -> Dict[str, int]:
+        """
+        Vector count per store, largest first, from one GROUP BY query.
+
+        Results are memoized for `ttl_sec`; writes through this store
+        invalidate them.
+        """
+        memo = self._store_counts_memo
+        now = time.monotonic()
+        if memo is not None and memo[0] > now:
+            return dict(memo[1])
+        with self._connect() as conn:
+            rows = conn.execute(self._sql_store_counts, prepare=True).fetchall()
+        counts = {name: int(count) for name, count in rows}
+        self._store_counts_memo = (now + ttl_sec, counts)
+        return dict(counts)
+
     def reindex_hnsw(self) -> Dict[str, Any]:
         """Rebuild HNSW index for optimal performance."""
         logger.info("[Maintenance] Starting HNSW reindex...")
@@ -407,15 +737,9 @@ class PostgresVectorStore(VectorStore):
                     f"DROP INDEX IF EXISTS {self._schema}.{self._table}_hnsw_idx"
                 )
 
-                # Recreate with current parameters
-                conn.execute(
-                    f"""
-                    CREATE INDEX {self._table}_hnsw_idx
-                    ON {self._schema}.{self._table}
-                    USING hnsw (embedding vector_cosine_ops)
-                    WITH (m = {self._hnsw_m}, ef_construction = {self._hnsw_ef_construction})
-                    """
-                )
+                # Recreate with parameters sized for the current row count
+                self._tune_hnsw_params(conn)
+                self._create_hnsw_index(conn)
 
             logger.info("[Maintenance] HNSW reindex completed")
             return {"status": "ok", "message": "HNSW index rebuilt"}
@@ -432,7 +756,11 @@ class PostgresVectorStore(VectorStore):
             with self._connect() as conn:
                 # VACUUM cannot run inside a transaction block
                 conn.autocommit = True
-                conn.execute(f"VACUUM ANALYZE {self._schema}.{self._table}")
+                try:
+                    conn.execute(f"VACUUM ANALYZE {self._schema}.{self._table}")
+                finally:
+                    # Hand the connection back to the pool in its usual mode
+                    conn.autocommit = False
 
             logger.info("[Maintenance] VACUUM ANALYZE completed")
             return {"status": "ok", "message": "VACUUM ANALYZE completed"}
@@ -476,17 +804,8 @@ class PostgresVectorStore(VectorStore):
     def export_stats(self) -> Dict[str, Any]:
         """Export circuit breaker and connection statistics for monitoring."""
         try:
+            store_counts = self.get_store_stats()
             with self._connect() as conn:
-                # Vector count by store
-                store_counts = conn.execute(
-                    f"""
-                    SELECT store_name, COUNT(*) as count
-                    FROM {self._schema}.{self._table}
-                    GROUP BY store_name
-                    ORDER BY count DESC
-                    """
-                ).fetchall()
-
                 # Recent activity
                 recent_count = conn.execute(
                     f"""
@@ -500,9 +819,10 @@ class PostgresVectorStore(VectorStore):
 
             return {
                 "health": health,
-                "total_vectors": sum(count for _, count in store_counts),
+                "total_vectors": sum(store_counts.values()),
                 "stores": [
-                    {"name": name, "vectors": count} for name, count in store_counts
+                    {"name": name, "vectors": count}
+                    for name, count in store_counts.items()
                 ],
                 "recent_24h": recent_count,
                 "index_stats": index_stats,
@@ -517,21 +837,66 @@ class PostgresVectorStore(VectorStore):
             return {"error": str(exc)}
 
 
+# Stores built by create_vector_store, keyed on the settings that shape
+# them, least recently used first. Evicted stores are closed.
+_STORE_CACHE_SIZE = 8
+_stores: OrderedDict[Tuple[Any, ...], PostgresVectorStore] = OrderedDict()
+_stores_lock = threading.Lock()
+
+
+def close_vector_stores() -> None:
+    """Close every store cached by create_vector_store and forget them."""
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        if not store.closed:
+            store.close()
+
+
 def create_vector_store(
     config: Optional[Config],
     vector_dim: int,
 ) -> Optional[VectorStore]:
-    config = config or Config.from_env()
+    """
+    Return the configured vector store, or None for non-postgres backends.
+
+    Stores are cached per connection settings, so repeated calls share one
+    connection pool; ``close_vector_stores()`` closes and drops them.
+    """
+    config = config or get_default_config()
     if config.vector_backend != "postgres":
         return None
     if not config.postgres_dsn:
         raise RuntimeError("POSTGRES_DSN is required for postgres vector backend")
-    return PostgresVectorStore(
+    settings = dict(
         dsn=config.postgres_dsn,
         schema=config.postgres_schema,
         table=config.vector_postgres_table,
-        vector_dim=vector_dim,
+        vector_dim=int(vector_dim),
         hnsw_m=config.vector_hnsw_m,
         hnsw_ef_construction=config.vector_hnsw_ef_construction,
         hnsw_ef_search=config.vector_hnsw_ef_search,
+        pool_max_size=config.postgres_pool_max_size,
+        precision=config.vector_precision,
+        iterative_scan=config.vector_hnsw_iterative_scan,
+        distance=config.vector_distance,
+        maintenance_workers=config.postgres_maintenance_workers,
+        maintenance_work_mem=config.postgres_maintenance_work_mem,
     )
+    key = tuple(settings.values())
+    evicted = []
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None or store.closed:
+            # Miss, or a caller closed the cached store; never hand out a
+            # dead pool
+            store = PostgresVectorStore(**settings)
+            _stores[key] = store
+        _stores.move_to_end(key)
+        while len(_stores) > _STORE_CACHE_SIZE:
+            evicted.append(_stores.popitem(last=False)[1])
+    for old in evicted:
+        if not old.closed:
+            old.close()
+    return store
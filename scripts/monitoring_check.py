@@ -6,10 +6,15 @@ Checks:
 1. Usage tracking database
 2. pgvector health (if PostgreSQL configured)
 3. API endpoints accessibility
+
+Pass --migrate on deploy to create the pgvector schema; the vector store
+itself skips DDL when its table and indexes already exist.
 """
 
+import argparse
 import os
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
 
 # Add parent directory to path
@@ -19,6 +24,11 @@ from flamehaven_filesearch.usage_tracker import UsageTracker
 from flamehaven_filesearch.config import Config
 
 
+def _read_only_uri(path):
+    """SQLite URI that opens `path` read-only and fails if it is missing"""
+    return Path(path).resolve().as_uri() + "?mode=ro"
+
+
 def check_usage_tracking():
     """Verify usage tracking database"""
     print("=" * 60)
@@ -36,42 +46,57 @@ def check_usage_tracking():
         print(f"[+] Database: {db_path.absolute()}")
         print(f"[+] Size: {db_path.stat().st_size:,} bytes")
 
-        # Verify tables
-        import sqlite3
-        conn = sqlite3.connect(tracker.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [row[0] for row in cursor.fetchall()]
-        expected_tables = ['usage_records', 'quota_configs', 'usage_alerts']
-
-        for table in expected_tables:
-            if table in tables:
-                print(f"[+] Table '{table}': OK")
-            else:
-                print(f"[!] Table '{table}': MISSING")
-                return False
-
-        # Verify indexes
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'idx_%'")
-        indexes = [row[0] for row in cursor.fetchall()]
+        # Quota configs and alerts live in sibling files
+        siblings = {"cfg": tracker.config_db_path, "alerts": tracker.alerts_db_path}
+        missing_files = [path for path in siblings.values() if not Path(path).exists()]
+        if missing_files:
+            print(f"[!] FAIL: Database not found: {', '.join(missing_files)}")
+            return False
 
+        # Verify tables and indexes; read-only, so the check never creates files
+        import sqlite3
+        conn = sqlite3.connect(_read_only_uri(tracker.db_path), uri=True)
+        try:
+            for schema, path in siblings.items():
+                conn.execute(f"ATTACH DATABASE ? AS {schema}", (_read_only_uri(path),))
+            # usage_records is a view over monthly usage_records_YYYYMM tables
+            found = {
+                row[0]
+                for row in conn.execute(
+                    " UNION ALL ".join(
+                        f"SELECT name FROM {schema}.sqlite_master "
+                        "WHERE type IN ('table', 'view') "
+                        "OR (type = 'index' AND name LIKE 'idx_%')"
+                        for schema in ("main", "cfg", "alerts")
+                    )
+                )
+            }
+        finally:
+            conn.close()
+
+        # The current month's partition carries the indexes quota checks use
+        partition = datetime.now(timezone.utc).strftime("usage_records_%Y%m")
+        expected_tables = [
+            'usage_records', partition, 'quota_configs', 'usage_alerts'
+        ]
         expected_indexes = [
-            'idx_usage_api_key',
-            'idx_usage_timestamp',
-            'idx_usage_api_key_timestamp',
+            f'idx_{partition}_ts_ms',
+            f'idx_{partition}_covering',
             'idx_alerts_api_key',
-            'idx_alerts_timestamp'
+            'idx_alerts_timestamp',
+            'idx_alerts_dedup'
         ]
+        missing_tables = set(expected_tables) - found
+        missing_indexes = set(expected_indexes) - found
+
+        tables_ok = len(expected_tables) - len(missing_tables)
+        indexes_ok = len(expected_indexes) - len(missing_indexes)
+        print(f"[+] Tables OK: {tables_ok}/{len(expected_tables)}")
+        print(f"[+] Indexes OK: {indexes_ok}/{len(expected_indexes)}")
+        if missing_tables or missing_indexes:
+            print(f"[!] MISSING: {', '.join(sorted(missing_tables | missing_indexes))}")
+            return False
 
-        for idx in expected_indexes:
-            if idx in indexes:
-                print(f"[+] Index '{idx}': OK")
-            else:
-                print(f"[!] Index '{idx}': MISSING")
-                return False
-
-        conn.close()
         print("\n[+] Usage tracking: READY")
         return True
 
@@ -115,6 +140,38 @@ def check_pgvector_config():
         return False
 
 
+def migrate_pgvector():
+    """Create the pgvector table and indexes"""
+    print("\n" + "=" * 60)
+    print("PGVECTOR MIGRATION")
+    print("=" * 60)
+
+    try:
+        from flamehaven_filesearch.engine.embedding_generator import (
+            get_embedding_generator,
+        )
+        from flamehaven_filesearch.vector_store import create_vector_store
+
+        config = Config.from_env()
+        store = create_vector_store(config, get_embedding_generator().vector_dim)
+        if store is None:
+            print("[i] pgvector not enabled, nothing to migrate")
+            return True
+        try:
+            store.migrate()
+        finally:
+            store.close()
+        print(
+            "[+] Schema ready: "
+            f"{config.postgres_schema}.{config.vector_postgres_table}"
+        )
+        return True
+
+    except Exception as e:
+        print(f"[!] FAIL: {e}")
+        return False
+
+
 def check_middleware_config():
     """Check middleware configuration"""
     print("\n" + "=" * 60)
@@ -130,14 +187,24 @@ def check_middleware_config():
     return True
 
 
-def main():
+def main(argv=None):
     """Run all monitoring checks"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help="create the pgvector table and indexes before checking",
+    )
+    args = parser.parse_args(argv)
+
     print("\nFlamehaven FileSearch v1.4.1 - Monitoring Verification")
     print("=" * 60)
 
     results = []
 
     # Run checks
+    if args.migrate:
+        results.append(("pgvector Migration", migrate_pgvector()))
     results.append(("Usage Tracking", check_usage_tracking()))
     results.append(("pgvector Config", check_pgvector_config()))
     results.append(("Middleware Config", check_middleware_config()))
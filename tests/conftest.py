@@ -8,78 +8,74 @@ Provides:
 """
 
 import site
+import sqlite3
 import sys
-import tempfile
-from pathlib import Path
+import uuid
+from datetime import datetime
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
 
 from flamehaven_filesearch.api import app
-from flamehaven_filesearch.auth import get_key_manager
+from flamehaven_filesearch.auth import APIKeyManager
 
 # Ensure user site-packages are visible (for psutil, etc.)
 sys.path.append(site.getusersitepackages())
 
-
-@pytest.fixture(scope="session")
-def test_api_key():
-    """Fixed test API key for all tests"""
-    return "sk_test_abc123def456ghi789jkl"
-
-
-@pytest.fixture
-def temp_db():
-    """Create temporary database for each test"""
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-        db_path = f.name
-    yield db_path
-    try:
-        Path(db_path).unlink()
-    except FileNotFoundError:
-        pass
-    except PermissionError:
-        # On Windows, retry with delay if locked
-        import time
-
-        time.sleep(0.1)
-        try:
-            Path(db_path).unlink()
-        except (FileNotFoundError, PermissionError):
-            pass
+# Immutable, so tests sharing the mocked embedding cannot alias-mutate it
+_MOCK_EMBEDDING = (0.1,) * 768
 
 
-@pytest.fixture
-def key_manager(temp_db, test_api_key, monkeypatch):
-    """Create API key manager with temp database and mock"""
-    # Override default database
-    monkeypatch.setenv("FLAMEHAVEN_API_KEYS_DB", temp_db)
-
-    # Reset global singleton to force new instance with temp_db
-    import flamehaven_filesearch.auth as auth_module
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-slow",
+        action="store_true",
+        default=False,
+        help="run tests marked slow (performance and load checks)",
+    )
 
-    auth_module._key_manager = None
 
-    manager = get_key_manager(temp_db)
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="need --run-slow option to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
 
-    # Create test API key by directly inserting (bypass hashing for testing)
-    import sqlite3
-    from datetime import datetime
 
-    conn = sqlite3.connect(temp_db)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+@pytest.fixture(scope="session")
+def test_api_key():
+    """Fixed test API key for all tests"""
+    return "sk_test_abc123def456ghi789jkl"
 
-    # Tables already created by manager._ensure_db(), just verify
-    # No need to recreate - manager already initialized the schema
 
-    # Insert test key (use SHA256 hash for consistency)
-    import hashlib
+@pytest.fixture(scope="session")
+def temp_db(tmp_path_factory):
+    """In-memory API key database (SQLite URI) shared by the session"""
+    if sqlite3.sqlite_version_info < (3, 36):
+        # No memdb VFS; fall back to a file
+        return f"file:{tmp_path_factory.mktemp('api_keys') / 'flamehaven.db'}"
+    # memdb rather than cache=shared: shared-cache table locks fail
+    # concurrent requests immediately instead of waiting on busy_timeout
+    return f"file:/api_keys_{uuid.uuid4().hex}?vfs=memdb"
 
-    key_hash = hashlib.sha256(test_api_key.encode()).hexdigest()
 
-    cursor.execute(
+@pytest.fixture(scope="session")
+def _seeded_key_db(temp_db, test_api_key):
+    """
+    Create the schema and test API key once, and keep an in-memory
+    snapshot of the seeded database to restore before each test.
+    """
+    # An in-memory database lives only while a connection is open, so the
+    # keeper is opened first; it is also the fixture's only write handle
+    keeper = sqlite3.connect(temp_db, uri=True)
+    manager = APIKeyManager(temp_db)
+
+    # Insert test key directly (bypass generate_key for testing)
+    keeper.execute(
         """
         INSERT OR IGNORE INTO api_keys
         (id, name, key_hash, user_id, created_at, is_active,
@@ -89,7 +85,7 @@ def key_manager(temp_db, test_api_key, monkeypatch):
         (
             "test_key_id",
             "Test Key",
-            key_hash,
+            manager._hash_key(test_api_key),
             "test_user",
             datetime.now().isoformat(),
             1,
@@ -97,20 +93,34 @@ def key_manager(temp_db, test_api_key, monkeypatch):
             '["upload", "search", "stores", "delete", "admin"]',
         ),
     )
+    keeper.commit()
+
+    snapshot = sqlite3.connect(":memory:")
+    keeper.backup(snapshot)
+
+    yield manager, snapshot, keeper
+    snapshot.close()
+    keeper.close()
+
+
+@pytest.fixture
+def key_manager(temp_db, _seeded_key_db, monkeypatch):
+    """API key manager over the session database, reset to its seeded state"""
+    monkeypatch.setenv("FLAMEHAVEN_API_KEYS_DB", temp_db)
+    manager, snapshot, keeper = _seeded_key_db
 
-    conn.commit()
-    conn.close()
+    # The manager commits on its own connections, so isolation comes from
+    # copying the seeded pages back rather than rolling a transaction back
+    snapshot.backup(keeper)
 
     # Set as global singleton BEFORE yielding
     # This ensures all get_key_manager() calls use this instance
+    import flamehaven_filesearch.auth as auth_module
+
     auth_module._key_manager = manager
 
     yield manager
 
-    # Cleanup: close DB connections
-    if hasattr(manager, "conn") and manager.conn:
-        manager.conn.close()
-
     # Reset singleton
     auth_module._key_manager = None
 
@@ -118,16 +128,19 @@ def key_manager(temp_db, test_api_key, monkeypatch):
 class AuthenticatedTestClient(TestClient):
     """Custom TestClient that automatically adds API key authentication"""
 
-    def __init__(self, app, api_key=None, **kwargs):
-        super().__init__(app, **kwargs)
-        self.api_key = api_key
-        self.public_endpoints = [
+    public_endpoints = frozenset(
+        {
             "/",
             "/health",
             "/docs",
             "/openapi.json",
             "/admin/dashboard",
-        ]
+        }
+    )
+
+    def __init__(self, app, api_key=None, **kwargs):
+        super().__init__(app, **kwargs)
+        self.api_key = api_key
 
     def request(self, method, url, **kwargs):
         """Override request to add authentication header"""
@@ -143,22 +156,45 @@ class AuthenticatedTestClient(TestClient):
         return super().request(method, url, **kwargs)
 
 
+@pytest.fixture(scope="session")
+def _app_client(test_api_key):
+    """Authenticated client built once; the ASGI lifespan runs once per session"""
+    with AuthenticatedTestClient(app, api_key=test_api_key) as client:
+        yield client
+
+
 @pytest.fixture
-def authenticated_client(test_api_key, temp_db, monkeypatch, key_manager):
-    """FastAPI test client with authentication headers"""
+def _app_env(temp_db, monkeypatch, key_manager):
+    """
+    Per-test environment for the shared client. Kept function-scoped:
+    some tests set and delete these variables directly on os.environ.
+    """
     monkeypatch.setenv("FLAMEHAVEN_API_KEYS_DB", temp_db)
     monkeypatch.setenv("FLAMEHAVEN_ADMIN_KEY", "admin_test_key_12345")
 
     # Singleton already set by key_manager fixture
 
-    return AuthenticatedTestClient(app, api_key=test_api_key)
+
+@pytest.fixture
+def authenticated_client(_app_client, _app_env):
+    """FastAPI test client with authentication headers"""
+    # Cookies are the only per-client state a test could leave behind
+    _app_client.cookies.clear()
+    return _app_client
+
+
+@pytest.fixture(scope="session")
+def _public_app_client():
+    """Unauthenticated client built once per session"""
+    return TestClient(app)
 
 
 @pytest.fixture
-def public_client(temp_db, monkeypatch):
+def public_client(_public_app_client, temp_db, monkeypatch):
     """FastAPI test client for public endpoints (no authentication)"""
     monkeypatch.setenv("FLAMEHAVEN_API_KEYS_DB", temp_db)
-    return TestClient(app)
+    _public_app_client.cookies.clear()
+    return _public_app_client
 
 
 @pytest.fixture
@@ -168,15 +204,11 @@ def client(authenticated_client):
 
 
 @pytest.fixture
-def admin_client(test_api_key, temp_db, monkeypatch, key_manager):
+def admin_client(authenticated_client):
     """FastAPI test client with admin authentication"""
-    admin_key = "admin_test_key_12345"
-    monkeypatch.setenv("FLAMEHAVEN_API_KEYS_DB", temp_db)
-    monkeypatch.setenv("FLAMEHAVEN_ADMIN_KEY", admin_key)
-
-    # Singleton already set by key_manager fixture
-
-    return AuthenticatedTestClient(app, api_key=test_api_key)
+    # The test key carries the admin permission, so the shared
+    # authenticated client doubles as the admin client
+    return authenticated_client
 
 
 @pytest.fixture
@@ -189,7 +221,7 @@ def mock_gemini():
 
         # Mock embeddings
         mock_embedding = MagicMock()
-        mock_embedding.embedding = [0.1] * 768
+        mock_embedding.embedding = _MOCK_EMBEDDING
         mock_client.embed_content.return_value = mock_embedding
 
         # Mock text generation
@@ -200,6 +232,13 @@ def mock_gemini():
         yield mock_client
 
 
+@pytest.fixture
+def mock_embedding_factory():
+    """Return a callable producing distinct, reproducible 768-dim embeddings"""
+    rng = np.random.default_rng(0)
+    return lambda: rng.standard_normal(768, dtype=np.float32).tolist()
+
+
 @pytest.fixture
 def mock_online_api(monkeypatch):
     """Set up environment for online API mode"""
@@ -207,17 +246,6 @@ def mock_online_api(monkeypatch):
     monkeypatch.setenv("ENVIRONMENT", "remote")
 
 
-@pytest.fixture(autouse=True)
-def cleanup_metrics():
-    """Reset metrics before each test to avoid cross-test contamination"""
-    # Clear in-memory metrics state
-
-    # Reset metrics registry if needed
-    yield
-
-    # Cleanup after test
-
-
 @pytest.fixture(autouse=True)
 def ensure_searcher_initialized():
     """Ensure searcher and cache are initialized for each test."""
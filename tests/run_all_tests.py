@@ -5,14 +5,87 @@ Pure unittest, no pytest dependency
 Runs all tests across the entire codebase
 """
 
+import hashlib
+import heapq
+import io
+import json
 import os
 import sys
 import time
 import unittest
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parent.parent
+# Sources whose edits invalidate cached outcomes
+SOURCE_DIRS = (ROOT / "flamehaven_filesearch", ROOT / "tests")
+
 # Add to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(ROOT))
+
+CACHE_FILE = ROOT / ".test_cache.json"
+
+
+def serial(test_item):
+    """Mark a TestCase class or method to run in the main process only."""
+    test_item.__unittest_serial__ = True
+    return test_item
+
+
+def iter_tests(suite):
+    """Yield the individual TestCases of a (nested) suite."""
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            yield from iter_tests(item)
+        else:
+            yield item
+
+
+def _is_serial(test):
+    method = getattr(test, getattr(test, "_testMethodName", ""), None)
+    return getattr(test, "__unittest_serial__", False) or getattr(
+        method, "__unittest_serial__", False
+    )
+
+
+@lru_cache(maxsize=None)
+def _source_digest():
+    """
+    Hash every Python file under SOURCE_DIRS, once per run.
+
+    Any edit to the package or the tests invalidates every cached outcome;
+    a test can reach code through any chain of imports, so nothing finer
+    is safe.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for src in SOURCE_DIRS:
+        for path in sorted(src.rglob("*.py")):
+            digest.update(str(path.relative_to(ROOT)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _test_key(test):
+    return _source_digest()
+
+
+class _FilteringLoader(unittest.TestLoader):
+    """
+    TestLoader.discover that never imports the given file names, nor
+    modules whose source has no TestCase: the pytest-only modules would
+    pull in FastAPI and the app just to contribute no tests.
+    """
+
+    def __init__(self, skip_files):
+        super().__init__()
+        self.skip_files = skip_files
+
+    def _match_path(self, path, full_path, pattern):
+        if path in self.skip_files or not super()._match_path(path, full_path, pattern):
+            return False
+        return "TestCase" in Path(full_path).read_text(encoding="utf-8")
 
 
 def discover_tests(start_dir="tests", pattern="test_*.py"):
@@ -30,12 +103,15 @@ def discover_tests(start_dir="tests", pattern="test_*.py"):
     }
 
     suite = unittest.TestSuite()
+    # Modules whose tests are already in the suite
+    loaded = set()
 
     # Load unittest_suite (Phase 2)
     try:
         from tests.test_unittest_suite import suite as semantic_suite
 
         suite.addTests(semantic_suite())
+        loaded.add("tests.test_unittest_suite")
         print("[+] Loaded: test_unittest_suite.py (19 tests)")
     except Exception as e:
         print(f"[!] Failed to load test_unittest_suite.py: {e}")
@@ -48,29 +124,31 @@ def discover_tests(start_dir="tests", pattern="test_*.py"):
 
         phase3_tests = loader.loadTestsFromTestCase(TestGravitasPackCacheIntegration)
         suite.addTests(phase3_tests)
+        loaded.add("tests.test_gravitas_cache_integration")
         count = phase3_tests.countTestCases()
         print(f"[+] Loaded: test_gravitas_cache_integration.py ({count} tests)")
     except Exception as e:
         print(f"[!] Failed to load test_gravitas_cache_integration.py: {e}")
 
     # Discover other unittest-compatible tests
-    test_dir = Path(__file__).parent / start_dir
-
-    for test_file in test_dir.glob(pattern):
-        if test_file.name in exclude:
+    test_dir = ROOT / start_dir
+    skip_files = exclude | {f"{name.rsplit('.', 1)[-1]}.py" for name in loaded}
+    discovered = _FilteringLoader(skip_files).discover(
+        start_dir=str(test_dir),
+        pattern=pattern,
+        top_level_dir=str(test_dir.parent),
+    )
+
+    counts = {}
+    for test in iter_tests(discovered):
+        if isinstance(test, unittest.loader._FailedTest):
+            print(f"[!] Skipped {test._testMethodName}: {test._exception}")
             continue
-
-        # Try to load as unittest module
-        try:
-            module_name = f"tests.{test_file.stem}"
-            module = __import__(module_name, fromlist=[""])
-
-            tests = loader.loadTestsFromModule(module)
-            if tests.countTestCases() > 0:
-                suite.addTests(tests)
-                print(f"[+] Loaded: {test_file.name} ({tests.countTestCases()} tests)")
-        except Exception as e:
-            print(f"[!] Skipped {test_file.name}: {e}")
+        suite.addTest(test)
+        module_name = type(test).__module__
+        counts[module_name] = counts.get(module_name, 0) + 1
+    for module_name, count in counts.items():
+        print(f"[+] Loaded: {module_name.rsplit('.', 1)[-1]}.py ({count} tests)")
 
     return suite
 
@@ -81,6 +159,7 @@ class FlamehavenTestResult(unittest.TextTestResult):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.test_times = []
+        self.passed_ids = []
         self.current_test_start = None
 
     def startTest(self, test):
@@ -91,6 +170,7 @@ class FlamehavenTestResult(unittest.TextTestResult):
         super().addSuccess(test)
         elapsed = time.time() - self.current_test_start
         self.test_times.append((str(test), elapsed, "PASS"))
+        self.passed_ids.append(test.id())
 
     def addError(self, test, err):
         super().addError(test, err)
@@ -103,11 +183,104 @@ class FlamehavenTestResult(unittest.TextTestResult):
         self.test_times.append((str(test), elapsed, "FAIL"))
 
 
+class _ShardTest:
+    """Stand-in for a test that ran in a worker, for result reporting."""
+
+    def __init__(self, name):
+        self._name = name
+
+    def __str__(self):
+        return self._name
+
+    def id(self):
+        return self._name
+
+    def shortDescription(self):
+        return None
+
+
+def _run_shard(test_ids):
+    """Worker entry point: run tests by id, return picklable outcomes."""
+    suite = unittest.TestLoader().loadTestsFromNames(test_ids)
+    result = unittest.TextTestRunner(
+        stream=io.StringIO(), resultclass=FlamehavenTestResult, verbosity=0
+    ).run(suite)
+    return (
+        result.testsRun,
+        [(str(test), tb) for test, tb in result.failures],
+        [(str(test), tb) for test, tb in result.errors],
+        [(str(test), reason) for test, reason in result.skipped],
+        result.test_times,
+        result.passed_ids,
+    )
+
+
 class FlamehavenTestRunner(unittest.TextTestRunner):
     """Custom test runner with enhanced reporting."""
 
     resultclass = FlamehavenTestResult
 
+    def __init__(self, *args, workers=1, cached=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.workers = max(1, workers)
+        self.cached = cached
+
+    def _load_cache(self):
+        try:
+            return json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _split_cached(self, test):
+        """Separate tests that passed before with unchanged source."""
+        cache = self._load_cache()
+        pending, hits, keys = unittest.TestSuite(), [], {}
+        for item in iter_tests(test):
+            key = _test_key(item)
+            if cache.get(item.id()) == key:
+                hits.append(item)
+            else:
+                pending.addTest(item)
+                # Keyed up front: a suite drops its tests as they run
+                keys[item.id()] = key
+        return pending, hits, cache, keys
+
+    def _save_cache(self, cache, keys, result):
+        for test_id in result.passed_ids:
+            if test_id in keys:
+                cache[test_id] = keys[test_id]
+        for test, _ in result.failures + result.errors:
+            cache.pop(test.id(), None)
+        CACHE_FILE.write_text(json.dumps(cache, sort_keys=True), encoding="utf-8")
+
+    def _run_parallel(self, test):
+        """Shard tests across worker processes and merge their results."""
+        tests = list(iter_tests(test))
+        serial_suite = unittest.TestSuite(t for t in tests if _is_serial(t))
+        test_ids = [t.id() for t in tests if not _is_serial(t)]
+        # Round-robin keeps each module's tests spread over all workers
+        shards = [test_ids[i :: self.workers] for i in range(self.workers)]
+
+        result = self._makeResult()
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for run, failures, errors, skipped, times, passed in pool.map(
+                _run_shard, [shard for shard in shards if shard]
+            ):
+                result.testsRun += run
+                result.failures += [(_ShardTest(n), tb) for n, tb in failures]
+                result.errors += [(_ShardTest(n), tb) for n, tb in errors]
+                result.skipped += [(_ShardTest(n), why) for n, why in skipped]
+                result.test_times += times
+                result.passed_ids += passed
+
+        # Tests marked @serial run here, after the shards
+        serial_suite(result)
+        result.printErrors()
+        self.stream.writeln(result.separator2)
+        self.stream.writeln(f"Ran {result.testsRun} tests on {self.workers} workers")
+        self.stream.writeln("OK" if result.wasSuccessful() else "FAILED")
+        return result
+
     def run(self, test):
         """Run tests with enhanced reporting."""
         print(
@@ -122,7 +295,16 @@ class FlamehavenTestRunner(unittest.TextTestRunner):
         )
 
         start_time = time.time()
-        result = super().run(test)
+        hits = []
+        if self.cached:
+            test, hits, cache, keys = self._split_cached(test)
+        if self.workers > 1:
+            result = self._run_parallel(test)
+        else:
+            result = super().run(test)
+        if self.cached:
+            self._save_cache(cache, keys, result)
+            result.testsRun += len(hits)
         total_time = time.time() - start_time
 
         # Print timing summary
@@ -131,8 +313,8 @@ class FlamehavenTestRunner(unittest.TextTestRunner):
             print("TIMING SUMMARY (slowest tests)")
             print("=" * 80)
 
-            sorted_times = sorted(result.test_times, key=lambda x: x[1], reverse=True)
-            for test_name, elapsed, status in sorted_times[:10]:
+            slowest = heapq.nlargest(10, result.test_times, key=itemgetter(1))
+            for test_name, elapsed, status in slowest:
                 print(f"  [{status:5}] {elapsed:6.3f}s - {test_name}")
 
         # Print final summary
@@ -145,6 +327,8 @@ class FlamehavenTestRunner(unittest.TextTestRunner):
         )
         print(f"Failures: {len(result.failures)}")
         print(f"Errors: {len(result.errors)}")
+        if hits:
+            print(f"Cached passes (not re-run): {len(hits)}")
         print(f"Total time: {total_time:.2f}s")
 
         if result.wasSuccessful():
@@ -155,7 +339,7 @@ class FlamehavenTestRunner(unittest.TextTestRunner):
         return result
 
 
-def main(verbosity=2):
+def main(verbosity=2, workers=1, cached=False):
     """Run all tests."""
 
     # Set environment for offline testing
@@ -173,7 +357,7 @@ def main(verbosity=2):
         return 1
 
     # Run tests
-    runner = FlamehavenTestRunner(verbosity=verbosity)
+    runner = FlamehavenTestRunner(verbosity=verbosity, workers=workers, cached=cached)
     result = runner.run(suite)
 
     return 0 if result.wasSuccessful() else 1
@@ -185,6 +369,18 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Flamehaven Test Suite")
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
     parser.add_argument("-q", "--quiet", action="store_true", help="Quiet output")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes to shard tests across (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--cached",
+        action="store_true",
+        help=f"Skip tests that passed with unchanged source ({CACHE_FILE.name})",
+    )
 
     args = parser.parse_args()
 
@@ -195,4 +391,4 @@ if __name__ == "__main__":
     else:
         verbosity = 1
 
-    sys.exit(main(verbosity))
+    sys.exit(main(verbosity, args.workers or os.cpu_count() or 1, args.cached))
@@ -4,8 +4,13 @@ Flamehaven Test Runner - pytest Alternative
 Pure Python test execution without heavy dependencies
 """
 
+import contextlib
+import io
+import os
+import runpy
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 # Add to path
@@ -21,10 +26,8 @@ def run_test_file(filepath):
     start = time.time()
 
     try:
-        # Execute test file
-        with open(filepath) as f:
-            code = compile(f.read(), filepath, "exec")
-            exec(code, {"__name__": "__main__"})
+        # Execute test file as `python <file>` would, with __file__ set
+        runpy.run_path(filepath, run_name="__main__")
 
         elapsed = time.time() - start
         print(f"\n[+] PASSED in {elapsed:.2f}s")
@@ -37,6 +40,14 @@ def run_test_file(filepath):
         return False, elapsed
 
 
+def _run_one(filepath):
+    """Worker entry point: run a test file, capturing its output."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        passed, elapsed = run_test_file(filepath)
+    return Path(filepath).name, passed, elapsed, output.getvalue()
+
+
 def main():
     """Run all Flamehaven tests."""
     print(
@@ -59,18 +70,31 @@ def main():
         "test_quick_phase2.py",
     ]
 
-    results = []
-    total_time = 0
-
+    filepaths = []
     for test_file in test_files:
         filepath = test_dir / test_file
         if filepath.exists():
-            passed, elapsed = run_test_file(str(filepath))
-            results.append((test_file, passed, elapsed))
-            total_time += elapsed
+            filepaths.append(str(filepath))
         else:
             print(f"\n[!] Skipped: {test_file} (not found)")
 
+    results = []
+    start = time.time()
+
+    # Each file runs in its own process; output is printed as files finish
+    with ProcessPoolExecutor(
+        max_workers=max(1, min(len(filepaths), os.cpu_count() or 1))
+    ) as pool:
+        futures = [pool.submit(_run_one, filepath) for filepath in filepaths]
+        for future in as_completed(futures):
+            name, passed, elapsed, output = future.result()
+            print(output, end="")
+            results.append((name, passed, elapsed))
+
+    total_time = time.time() - start
+    # Summary keeps the listed order, not the completion order
+    results.sort(key=lambda result: test_files.index(result[0]))
+
     # Summary
     print(f"\n{'='*80}")
     print("SUMMARY")
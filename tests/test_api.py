@@ -24,8 +24,8 @@ def mock_api_key(monkeypatch):
 class TestHealthEndpoints:
     """Test health and info endpoints (public, no auth required)"""
 
-    def test_root_endpoint(self, public_client):
-        """Test root endpoint"""
+    def test_health_endpoints(self, public_client):
+        """Test root, health, docs and schema endpoints in one client session"""
         response = public_client.get("/")
         assert response.status_code == 200
         data = response.json()
@@ -33,8 +33,6 @@ class TestHealthEndpoints:
         assert "version" in data
         assert "endpoints" in data
 
-    def test_health_check(self, public_client):
-        """Test health check endpoint"""
         response = public_client.get("/health")
         assert response.status_code == 200
         data = response.json()
@@ -42,13 +40,9 @@ class TestHealthEndpoints:
         assert "version" in data
         assert "uptime" in data
 
-    def test_docs_available(self, public_client):
-        """Test API documentation is available"""
         response = public_client.get("/docs")
         assert response.status_code == 200
 
-    def test_openapi_schema(self, public_client):
-        """Test OpenAPI schema is available"""
         response = public_client.get("/openapi.json")
         assert response.status_code == 200
         schema = response.json()
@@ -111,43 +105,44 @@ class TestUploadEndpoints:
 class TestSearchEndpoints:
     """Test search endpoints"""
 
-    def test_search_post_missing_query(self, client, mock_api_key):
-        """Test search POST without query"""
-        response = client.post("/search", json={})
-        assert response.status_code == 422  # Validation error
-
-    def test_search_post_with_query(self, client, mock_api_key):
-        """Test search POST with query"""
-        response = client.post(
-            "/search", json={"query": "test query", "store_name": "default"}
-        )
-        # May fail without valid API key or store
-        assert response.status_code in [200, 400, 500, 503]
-
-    def test_search_get_missing_query(self, client, mock_api_key):
-        """Test search GET without query"""
-        response = client.get("/search")
-        assert response.status_code == 422  # Validation error
-
-    def test_search_get_with_query(self, client, mock_api_key):
-        """Test search GET with query"""
-        response = client.get("/search?q=test+query&store=default")
-        # May fail without valid API key or store
-        assert response.status_code in [200, 400, 500, 503]
-
-    def test_search_with_params(self, client, mock_api_key):
-        """Test search with additional parameters"""
-        response = client.post(
-            "/search",
-            json={
-                "query": "test",
-                "store_name": "default",
-                "model": "gemini-2.5-flash",
-                "max_tokens": 512,
-                "temperature": 0.7,
-            },
-        )
-        assert response.status_code in [200, 400, 500, 503]
+    # Queries may fail without a valid API key or store
+    @pytest.mark.parametrize(
+        "method, url, payload, expected",
+        [
+            ("POST", "/search", {}, {422}),
+            (
+                "POST",
+                "/search",
+                {"query": "test query", "store_name": "default"},
+                {200, 400, 500, 503},
+            ),
+            ("GET", "/search", None, {422}),
+            ("GET", "/search?q=test+query&store=default", None, {200, 400, 500, 503}),
+            (
+                "POST",
+                "/search",
+                {
+                    "query": "test",
+                    "store_name": "default",
+                    "model": "gemini-2.5-flash",
+                    "max_tokens": 512,
+                    "temperature": 0.7,
+                },
+                {200, 400, 500, 503},
+            ),
+        ],
+        ids=[
+            "post_missing_query",
+            "post_with_query",
+            "get_missing_query",
+            "get_with_query",
+            "post_with_params",
+        ],
+    )
+    def test_search(self, client, mock_api_key, method, url, payload, expected):
+        """Test search over GET and POST with and without a query"""
+        response = client.request(method, url, json=payload)
+        assert response.status_code in expected
 
 
 class TestMetricsEndpoints:
@@ -167,15 +162,17 @@ class TestMetricsEndpoints:
 class TestErrorHandling:
     """Test error handling"""
 
-    def test_404_endpoint(self, public_client):
-        """Test non-existent endpoint returns 404"""
-        response = public_client.get("/nonexistent")
-        assert response.status_code == 404
-
-    def test_invalid_method(self, public_client):
-        """Test invalid HTTP method"""
-        response = public_client.patch("/upload")
-        assert response.status_code == 405  # Method not allowed
+    @pytest.mark.parametrize(
+        "method, path, status",
+        [
+            ("GET", "/nonexistent", 404),  # Non-existent endpoint
+            ("PATCH", "/upload", 405),  # Method not allowed
+        ],
+    )
+    def test_error_status(self, public_client, method, path, status):
+        """Test unknown endpoints and methods are rejected"""
+        response = public_client.request(method, path)
+        assert response.status_code == status
 
 
 # Integration tests requiring actual API key
@@ -1,15 +1,14 @@
 import json
 from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
 from fastapi import HTTPException
 from fastapi.exceptions import RequestValidationError
-from fastapi.testclient import TestClient
 from starlette.requests import Request
 
 from flamehaven_filesearch import api
 from flamehaven_filesearch.api import (
-    app,
     filesearch_exception_handler,
     format_uptime,
     general_exception_handler,
@@ -21,41 +20,16 @@ from flamehaven_filesearch.api import (
 )
 from flamehaven_filesearch.exceptions import ServiceUnavailableError
 
-
-class AuthenticatedTestClient(TestClient):
-    """Custom TestClient that automatically adds API key authentication"""
-
-    def __init__(self, app, api_key=None, **kwargs):
-        super().__init__(app, **kwargs)
-        self.api_key = api_key
-        self.public_endpoints = [
-            "/",
-            "/health",
-            "/docs",
-            "/openapi.json",
-            "/admin/dashboard",
-        ]
-
-    def request(self, method, url, **kwargs):
-        """Override request to add authentication header"""
-        # Handle None or missing headers
-        if "headers" not in kwargs or kwargs["headers"] is None:
-            kwargs["headers"] = {}
-
-        # Add API key for protected endpoints
-        if self.api_key and url not in self.public_endpoints:
-            if "Authorization" not in kwargs["headers"]:
-                kwargs["headers"]["Authorization"] = f"Bearer {self.api_key}"
-
-        return super().request(method, url, **kwargs)
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 
 @pytest.fixture
-def api_client(test_api_key, temp_db, monkeypatch, key_manager):
-    """FastAPI test client with authentication"""
-    monkeypatch.setenv("FLAMEHAVEN_API_KEYS_DB", temp_db)
-    monkeypatch.setenv("FLAMEHAVEN_ADMIN_KEY", "admin_test_key_12345")
-    return AuthenticatedTestClient(app, api_key=test_api_key)
+def api_client(authenticated_client):
+    """FastAPI test client with authentication (shared conftest client)"""
+    return authenticated_client
 
 
 def _build_request():
@@ -73,8 +47,17 @@ def _build_request():
     return request
 
 
+@pytest.fixture(scope="module")
+def fake_request():
+    """One request for all handler tests; the handlers only read its id"""
+    return _build_request()
+
+
 def _parse_json(response):
-    return json.loads(response.body.decode())
+    # Both parse the body bytes directly, with no decode step
+    if orjson is not None:
+        return orjson.loads(response.body)
+    return json.loads(response.body)
 
 
 def test_rate_limit_key_includes_test_marker(monkeypatch):
@@ -97,21 +80,16 @@ def test_initialize_services_force_reload():
     assert api.search_cache is not None
 
 
-@pytest.mark.parametrize(
-    "seconds,expected_suffix",
-    [
-        (5, "s"),
-        (120, "m"),
-        (3600, "h"),
-        (90000, "d"),
-    ],
-)
-def test_format_uptime_formats_duration(seconds, expected_suffix):
-    formatted = format_uptime(seconds)
-    if expected_suffix == "s":
-        assert formatted.endswith("s")
-    else:
-        assert expected_suffix in formatted
+def test_format_uptime_formats_duration():
+    # format_uptime is pure, so one test covers every unit bucket
+    cases = {
+        5: "5s",
+        120: "2m 0s",
+        3600: "1h 0m 0s",
+        90000: "1d 1h 0m 0s",
+    }
+    for seconds, expected in cases.items():
+        assert format_uptime(seconds) == expected
 
 
 def test_get_system_info_fallback(monkeypatch):
@@ -137,23 +115,25 @@ def test_upload_single_file_requires_initialized_searcher(api_client, monkeypatc
     assert body["error"] == "SERVICE_UNAVAILABLE"
 
 
-def test_upload_single_file_logs_cleanup_warning(api_client, monkeypatch, caplog):
-    caplog.set_level("WARNING")
-    monkeypatch.setattr(
-        api.shutil,
-        "rmtree",
-        lambda path: (_ for _ in ()).throw(RuntimeError("cleanup failed")),
-    )
+def test_upload_single_file_logs_cleanup_warning(api_client, monkeypatch):
+    def boom(path):
+        raise RuntimeError("cleanup failed")
+
+    warn = MagicMock()
+    monkeypatch.setattr(api.logger, "warning", warn)
+    monkeypatch.setattr(api.shutil, "rmtree", boom)
     response = api_client.post(
         "/api/upload/single",
         files={"file": ("valid.txt", "content", "text/plain")},
     )
     assert response.status_code == 200
-    assert "Failed to cleanup temp dir" in caplog.text
+    assert any(
+        "Failed to cleanup temp dir" in str(call) for call in warn.call_args_list
+    )
 
 
 def test_search_endpoint_surfacing_backend_errors(api_client, monkeypatch):
-    initialize_services(force=True)
+    # Services are freshly initialized by the autouse conftest fixture
     api.search_cache.invalidate()
 
     def failing_search(**kwargs):
@@ -168,7 +148,6 @@ def test_search_endpoint_surfacing_backend_errors(api_client, monkeypatch):
 
 def test_prometheus_metrics_updates_store_count(api_client, monkeypatch):
     monkeypatch.setenv("FLAMEHAVEN_METRICS_ENABLED", "1")
-    initialize_services(force=True)
     monkeypatch.setattr(api.searcher, "list_stores", lambda: ["default", "reports"])
     response = api_client.get("/prometheus")
     assert response.status_code == 200
@@ -183,29 +162,26 @@ def test_metrics_endpoint_requires_searcher(api_client, monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_file_search_exception_handler_formats_response():
-    request = _build_request()
+async def test_file_search_exception_handler_formats_response(fake_request):
     exc = ServiceUnavailableError("Search", "offline")
-    response = await filesearch_exception_handler(request, exc)
+    response = await filesearch_exception_handler(fake_request, exc)
     assert response.status_code == 503
     payload = _parse_json(response)
     assert payload["request_id"] == "req-test"
 
 
 @pytest.mark.asyncio
-async def test_http_exception_handler_includes_detail():
-    request = _build_request()
+async def test_http_exception_handler_includes_detail(fake_request):
     exc = HTTPException(status_code=418, detail="teapot")
-    response = await http_exception_handler(request, exc)
+    response = await http_exception_handler(fake_request, exc)
     assert response.status_code == 418
     assert _parse_json(response)["detail"] == "teapot"
 
 
 @pytest.mark.asyncio
-async def test_general_exception_handler_wraps_runtime_error():
-    request = _build_request()
+async def test_general_exception_handler_wraps_runtime_error(fake_request):
     exc = RuntimeError("unexpected")
-    response = await general_exception_handler(request, exc)
+    response = await general_exception_handler(fake_request, exc)
     assert response.status_code == 500
     body = _parse_json(response)
     assert body["error"] == "INTERNAL_ERROR"
@@ -213,24 +189,26 @@ async def test_general_exception_handler_wraps_runtime_error():
 
 
 @pytest.mark.asyncio
-async def test_request_validation_exception_handler_delegates_when_not_file_error():
-    request = _build_request()
+async def test_request_validation_exception_handler_delegates_when_not_file_error(
+    fake_request,
+):
     validation = RequestValidationError(
         [{"loc": ("body", "query"), "msg": "field required", "type": "value_error"}]
     )
 
-    response = await request_validation_exception_handler(request, validation)
+    response = await request_validation_exception_handler(fake_request, validation)
     assert response.status_code == 422
 
 
 @pytest.mark.asyncio
-async def test_request_validation_exception_handler_customizes_file_errors():
-    request = _build_request()
+async def test_request_validation_exception_handler_customizes_file_errors(
+    fake_request,
+):
     validation = RequestValidationError(
         [{"loc": ("body", "file"), "msg": "Expected UploadFile", "type": "type_error"}]
     )
 
-    response = await request_validation_exception_handler(request, validation)
+    response = await request_validation_exception_handler(fake_request, validation)
     assert response.status_code == 400
     assert (
         _parse_json(response)["detail"] == "Invalid filename: Filename cannot be empty"
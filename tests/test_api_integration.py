@@ -4,15 +4,123 @@ API Integration Test Suite for FLAMEHAVEN FileSearch v1.4.2
 Tests complete API workflows with rate limiting, validation, and error handling.
 """
 
+import asyncio
+import importlib.util
+import itertools
+from types import SimpleNamespace
+
+import httpx
 import pytest
+from limits import parse
+from starlette.requests import Request
+
+from flamehaven_filesearch import api, middlewares
+from flamehaven_filesearch.middlewares import CORSHeadersMiddleware
+
+HAS_BENCHMARK = importlib.util.find_spec("pytest_benchmark") is not None
+
+
+@pytest.fixture
+def tight_rate_limit(monkeypatch):
+    """
+    Lower an endpoint's rate limit for one test, so a 429 takes a few
+    requests rather than exhausting the production quota.
+    """
+
+    def tighten(endpoint, rate="2/minute"):
+        name = f"{endpoint.__module__}.{endpoint.__name__}"
+        for lim in api.limiter._route_limits[name]:
+            monkeypatch.setattr(lim, "limit", parse(rate))
+
+    yield tighten
+    api.limiter.reset()
+
+
+# Upload payloads, shared rather than rebuilt per request
+TEXT_FILE = ("test.txt", b"Test content", "text/plain")
+VALID_FILE = ("document.txt", b"Valid content", "text/plain")
+HIDDEN_FILE = (".hidden.txt", b"content", "text/plain")
+TRAVERSAL_FILE = ("../../etc/passwd", b"attack", "text/plain")
+MULTIPLE_FILES = [
+    ("files", ("file1.txt", b"content1", "text/plain")),
+    ("files", ("file2.txt", b"content2", "text/plain")),
+    ("files", ("file3.txt", b"content3", "text/plain")),
+]
+
+
+@pytest.fixture(scope="module")
+def health_response(_public_app_client):
+    """
+    One /health response shared by the tests that inspect its parts.
+    The request-logging middleware's clock advances a fixed 0.123s per
+    read, so its timing header is deterministic.
+    """
+    ticks = itertools.count(1_700_000_000.0, 0.123)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(middlewares, "time", SimpleNamespace(time=lambda: next(ticks)))
+        return _public_app_client.get("/health")
+
+
+def _encode_multipart(files, data):
+    """Encode a multipart body once, for tests that resend it unchanged"""
+    request = httpx.Request("POST", "http://test", files=files, data=data)
+    return request.read(), {"Content-Type": request.headers["Content-Type"]}
+
+
+def _assert_error_shape(data, status_code, error):
+    """All API errors share one response structure"""
+    assert data["error"] == error
+    assert "message" in data
+    assert data["status_code"] == status_code
+    assert "request_id" in data
+    assert "timestamp" in data
+
+
+# (method, url, request kwargs, status code, error code)
+ERROR_CASES = {
+    "hidden_filename": (
+        "POST",
+        "/api/upload/single",
+        {
+            "files": {"file": HIDDEN_FILE},
+            "data": {"store": "test"},
+        },
+        400,
+        "INVALID_FILENAME",
+    ),
+    "path_traversal": (
+        "POST",
+        "/api/upload/single",
+        {
+            "files": {"file": TRAVERSAL_FILE},
+            "data": {"store": "test"},
+        },
+        400,
+        "INVALID_FILENAME",
+    ),
+    "empty_query": (
+        "POST",
+        "/api/search",
+        {"json": {"query": ""}},
+        400,
+        "EMPTY_SEARCH_QUERY",
+    ),
+    "long_query": (
+        "POST",
+        "/api/search",
+        {"json": {"query": "word " * 500}},  # 2500+ characters
+        400,
+        "INVALID_SEARCH_QUERY",
+    ),
+}
 
 
 class TestAPIIntegration:
     """Integration tests for complete API workflows"""
 
-    def test_health_check_integration(self, client):
+    def test_health_check_integration(self, health_response):
         """Test health check endpoint returns all expected fields"""
-        response = client.get("/health")
+        response = health_response
 
         assert response.status_code == 200
         data = response.json()
@@ -44,9 +152,9 @@ class TestAPIIntegration:
         assert "X-Request-ID" in response.headers
         assert response.headers["X-Request-ID"] == custom_request_id
 
-    def test_security_headers_present(self, client):
+    def test_security_headers_present(self, health_response):
         """Test that security headers are present in responses"""
-        response = client.get("/health")
+        response = health_response
 
         assert response.status_code == 200
 
@@ -63,87 +171,62 @@ class TestAPIIntegration:
 
         assert "Content-Security-Policy" in response.headers
 
-    def test_rate_limiting_upload(self, client):
+    def test_rate_limiting_upload(self, client, tight_rate_limit):
         """Test rate limiting on upload endpoint"""
-        # Create a small test file
-        test_file = ("test.txt", b"Test content", "text/plain")
+        tight_rate_limit(api.upload_single_file)
+        content, headers = _encode_multipart({"file": TEXT_FILE}, {"store": "test"})
 
-        # Make 11 requests (limit is 10/min)
+        # Make 3 requests (limit is lowered to 2/min)
         responses = []
-        for i in range(11):
+        for i in range(3):
             response = client.post(
                 "/api/upload/single",
-                files={"file": test_file},
-                data={"store": "test"},
+                content=content,
+                headers=dict(headers),
             )
             responses.append(response)
 
-        # First 10 should succeed or fail for other reasons (but not rate limit)
-        # 11th should be rate limited (429)
+        # First 2 should succeed or fail for other reasons (but not rate limit)
+        # 3rd should be rate limited (429)
+        assert all(r.status_code != 429 for r in responses[:2])
         rate_limited = any(r.status_code == 429 for r in responses)
         assert rate_limited, "Rate limiting not working for uploads"
 
-    def test_rate_limiting_search(self, client):
+    def test_rate_limiting_search(self, client, tight_rate_limit):
         """Test rate limiting on search endpoint"""
-        # Make 101 requests (limit is 100/min)
+        tight_rate_limit(api.search)
+        # Make 3 requests (limit is lowered to 2/min)
         responses = []
-        for i in range(101):
+        for i in range(3):
             response = client.post(
                 "/api/search",
                 json={"query": f"test query {i}"},
             )
             responses.append(response)
 
-        # 101st request should be rate limited
+        # 3rd request should be rate limited
+        assert all(r.status_code != 429 for r in responses[:2])
         rate_limited = any(r.status_code == 429 for r in responses)
         assert rate_limited, "Rate limiting not working for search"
 
-    def test_invalid_filename_error_response(self, client):
-        """Test error response for invalid filename"""
-        # Hidden file (starts with .)
-        response = client.post(
-            "/api/upload/single",
-            files={"file": (".hidden.txt", b"content", "text/plain")},
-            data={"store": "test"},
-        )
-
-        assert response.status_code == 400
-        data = response.json()
-
-        # Verify error response structure
-        assert "error" in data
-        assert "message" in data
-        assert "status_code" in data
-        assert data["status_code"] == 400
-        assert "request_id" in data
-        assert "timestamp" in data
-
-    def test_empty_search_query_error_response(self, client):
-        """Test error response for empty search query"""
-        response = client.post(
-            "/api/search",
-            json={"query": ""},
-        )
-
-        assert response.status_code == 400
-        data = response.json()
+    @pytest.mark.parametrize(
+        "method, url, kwargs, status_code, error",
+        list(ERROR_CASES.values()),
+        ids=list(ERROR_CASES),
+    )
+    def test_error_response(self, client, method, url, kwargs, status_code, error):
+        """Test validation errors return the shared error structure"""
+        response = client.request(method, url, **kwargs)
 
-        # Verify error response structure
-        assert "error" in data
-        assert "message" in data
-        assert "request_id" in data
+        assert response.status_code == status_code
+        _assert_error_shape(response.json(), status_code, error)
 
-    def test_response_timing_header(self, client):
+    def test_response_timing_header(self, health_response):
         """Test that response includes timing header"""
-        response = client.get("/health")
+        response = health_response
 
         assert response.status_code == 200
-        assert "X-Response-Time" in response.headers
-
-        # Verify format (e.g., "0.123s")
-        timing = response.headers["X-Response-Time"]
-        assert timing.endswith("s")
-        assert float(timing[:-1]) >= 0
+        assert response.headers["X-Response-Time"] == "0.123s"
 
     def test_metrics_endpoint_enhanced(self, client, monkeypatch):
         """Test enhanced metrics endpoint"""
@@ -192,10 +275,9 @@ class TestAPIIntegration:
     def test_upload_file_validation_integration(self, client):
         """Test complete file upload validation workflow"""
         # Test 1: Valid file
-        valid_file = ("document.txt", b"Valid content", "text/plain")
         response = client.post(
             "/api/upload/single",
-            files={"file": valid_file},
+            files={"file": VALID_FILE},
             data={"store": "test"},
         )
 
@@ -203,16 +285,6 @@ class TestAPIIntegration:
         if response.status_code != 429:  # Not rate limited
             assert response.status_code in [200, 503]  # Success or service unavailable
 
-        # Test 2: Path traversal attempt
-        malicious_file = ("../../etc/passwd", b"attack", "text/plain")
-        response = client.post(
-            "/api/upload/single",
-            files={"file": malicious_file},
-            data={"store": "test"},
-        )
-
-        assert response.status_code in [400, 429]  # Bad request or rate limited
-
     def test_search_validation_integration(self, client):
         """Test complete search validation workflow"""
         # Test 1: Valid query
@@ -225,23 +297,6 @@ class TestAPIIntegration:
         if response.status_code != 429:
             assert response.status_code in [200, 404, 503]
 
-        # Test 2: Empty query
-        response = client.post(
-            "/api/search",
-            json={"query": ""},
-        )
-
-        assert response.status_code in [400, 422, 429]
-
-        # Test 3: Too long query
-        long_query = "word " * 500  # 2500+ characters
-        response = client.post(
-            "/api/search",
-            json={"query": long_query},
-        )
-
-        assert response.status_code in [400, 422, 429]
-
     def test_stores_management_workflow(self, client):
         """Test complete store management workflow"""
         # List stores
@@ -255,47 +310,11 @@ class TestAPIIntegration:
                 assert "count" in data
                 assert "request_id" in data
 
-    def test_error_response_consistency(self, client):
-        """Test that all error responses follow same structure"""
-        # Test various error scenarios
-        test_cases = [
-            # (endpoint, method, data, files)
-            (
-                "/api/upload/single",
-                "POST",
-                {"store": "test"},
-                {"file": (".hidden.txt", b"x", "text/plain")},
-            ),
-            ("/api/search", "POST", {"query": ""}, None),
-        ]
-
-        for endpoint, method, data, files in test_cases:
-            if method == "POST":
-                if files:
-                    response = client.post(endpoint, files=files, data=data)
-                else:
-                    response = client.post(endpoint, json=data)
-
-                # All errors should have consistent structure
-                if 400 <= response.status_code < 500:
-                    error_data = response.json()
-                    assert "error" in error_data or "status" in error_data
-                    assert "message" in error_data or "detail" in error_data
-                    assert (
-                        "request_id" in error_data or "X-Request-ID" in response.headers
-                    )
-
     def test_multiple_upload_workflow(self, client):
         """Test multiple file upload workflow"""
-        files = [
-            ("files", ("file1.txt", b"content1", "text/plain")),
-            ("files", ("file2.txt", b"content2", "text/plain")),
-            ("files", ("file3.txt", b"content3", "text/plain")),
-        ]
-
         response = client.post(
             "/api/upload/multiple",
-            files=files,
+            files=MULTIPLE_FILES,
             data={"store": "test"},
         )
 
@@ -311,68 +330,76 @@ class TestAPIIntegration:
             assert "failed" in data
             assert "request_id" in data
 
-    def test_cors_headers(self, client):
-        """Test CORS headers are set"""
-        response = client.options(
-            "/api/search",
-            headers={
-                "Origin": "http://localhost:3000",
-                "Access-Control-Request-Method": "POST",
-            },
+    @pytest.mark.asyncio
+    async def test_cors_headers(self):
+        """Test CORS middleware is mounted and answers preflight itself"""
+        assert any(m.cls is CORSHeadersMiddleware for m in api.app.user_middleware)
+
+        request = Request(
+            {
+                "type": "http",
+                "method": "OPTIONS",
+                "path": "/api/search",
+                "headers": [
+                    (b"origin", b"http://localhost:3000"),
+                    (b"access-control-request-method", b"POST"),
+                ],
+                "query_string": b"",
+            }
         )
 
+        async def call_next(request):
+            raise AssertionError("preflight must not reach the routes")
+
+        middleware = CORSHeadersMiddleware(api.app)
+        response = await middleware.dispatch(request, call_next)
+
         # Should have CORS headers
-        assert response.status_code in [200, 204]
+        assert response.status_code == 204
+        assert response.headers["Access-Control-Allow-Origin"] == "*"
+        assert "POST" in response.headers["Access-Control-Allow-Methods"]
 
-    def test_api_versioning_in_responses(self, client):
+    @pytest.mark.asyncio
+    async def test_api_versioning_in_responses(self):
         """Test that API version is consistently reported"""
-        # Health check
-        response = client.get("/health")
-        if response.status_code == 200:
-            assert response.json()["version"] == "1.4.2"
-
-        # Root endpoint
-        response = client.get("/")
-        if response.status_code == 200:
-            assert response.json()["version"] == "1.4.2"
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            # Health check and root endpoint, fetched concurrently
+            responses = await asyncio.gather(client.get("/health"), client.get("/"))
+
+        for response in responses:
+            if response.status_code == 200:
+                assert response.json()["version"] == "1.4.2"
 
 
 class TestAPIPerformance:
     """Performance tests for API endpoints"""
 
     @pytest.mark.slow
-    def test_health_check_performance(self, client):
+    @pytest.mark.skipif(not HAS_BENCHMARK, reason="pytest-benchmark not installed")
+    def test_health_check_performance(self, client, benchmark):
         """Test health check responds within target time"""
-        import time
-
-        iterations = 10
-        total_time = 0
-
-        for _ in range(iterations):
-            start = time.time()
-            response = client.get("/health")
-            elapsed = time.time() - start
-            total_time += elapsed
-
-            assert response.status_code == 200
-
-        avg_time = total_time / iterations
-        print(f"\nAverage health check time: {avg_time:.4f}s")
+        response = benchmark.pedantic(
+            client.get, args=("/health",), iterations=10, rounds=5, warmup_rounds=2
+        )
+        assert response.status_code == 200
 
-        # Should be fast (<100ms average)
-        assert avg_time < 0.1, f"Health check too slow: {avg_time:.3f}s"
+        # Should be fast (<100ms average); no stats under --benchmark-disable
+        if benchmark.stats is not None:
+            avg_time = benchmark.stats.stats.mean
+            assert avg_time < 0.1, f"Health check too slow: {avg_time:.3f}s"
 
     @pytest.mark.slow
-    def test_concurrent_health_checks(self, client):
+    @pytest.mark.asyncio
+    async def test_concurrent_health_checks(self):
         """Test health check under concurrent load"""
-        import concurrent.futures
-
-        def make_request():
-            return client.get("/health")
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            futures = [executor.submit(make_request) for _ in range(20)]
-            results = [f.result() for f in concurrent.futures.as_completed(futures)]
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            results = await asyncio.gather(*(client.get("/health") for _ in range(20)))
 
         # All should succeed
         assert all(r.status_code == 200 for r in results)
@@ -29,7 +29,7 @@ import flamehaven_filesearch.auth as auth_module
 
 
 @pytest.fixture
-def temp_db(tmp_path):
+def auth_db_path(tmp_path):
     db_path = str(tmp_path / "test_auth.db")
     yield db_path
     try:
@@ -39,8 +39,8 @@ def temp_db(tmp_path):
 
 
 @pytest.fixture
-def manager(temp_db):
-    mgr = APIKeyManager(db_path=temp_db)
+def manager(auth_db_path):
+    mgr = APIKeyManager(db_path=auth_db_path)
     return mgr
 
 
@@ -74,13 +74,21 @@ class TestAPIKeyInfo:
 
 
 class TestAPIKeyManagerInit:
-    def test_db_created(self, temp_db):
-        mgr = APIKeyManager(db_path=temp_db)
-        assert Path(temp_db).exists()
-
-    def test_tables_created(self, temp_db):
-        mgr = APIKeyManager(db_path=temp_db)
-        with sqlite3.connect(temp_db) as conn:
+    def test_db_created(self, auth_db_path):
+        mgr = APIKeyManager(db_path=auth_db_path)
+        assert Path(auth_db_path).exists()
+
+    def test_uri_db_path(self):
+        uri = f"file:auth_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        with sqlite3.connect(uri, uri=True):
+            mgr = APIKeyManager(db_path=uri)
+            key_id, plain_key = mgr.generate_key(user_id="u1", name="mem")
+            assert mgr.validate_key(plain_key).id == key_id
+        assert not Path(uri).exists()
+
+    def test_tables_created(self, auth_db_path):
+        mgr = APIKeyManager(db_path=auth_db_path)
+        with sqlite3.connect(auth_db_path) as conn:
             tables = conn.execute(
                 "SELECT name FROM sqlite_master WHERE type='table'"
             ).fetchall()
@@ -238,19 +246,19 @@ class TestLogUsage:
 
 
 class TestBootstrapApiKey:
-    def test_bootstrap_inserts_new_key(self, temp_db):
-        # Reset singleton so a fresh manager uses temp_db
+    def test_bootstrap_inserts_new_key(self, auth_db_path):
+        # Reset singleton so a fresh manager uses auth_db_path
         original = auth_module._key_manager
-        auth_module._key_manager = APIKeyManager(db_path=temp_db)
+        auth_module._key_manager = APIKeyManager(db_path=auth_db_path)
         try:
             result = bootstrap_api_key("sk_live_testbootstrapkey123456")
             assert result is True
         finally:
             auth_module._key_manager = original
 
-    def test_bootstrap_no_duplicate(self, temp_db):
+    def test_bootstrap_no_duplicate(self, auth_db_path):
         original = auth_module._key_manager
-        auth_module._key_manager = APIKeyManager(db_path=temp_db)
+        auth_module._key_manager = APIKeyManager(db_path=auth_db_path)
         try:
             plain_key = "sk_live_uniquekey987654321abcde"
             r1 = bootstrap_api_key(plain_key)
@@ -279,10 +287,10 @@ class TestNullIAMProvider:
 
 
 class TestGetKeyManager:
-    def test_singleton_returns_same(self, temp_db, monkeypatch):
-        monkeypatch.setenv("FLAMEHAVEN_API_KEYS_DB", temp_db)
+    def test_singleton_returns_same(self, auth_db_path, monkeypatch):
+        monkeypatch.setenv("FLAMEHAVEN_API_KEYS_DB", auth_db_path)
         auth_module._key_manager = None
-        mgr1 = get_key_manager(temp_db)
-        mgr2 = get_key_manager(temp_db)
+        mgr1 = get_key_manager(auth_db_path)
+        mgr2 = get_key_manager(auth_db_path)
         assert mgr1 is mgr2
         auth_module._key_manager = None
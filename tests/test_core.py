@@ -55,6 +55,65 @@ class TestConfig:
         assert config_dict["max_file_size_mb"] == 50
         assert "default_model" in config_dict
 
+    def test_config_to_dict_is_reused_until_field_changes(self, monkeypatch):
+        """to_dict is built once and rebuilt only after a field assignment"""
+        config = Config(api_key="test-key")
+        builds = []
+        original = Config._build_dict
+
+        def counting_build(self):
+            builds.append(1)
+            return original(self)
+
+        monkeypatch.setattr(Config, "_build_dict", counting_build)
+        first = config.to_dict()
+        first["max_file_size_mb"] = -1
+        assert config.to_dict()["max_file_size_mb"] == 50
+        assert len(builds) == 1
+
+        config.max_file_size_mb = 75
+        assert config.to_dict()["max_file_size_mb"] == 75
+        assert len(builds) == 2
+
+    def test_default_config_is_cached_until_reload(self, monkeypatch):
+        """get_default_config parses env once; reload_config re-reads it"""
+        from flamehaven_filesearch.config import get_default_config, reload_config
+
+        monkeypatch.setenv("MAX_SOURCES", "3")
+        first = reload_config()
+        monkeypatch.setenv("MAX_SOURCES", "7")
+        assert get_default_config() is first
+        assert get_default_config().max_sources == 3
+        assert reload_config().max_sources == 7
+        get_default_config.cache_clear()
+
+    def test_find_banned_term_case_insensitive(self):
+        """Banned terms match regardless of case and report the configured term"""
+        config = Config(api_key="test-key", banned_terms=["PII-leak", "secret+"])
+        assert config.find_banned_term("this has a pii-LEAK inside") == "PII-leak"
+        assert config.find_banned_term("regex chars: SECRET+ ok") == "secret+"
+        assert config.find_banned_term("clean answer") is None
+
+    def test_find_banned_term_follows_updates(self):
+        """Reassigning banned_terms takes effect without rebuilding Config"""
+        config = Config(api_key="test-key", banned_terms=[])
+        assert config.find_banned_term("anything") is None
+        config.banned_terms = ["anything"]
+        assert config.find_banned_term("Anything goes") == "anything"
+
+    def test_find_banned_term_precomputed(self, monkeypatch):
+        """The matcher is resolved at assignment, not on every lookup"""
+        import flamehaven_filesearch.config as config_module
+
+        config = Config(api_key="test-key", banned_terms=["PII-leak"])
+        monkeypatch.setattr(
+            config_module,
+            "_compile_banned_terms",
+            lambda terms: pytest.fail("matcher rebuilt per lookup"),
+        )
+        for _ in range(3):
+            assert config.find_banned_term("pii-leak here") == "PII-leak"
+
 
 class TestFlamehavenFileSearch:
     """Test FLAMEHAVEN FileSearch class"""
@@ -161,16 +220,14 @@ class TestFlamehavenFileSearch:
 
 # Integration tests (require actual API key)
 @pytest.mark.integration
+@pytest.mark.skipif(not os.getenv("GEMINI_API_KEY"), reason="GEMINI_API_KEY not set")
 class TestFlamehavenFileSearchIntegration:
     """Integration tests requiring actual API key"""
 
     @pytest.fixture
     def searcher(self):
         """Create searcher with real API key"""
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            pytest.skip("GEMINI_API_KEY not set")
-        return FlamehavenFileSearch(api_key=api_key)
+        return FlamehavenFileSearch(api_key=os.environ["GEMINI_API_KEY"])
 
     @pytest.fixture
     def sample_file(self, tmp_path):
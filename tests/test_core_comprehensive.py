@@ -87,10 +87,19 @@ class TestStoreManagement:
         assert "alpha" in stores
         assert "beta" in stores
 
-    def test_list_stores_returns_copy(self, fs):
+    def test_list_stores_is_read_only_snapshot(self, fs):
         stores = fs.list_stores()
+        with pytest.raises(TypeError):
+            stores["fake"] = "modified"
+        fs.create_store("later")
+        assert "later" not in stores
+        assert "later" in fs.list_stores()
+
+    def test_stores_snapshot_returns_copy(self, fs):
+        stores = fs.stores_snapshot()
         stores["fake"] = "modified"
         assert "fake" not in fs.stores
+        assert "fake" not in fs.list_stores()
 
     def test_delete_store_success(self, fs):
         fs.create_store("todel")
@@ -158,6 +167,45 @@ class TestGetMetrics:
         assert "backend" in metrics["vector_store"]
 
 
+# ---------------------------------------------------------------------------
+# search_batch
+# ---------------------------------------------------------------------------
+
+
+class TestSearchBatch:
+    def test_results_follow_input_order_and_repeats_run_once(self, fs, monkeypatch):
+        calls = []
+
+        def fake_search(query, **kwargs):
+            calls.append(query)
+            return {"status": "success", "query": query}
+
+        monkeypatch.setattr(fs, "search", fake_search)
+        results = fs.search_batch(["a", "b", "a"])
+        assert [r["query"] for r in results] == ["a", "b", "a"]
+        assert calls == ["a", "b"]
+        assert results[0] is not results[2]
+
+    def test_remote_queries_run_concurrently(self, fs, monkeypatch):
+        import threading
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_search(query, **kwargs):
+            barrier.wait()  # deadlocks unless all three run in parallel
+            return {"status": "success", "query": query}
+
+        fs._use_native_client = True
+        monkeypatch.setattr(fs, "search", fake_search)
+        results = fs.search_batch(["x", "y", "z"])
+        assert [r["query"] for r in results] == ["x", "y", "z"]
+
+    def test_local_batch_end_to_end(self, fs):
+        results = fs.search_batch(["anything", "else"])
+        assert len(results) == 2
+        assert all("status" in r for r in results)
+
+
 # ---------------------------------------------------------------------------
 # _resolve_vector_backend
 # ---------------------------------------------------------------------------
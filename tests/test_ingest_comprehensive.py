@@ -277,6 +277,65 @@ class TestUploadFile:
         searcher.upload_file(str(f))
         assert "default" in searcher._bm25_dirty
 
+    def test_remote_poll_uses_capped_backoff(self, searcher, tmp_path, monkeypatch):
+        from types import SimpleNamespace
+
+        import flamehaven_filesearch._ingest as ingest_module
+
+        polls = iter([False, False, False, False, True])
+        sleeps = []
+        op = SimpleNamespace(done=False)
+
+        def poll(_op):
+            return SimpleNamespace(done=next(polls))
+
+        searcher._use_native_client = True
+        searcher.client = SimpleNamespace(
+            file_search_stores=SimpleNamespace(
+                upload_to_file_search_store=lambda **kwargs: op
+            ),
+            operations=SimpleNamespace(get=poll),
+        )
+        searcher.config.upload_poll_initial_sec = 0.25
+        searcher.config.upload_poll_max_sec = 1.0
+        monkeypatch.setattr(ingest_module.time, "sleep", sleeps.append)
+
+        f = tmp_path / "remote.txt"
+        f.write_text("remote content")
+        result = searcher.upload_file(str(f))
+        assert result["status"] == "success"
+        assert sleeps == [0.25, 0.5, 1.0, 1.0, 1.0]
+
+    def test_remote_identical_bytes_uploaded_once(self, searcher, tmp_path):
+        from types import SimpleNamespace
+
+        uploads = []
+
+        def upload(**kwargs):
+            uploads.append(kwargs["file"])
+            return SimpleNamespace(done=True)
+
+        searcher._use_native_client = True
+        searcher.client = SimpleNamespace(
+            file_search_stores=SimpleNamespace(
+                upload_to_file_search_store=upload,
+                create=lambda: SimpleNamespace(name="stores/other"),
+            )
+        )
+
+        first = tmp_path / "a.txt"
+        second = tmp_path / "b.txt"
+        first.write_text("same bytes")
+        second.write_text("same bytes")
+        assert searcher.upload_file(str(first))["indexed"] is True
+        repeat = searcher.upload_file(str(second))
+        assert repeat["deduplicated"] is True
+        assert repeat["existing_file"] == str(first)
+        assert uploads == [str(first)]
+
+        searcher.upload_file(str(second), store_name="other")
+        assert uploads == [str(first), str(second)]
+
 
 # ---------------------------------------------------------------------------
 # upload_files (batch)
@@ -305,6 +364,23 @@ class TestUploadFiles:
         assert result["success"] == 1
         assert result["failed"] == 1
 
+    def test_remote_batch_runs_concurrently(self, searcher, monkeypatch):
+        import threading
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_upload(fp, store_name="default"):
+            barrier.wait()  # deadlocks unless all three run in parallel
+            return {"status": "success", "file": fp}
+
+        searcher._use_native_client = True
+        monkeypatch.setattr(searcher, "upload_file", fake_upload)
+        files = ["a.pdf", "b.pdf", "c.pdf"]
+        result = searcher.upload_files(files)
+        assert result["success"] == 3
+        assert [r["file"] for r in result["results"]] == files
+        assert [r["result"]["file"] for r in result["results"]] == files
+
 
 # ---------------------------------------------------------------------------
 # _local_upload
@@ -128,6 +128,26 @@ def test_flamehaven_remote_client_flow(monkeypatch, tmp_path):
     assert delete_result["status"] == "success"
 
 
+def test_grounding_sources_capped_at_max_sources():
+    searcher = core_module.FlamehavenFileSearch(allow_offline=True)
+    searcher.config.max_sources = 2
+    chunks = [
+        SimpleNamespace(
+            retrieved_context=SimpleNamespace(title=f"Doc {i}", uri=f"mem://{i}")
+        )
+        for i in range(10)
+    ]
+    response = SimpleNamespace(
+        candidates=[
+            SimpleNamespace(grounding_metadata=SimpleNamespace(grounding_chunks=chunks))
+        ]
+    )
+    assert searcher._extract_grounding_sources(response) == [
+        {"title": "Doc 0", "uri": "mem://0"},
+        {"title": "Doc 1", "uri": "mem://1"},
+    ]
+
+
 def test_cli_help_output(monkeypatch, capsys):
     monkeypatch.setenv("GEMINI_API_KEY", "dummy-key")
     monkeypatch.setattr(sys, "argv", ["flamehaven-api", "--help"])
@@ -117,7 +117,25 @@ class TestPillowVisionModal:
 
         modal = PillowVisionModal()
         result = modal.describe_image(image_bytes, VisionStrategy.DETAIL)
-        assert "avg_rgb" in result
+        assert "avg_rgb=100,150,200" in result
+
+    def test_pillow_modal_detail_jpeg_reports_original_size(self):
+        try:
+            from PIL import Image as PILImage
+        except ImportError:
+            pytest.skip("Pillow not installed")
+        from flamehaven_filesearch.multimodal import PillowVisionModal
+        from io import BytesIO
+
+        img = PILImage.new("RGB", (640, 480), color=(10, 200, 30))
+        buf = BytesIO()
+        img.save(buf, format="JPEG")
+
+        modal = PillowVisionModal()
+        result = modal.describe_image(buf.getvalue(), VisionStrategy.DETAIL)
+        assert "Image 640x480" in result
+        r, g, b = (int(v) for v in result.split("avg_rgb=")[1].split(","))
+        assert abs(r - 10) <= 3 and abs(g - 200) <= 3 and abs(b - 30) <= 3
 
     def test_pillow_raises_without_pillow(self, monkeypatch):
         import builtins
@@ -134,6 +152,68 @@ class TestPillowVisionModal:
             PillowVisionModal()
 
 
+# ---------------------------------------------------------------------------
+# TesseractVisionModal (pytesseract stubbed, Pillow required)
+# ---------------------------------------------------------------------------
+
+
+class TestTesseractVisionModal:
+    def _modal(self, fake_tesseract, max_dim=1200):
+        pil = pytest.importorskip("PIL.Image")
+        from flamehaven_filesearch.multimodal import TesseractVisionModal
+
+        modal = TesseractVisionModal.__new__(TesseractVisionModal)
+        modal._image = pil
+        modal._tesseract = fake_tesseract
+        modal.max_dim = max_dim
+        return modal
+
+    @staticmethod
+    def _png(size):
+        from io import BytesIO
+        from PIL import Image as PILImage
+
+        buf = BytesIO()
+        PILImage.new("RGB", size, color=(255, 255, 255)).save(buf, format="PNG")
+        return buf.getvalue()
+
+    def test_fast_downscales_to_greyscale(self):
+        seen = {}
+
+        class FakeTesseract:
+            @staticmethod
+            def image_to_string(image, config=None):
+                seen["size"], seen["mode"], seen["config"] = (
+                    image.size,
+                    image.mode,
+                    config,
+                )
+                return "  hello  "
+
+        modal = self._modal(FakeTesseract, max_dim=100)
+        result = modal.describe_image(self._png((400, 200)), VisionStrategy.FAST)
+        assert result == "hello"
+        assert seen == {"size": (100, 50), "mode": "L", "config": "--oem 1 --psm 6"}
+
+    def test_detail_drops_low_confidence_words(self):
+        class FakeTesseract:
+            Output = type("Output", (), {"DICT": "dict"})
+
+            @staticmethod
+            def image_to_data(image, output_type=None):
+                return {
+                    "text": ["Total", "x#", "", "42", "EUR"],
+                    "conf": ["96", "12", "-1", "91", "88"],
+                    "block_num": [1, 1, 1, 1, 1],
+                    "par_num": [1, 1, 1, 1, 1],
+                    "line_num": [1, 1, 1, 2, 2],
+                }
+
+        modal = self._modal(FakeTesseract)
+        result = modal.describe_image(self._png((30, 20)), VisionStrategy.DETAIL)
+        assert result == "Total\n42 EUR\nImage 30x20"
+
+
 # ---------------------------------------------------------------------------
 # MultimodalProcessor
 # ---------------------------------------------------------------------------
@@ -0,0 +1,175 @@
+"""
+Tests for the Gemini response cache (engine/response_cache.py).
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import flamehaven_filesearch._search_cloud as _search_cloud_module
+from flamehaven_filesearch import core as core_module
+from flamehaven_filesearch.engine.response_cache import ResponseCache
+
+ANSWER = {"answer": "cached", "sources": [{"title": "Doc", "uri": "mem://doc"}]}
+
+
+class TestExactTier:
+    def test_hit_after_set(self):
+        cache = ResponseCache()
+        cache.set("s", "m", "what is x", 512, 0.5, ANSWER)
+        assert cache.get("s", "m", "what is x", 512, 0.5) == ANSWER
+        assert cache.get_stats()["hits"] == 1
+
+    def test_params_are_part_of_key(self):
+        cache = ResponseCache()
+        cache.set("s", "m", "q", 512, 0.5, ANSWER)
+        assert cache.get("s", "m", "q", 256, 0.5) is None
+        assert cache.get("s", "other", "q", 512, 0.5) is None
+        assert cache.get("t", "m", "q", 512, 0.5) is None
+
+    def test_ttl_expiry(self, monkeypatch):
+        import flamehaven_filesearch.engine.response_cache as rc
+
+        now = [100.0]
+        monkeypatch.setattr(rc.time, "monotonic", lambda: now[0])
+        cache = ResponseCache(ttl_sec=10)
+        cache.set("s", "m", "q", 512, 0.5, ANSWER)
+        now[0] = 111.0
+        assert cache.get("s", "m", "q", 512, 0.5) is None
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(maxsize=2)
+        for q in ("a", "b", "c"):
+            cache.set("s", "m", q, 512, 0.5, {"answer": q, "sources": []})
+        assert cache.get("s", "m", "a", 512, 0.5) is None
+        assert cache.get("s", "m", "c", 512, 0.5)["answer"] == "c"
+
+    def test_invalidate_store(self):
+        cache = ResponseCache()
+        cache.set("s", "m", "q", 512, 0.5, ANSWER)
+        cache.set("t", "m", "q", 512, 0.5, ANSWER)
+        cache.invalidate("s")
+        assert cache.get("s", "m", "q", 512, 0.5) is None
+        assert cache.get("t", "m", "q", 512, 0.5) == ANSWER
+
+
+class TestSemanticTier:
+    def test_disabled_by_default(self):
+        cache = ResponseCache()
+        assert cache.semantic_enabled is False
+        cache.set("s", "m", "q1", 512, 0.5, ANSWER, query_vec=[1.0, 0.0])
+        assert cache.get("s", "m", "q2", 512, 0.5, query_vec=[1.0, 0.0]) is None
+
+    def test_similar_query_hits(self):
+        cache = ResponseCache(semantic_threshold=0.9)
+        cache.set("s", "m", "q1", 512, 0.5, ANSWER, query_vec=np.array([1.0, 0.1]))
+        assert cache.get("s", "m", "q2", 512, 0.5, query_vec=[1.0, 0.12]) == ANSWER
+        assert cache.get_stats()["semantic_hits"] == 1
+
+    def test_dissimilar_query_misses(self):
+        cache = ResponseCache(semantic_threshold=0.9)
+        cache.set("s", "m", "q1", 512, 0.5, ANSWER, query_vec=[1.0, 0.0])
+        assert cache.get("s", "m", "q2", 512, 0.5, query_vec=[0.0, 1.0]) is None
+
+    def test_serves_the_nearest_stored_answer(self, mock_embedding_factory):
+        cache = ResponseCache(semantic_threshold=0.9)
+        vecs = [mock_embedding_factory() for _ in range(5)]
+        for i, vec in enumerate(vecs):
+            cache.set("s", "m", f"q{i}", 512, 0.5, {"answer": i}, query_vec=vec)
+        hit = cache.get("s", "m", "rephrased", 512, 0.5, query_vec=vecs[3])
+        assert hit == {"answer": 3}
+        miss = mock_embedding_factory()
+        assert cache.get("s", "m", "other", 512, 0.5, query_vec=miss) is None
+
+    def test_invalidated_rows_are_not_served(self):
+        cache = ResponseCache(semantic_threshold=0.9)
+        cache.set("s", "m", "q1", 512, 0.5, ANSWER, query_vec=[1.0, 0.0])
+        cache.invalidate("s")
+        assert cache.get("s", "m", "q2", 512, 0.5, query_vec=[1.0, 0.0]) is None
+
+
+@pytest.fixture
+def remote_searcher(monkeypatch):
+    calls = []
+
+    class FakeModels:
+        def generate_content(self, model, contents, config):
+            calls.append(contents)
+            chunk = SimpleNamespace(
+                retrieved_context=SimpleNamespace(title="Doc", uri="mem://doc")
+            )
+            candidate = SimpleNamespace(
+                grounding_metadata=SimpleNamespace(grounding_chunks=[chunk])
+            )
+            return SimpleNamespace(text="Remote answer", candidates=[candidate])
+
+    class FakeClient:
+        def __init__(self, api_key):
+            self.file_search_stores = SimpleNamespace(
+                create=lambda: SimpleNamespace(name="stores/alpha")
+            )
+            self.models = FakeModels()
+
+    fake_types = SimpleNamespace(
+        GenerateContentConfig=lambda *args, **kwargs: SimpleNamespace(),
+        Tool=lambda file_search=None: SimpleNamespace(),
+        FileSearch=lambda file_search_store_names=None: SimpleNamespace(),
+    )
+    monkeypatch.setattr(
+        core_module, "google_genai", SimpleNamespace(Client=FakeClient), raising=False
+    )
+    monkeypatch.setattr(
+        _search_cloud_module, "_google_genai_types", fake_types, raising=False
+    )
+
+    searcher = core_module.FlamehavenFileSearch(api_key="remote")
+    searcher.create_store("alpha")
+    return searcher, calls
+
+
+def test_search_serves_repeat_query_from_cache(remote_searcher):
+    searcher, calls = remote_searcher
+    first = searcher.search("systems overview", store_name="alpha")
+    second = searcher.search("systems overview", store_name="alpha")
+    assert first["answer"] == second["answer"] == "Remote answer"
+    assert len(calls) == 1
+    assert searcher.get_metrics()["response_cache"]["hits"] == 1
+
+
+def test_search_cache_can_be_disabled(remote_searcher):
+    searcher, calls = remote_searcher
+    searcher._response_cache = None
+    searcher.search("systems overview", store_name="alpha")
+    searcher.search("systems overview", store_name="alpha")
+    assert len(calls) == 2
+
+
+def test_exact_hit_skips_embedding(remote_searcher, monkeypatch):
+    searcher, calls = remote_searcher
+    searcher._response_cache = ResponseCache(semantic_threshold=0.9)
+    embeds = []
+    generate = searcher.embedding_generator.generate
+    monkeypatch.setattr(
+        searcher.embedding_generator,
+        "generate",
+        lambda text: embeds.append(text) or generate(text),
+    )
+    searcher.search("systems overview", store_name="alpha")
+    searcher.search("systems overview", store_name="alpha")
+    assert len(calls) == 1
+    assert len(embeds) == 1  # only to store the first answer's vector
+
+
+def test_semantic_search_reuses_its_query_vector(remote_searcher, monkeypatch):
+    searcher, _ = remote_searcher
+    searcher._response_cache = ResponseCache(semantic_threshold=0.9)
+    embeds = []
+    generate = searcher.embedding_generator.generate
+    monkeypatch.setattr(
+        searcher.embedding_generator,
+        "generate",
+        lambda text: embeds.append(text) or generate(text),
+    )
+    searcher.search("systems overview", store_name="alpha", search_mode="semantic")
+    assert len(embeds) == 1
@@ -405,7 +405,7 @@ class TestAPIIntegration:
     """Test API endpoints with search_mode"""
 
     @pytest.mark.asyncio
-    async def test_search_request_with_search_mode(self, client):
+    async def test_search_request_with_search_mode(self, semantic_client):
         """Verify API accepts search_mode parameter"""
         from flamehaven_filesearch.api import SearchRequest
 
@@ -414,9 +414,9 @@ class TestAPIIntegration:
         assert request.search_mode == "semantic"
 
     @pytest.mark.asyncio
-    async def test_search_endpoint_semantic_mode(self, client, api_key):
+    async def test_search_endpoint_semantic_mode(self, semantic_client, api_key):
         """Verify /api/search endpoint supports semantic mode"""
-        response = client.post(
+        response = semantic_client.post(
             "/api/search",
             json={
                 "query": "test query",
@@ -438,11 +438,11 @@ class TestAPIIntegration:
 
     @pytest.mark.asyncio
     async def test_metrics_endpoint_includes_new_engine_stats(
-        self, client, api_key, monkeypatch
+        self, semantic_client, api_key, monkeypatch
     ):
         """Verify /metrics endpoint includes Chronos, IntentRefiner, Gravitas, Embedding stats"""  # noqa: E501
         monkeypatch.setenv("FLAMEHAVEN_METRICS_ENABLED", "1")
-        response = client.get("/metrics", headers={"X-API-Key": api_key})
+        response = semantic_client.get("/metrics", headers={"X-API-Key": api_key})
         assert response.status_code == 200
         data = response.json()
 
@@ -531,7 +531,7 @@ class TestEndToEndSemanticSearch:
 
 # Fixtures
 @pytest.fixture
-def client(mock_searcher_for_api):
+def semantic_client(mock_searcher_for_api):
     """Fixture for FastAPI test client, now using the mocked searcher"""
     from fastapi.testclient import TestClient
 
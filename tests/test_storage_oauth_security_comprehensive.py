@@ -2,6 +2,8 @@
 Comprehensive tests for storage.py, oauth.py, and security.py.
 """
 
+from collections import OrderedDict
+
 import pytest
 
 from flamehaven_filesearch.storage import (
@@ -318,6 +320,69 @@ class TestValidateOAuthToken:
         assert result is not None
         assert result.subject == "fallback_user"
 
+    def test_jwks_signing_key_cached_by_kid(self, monkeypatch):
+        import jwt as pyjwt
+        from cryptography.hazmat.primitives.asymmetric import rsa
+
+        import flamehaven_filesearch.oauth as oauth_module
+
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        token = pyjwt.encode(
+            {"sub": "rs-user"}, private_key, algorithm="RS256", headers={"kid": "k1"}
+        )
+        lookups = []
+
+        class FakeJWKSClient:
+            def get_signing_key_from_jwt(self, jwt_token):
+                lookups.append(jwt_token)
+                return type("Key", (), {"key": private_key.public_key()})()
+
+        monkeypatch.setattr(oauth_module, "_signing_key_cache", OrderedDict())
+        monkeypatch.setattr(
+            oauth_module, "_get_jwks_client", lambda url, lifespan: FakeJWKSClient()
+        )
+
+        cfg = Config.__new__(Config)
+        cfg.oauth_enabled = True
+        cfg.oauth_jwt_secret = None
+        cfg.oauth_jwks_url = "https://idp.example/jwks"
+        cfg.oauth_audience = None
+        cfg.oauth_issuer = None
+        cfg.oauth_cache_ttl_sec = 300
+        for _ in range(3):
+            result = validate_oauth_token(token, config=cfg)
+            assert result.subject == "rs-user"
+        assert len(lookups) == 1
+
+    def test_signing_key_cache_evicts_least_recently_used(self, monkeypatch):
+        import flamehaven_filesearch.oauth as oauth_module
+
+        lookups = []
+
+        class FakeJWKSClient:
+            def get_signing_key_from_jwt(self, jwt_token):
+                lookups.append(jwt_token)
+                return type("Key", (), {"key": jwt_token})()
+
+        monkeypatch.setattr(oauth_module, "_signing_key_cache", OrderedDict())
+        monkeypatch.setattr(oauth_module, "_MAX_CACHED_SIGNING_KEYS", 2)
+        monkeypatch.setattr(
+            oauth_module, "_get_jwks_client", lambda url, lifespan: FakeJWKSClient()
+        )
+        monkeypatch.setattr(
+            oauth_module.jwt,
+            "get_unverified_header",
+            lambda token: {"kid": token},
+        )
+
+        url = "https://idp.example/jwks"
+        for kid in ("k1", "k2", "k1", "k3"):
+            oauth_module._get_signing_key(kid, url, 300)
+        assert list(oauth_module._signing_key_cache) == [(url, "k1"), (url, "k3")]
+
+        oauth_module._get_signing_key("k1", url, 300)
+        assert lookups == ["k1", "k2", "k3"]
+
 
 # ===========================================================================
 # security.py
@@ -8,9 +8,10 @@ import pytest
 
 from flamehaven_filesearch.usage_middleware import (
     _collect_exceeded_quotas,
+    _content_length,
     UsageTrackingMiddleware,
 )
-
+from flamehaven_filesearch.usage_tracker import QuotaConfig, QuotaStatus
 
 # ---------------------------------------------------------------------------
 # _collect_exceeded_quotas (pure helper)
@@ -72,6 +73,22 @@ class TestCollectExceededQuotas:
         assert len(result) == 1
 
 
+# ---------------------------------------------------------------------------
+# _content_length (pure helper)
+# ---------------------------------------------------------------------------
+
+
+class TestContentLength:
+    def test_reads_raw_header(self):
+        headers = [(b"content-type", b"text/plain"), (b"content-length", b"1234")]
+        assert _content_length(headers) == 1234
+
+    def test_absent_or_malformed_is_none(self):
+        assert _content_length([]) is None
+        assert _content_length([(b"content-length", b"-5")]) is None
+        assert _content_length([(b"content-length", b"12abc")]) is None
+
+
 # ---------------------------------------------------------------------------
 # UsageTrackingMiddleware
 # ---------------------------------------------------------------------------
@@ -129,3 +146,124 @@ class TestUsageTrackingMiddlewareDisabled:
         # No API key in headers; should pass through (no tracking)
         resp = client.get("/api/search")
         assert resp.status_code == 200
+
+
+class _FakeTracker:
+    def __init__(self, headroom=True):
+        self.headroom = headroom
+        self.records = []
+
+    def has_quota_headroom(self, api_key_id):
+        return self.headroom
+
+    def get_global_quota_status(self):
+        return QuotaStatus(QuotaConfig(), (0, 0, 0, 0))
+
+    def get_quota_status(self, api_key_id):
+        return QuotaStatus(QuotaConfig(daily_requests=5), (5, 0, 5, 0))
+
+    def record_usage(self, record):
+        self.records.append(record)
+
+
+def _tracked_client(monkeypatch, tracker, endpoint):
+    from types import SimpleNamespace
+
+    from starlette.applications import Starlette
+    from starlette.routing import Route
+    from starlette.testclient import TestClient
+
+    from flamehaven_filesearch import usage_middleware
+    from flamehaven_filesearch.security import REQUEST_CONTEXT_KEY
+
+    monkeypatch.setattr(usage_middleware, "get_usage_tracker", lambda: tracker)
+    inner = Starlette(routes=[Route("/api/search", endpoint, methods=["POST"])])
+    middleware = UsageTrackingMiddleware(inner, enabled=True)
+
+    async def app(scope, receive, send):
+        # Stand-in for the auth layer that fills request.state
+        context = SimpleNamespace(api_key_id="key1")
+        scope.setdefault("state", {})[REQUEST_CONTEXT_KEY] = context
+        await middleware(scope, receive, send)
+
+    return TestClient(app)
+
+
+class TestUsageTrackingMiddlewareTracking:
+    def test_records_status_and_sizes(self, monkeypatch):
+        from starlette.responses import PlainTextResponse
+
+        async def search(request):
+            return PlainTextResponse("x" * 40, status_code=201)
+
+        tracker = _FakeTracker()
+        client = _tracked_client(monkeypatch, tracker, search)
+        resp = client.post("/api/search", content=b"q" * 20)
+        assert resp.status_code == 201
+        (record,) = tracker.records
+        assert record.endpoint == "/api/search"
+        assert record.status_code == 201
+        assert record.request_bytes == 20
+        assert record.response_bytes == 40
+        assert record.response_tokens == 10
+
+    def test_streaming_response_recorded_once(self, monkeypatch):
+        from starlette.responses import StreamingResponse
+
+        async def chunks():
+            for part in (b"a", b"b", b"c"):
+                yield part
+
+        async def search(request):
+            return StreamingResponse(chunks())
+
+        tracker = _FakeTracker()
+        client = _tracked_client(monkeypatch, tracker, search)
+        resp = client.post("/api/search")
+        assert resp.content == b"abc"
+        (record,) = tracker.records
+        assert record.response_bytes == 3  # summed from chunks, no header
+
+    def test_quota_exceeded_blocks_request(self, monkeypatch):
+        from starlette.responses import PlainTextResponse
+
+        calls = []
+
+        async def search(request):
+            calls.append(request)
+            return PlainTextResponse("never")
+
+        tracker = _FakeTracker(headroom=False)
+        client = _tracked_client(monkeypatch, tracker, search)
+        with pytest.raises(Exception):
+            client.post("/api/search")
+        assert calls == []
+        assert tracker.records == []
+
+    def test_quota_checks_never_wait_on_writer(self, monkeypatch, tmp_path):
+        import threading
+
+        from starlette.responses import PlainTextResponse
+
+        from flamehaven_filesearch.usage_tracker import UsageTracker
+
+        async def search(request):
+            return PlainTextResponse("ok")
+
+        tracker = UsageTracker(db_path=str(tmp_path / "usage.db"))
+        tracker.set_quota("key1", QuotaConfig(daily_requests=2))
+        stalled = threading.Event()
+        flushes = []
+        monkeypatch.setattr(
+            tracker, "_write_batch", lambda conn, batch: stalled.wait(5)
+        )
+        monkeypatch.setattr(tracker, "flush", lambda timeout=None: flushes.append(1))
+        client = _tracked_client(monkeypatch, tracker, search)
+        assert client.post("/api/search").status_code == 200
+        assert client.post("/api/search").status_code == 200
+        # Both records are still queued, yet they count toward the quota
+        with pytest.raises(Exception):
+            client.post("/api/search")
+        assert flushes == []
+        stalled.set()
+        tracker.close()
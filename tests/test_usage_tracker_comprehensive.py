@@ -22,7 +22,8 @@ from flamehaven_filesearch.usage_tracker import (
 def tracker(tmp_path):
     db_path = str(tmp_path / "test_usage.db")
     t = UsageTracker(db_path=db_path)
-    return t
+    yield t
+    t.close()
 
 
 def _make_record(
@@ -54,10 +55,18 @@ def _make_record(
 
 class TestUsageRecord:
     def test_totals_computed(self):
-        r = _make_record(req_tokens=100, resp_tokens=200, req_bytes=512, resp_bytes=1024)
+        r = _make_record(
+            req_tokens=100, resp_tokens=200, req_bytes=512, resp_bytes=1024
+        )
         assert r.total_tokens == 300
         assert r.total_bytes == 1536
 
+    def test_slotted(self):
+        r = _make_record(req_tokens=1, resp_tokens=2)
+        assert not hasattr(r, "__dict__")
+        r.response_tokens = 5
+        assert r.total_tokens == 6
+
     def test_default_timestamp(self):
         r = _make_record()
         assert r.timestamp is not None
@@ -68,6 +77,20 @@ class TestUsageRecord:
         r = UsageRecord("key1", "/api/search", timestamp=ts)
         assert r.timestamp == ts
 
+    def test_default_timestamp_cached_per_second(self, monkeypatch):
+        import flamehaven_filesearch.usage_tracker as ut
+
+        clock = [1735732800.2]
+        monkeypatch.setattr(ut.time, "time", lambda: clock[0])
+        monkeypatch.setattr(ut, "utc_now", ut._NowCache().now)
+        first = _make_record().timestamp
+        clock[0] = 1735732800.9
+        assert _make_record().timestamp is first
+        clock[0] = 1735732801.1
+        later = _make_record().timestamp
+        assert later is not first
+        assert later == datetime(2025, 1, 1, 12, 0, 1, tzinfo=timezone.utc)
+
 
 # ---------------------------------------------------------------------------
 # QuotaConfig
@@ -125,21 +148,164 @@ class TestUsageTrackerInit:
 
     def test_tables_created(self, tmp_path):
         db_path = str(tmp_path / "usage2.db")
-        UsageTracker(db_path=db_path)
+        t = UsageTracker(db_path=db_path)
+
+        def names(path, kind="table"):
+            with sqlite3.connect(path) as conn:
+                rows = conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type=?", (kind,)
+                ).fetchall()
+            return {row[0] for row in rows}
+
+        table_names = names(db_path)
+        assert "usage_records" in names(db_path, "view")
+        assert datetime.now(timezone.utc).strftime("usage_records_%Y%m") in table_names
+        assert "quota_configs" not in table_names
+        assert "usage_alerts" not in table_names
+        assert "quota_configs" in names(str(tmp_path / "usage2_config.db"))
+        assert "usage_alerts" in names(str(tmp_path / "usage2_alerts.db"))
+        assert t.config_db_path == str(tmp_path / "usage2_config.db")
+        assert t.alerts_db_path == str(tmp_path / "usage2_alerts.db")
+
+    def test_wal_journal_mode(self, tmp_path):
+        db_path = str(tmp_path / "usage3.db")
+        t = UsageTracker(db_path=db_path)
+        for path in (db_path, t.config_db_path, t.alerts_db_path):
+            with sqlite3.connect(path) as conn:
+                mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            assert mode == "wal"
+
+    def test_single_file_tables_moved_out(self, tmp_path):
+        db_path = str(tmp_path / "single.db")
         with sqlite3.connect(db_path) as conn:
-            tables = conn.execute(
-                "SELECT name FROM sqlite_master WHERE type='table'"
+            conn.execute(
+                "CREATE TABLE quota_configs (api_key_id TEXT PRIMARY KEY, "
+                "daily_requests INTEGER DEFAULT 10000, "
+                "daily_tokens INTEGER DEFAULT 1000000, "
+                "monthly_requests INTEGER DEFAULT 300000, "
+                "monthly_tokens INTEGER DEFAULT 30000000, "
+                "alert_threshold_pct REAL DEFAULT 80.0, "
+                "updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+            )
+            conn.execute(
+                "INSERT INTO quota_configs (api_key_id, daily_requests) "
+                "VALUES ('moved', 42)"
+            )
+        t = UsageTracker(db_path=db_path)
+        assert t.get_quota("moved").daily_requests == 42
+        with sqlite3.connect(db_path) as conn:
+            left = conn.execute(
+                "SELECT name FROM sqlite_master WHERE name='quota_configs'"
             ).fetchall()
-            table_names = {t[0] for t in tables}
-        assert "usage_records" in table_names
-        assert "quota_configs" in table_names
-        assert "usage_alerts" in table_names
+        assert left == []
+        t.close()
+
+    def test_legacy_alerts_bucketed_and_deduped(self, tmp_path):
+        db_path = str(tmp_path / "single_alerts.db")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "CREATE TABLE usage_alerts (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "api_key_id TEXT NOT NULL, alert_type TEXT NOT NULL, "
+                "threshold_pct REAL NOT NULL, current_usage INTEGER NOT NULL, "
+                "quota_limit INTEGER NOT NULL, "
+                "triggered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+            )
+            conn.executemany(
+                "INSERT INTO usage_alerts (api_key_id, alert_type, threshold_pct, "
+                "current_usage, quota_limit, triggered_at) VALUES (?, ?, 90, 9, 10, ?)",
+                [
+                    ("k", "daily_requests", "2025-01-01 10:05:00"),
+                    ("k", "daily_requests", "2025-01-01 10:55:00"),
+                    ("k", "daily_requests", "2025-01-01 11:05:00"),
+                ],
+            )
+        t = UsageTracker(db_path=db_path)
+        with sqlite3.connect(t.alerts_db_path) as conn:
+            rows = conn.execute(
+                "SELECT triggered_at, hour_bucket FROM usage_alerts ORDER BY id"
+            ).fetchall()
+        hour = int(datetime(2025, 1, 1, 10, tzinfo=timezone.utc).timestamp()) // 3600
+        assert rows == [
+            ("2025-01-01 10:05:00", hour),
+            ("2025-01-01 11:05:00", hour + 1),
+        ]
+        t.close()
+
+    def test_legacy_iso_timestamps_migrated(self, tmp_path):
+        db_path = str(tmp_path / "legacy.db")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE usage_records (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    api_key_id TEXT NOT NULL,
+                    endpoint TEXT NOT NULL,
+                    request_tokens INTEGER DEFAULT 0,
+                    response_tokens INTEGER DEFAULT 0,
+                    total_tokens INTEGER DEFAULT 0,
+                    request_bytes INTEGER DEFAULT 0,
+                    response_bytes INTEGER DEFAULT 0,
+                    total_bytes INTEGER DEFAULT 0,
+                    duration_ms REAL DEFAULT 0.0,
+                    status_code INTEGER DEFAULT 200,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """)
+            conn.execute(
+                "INSERT INTO usage_records (api_key_id, endpoint, timestamp) "
+                "VALUES ('old', '/api/search', '2025-01-01T12:00:00.123456+00:00')"
+            )
+        t = UsageTracker(db_path=db_path)
+        with sqlite3.connect(db_path) as conn:
+            ts_ms = conn.execute("SELECT ts_ms FROM usage_records").fetchone()[0]
+            columns = {
+                row[1] for row in conn.execute("PRAGMA table_info(usage_records)")
+            }
+        assert ts_ms == 1735732800123
+        assert "usage_records_202501" in {
+            row[0]
+            for row in sqlite3.connect(db_path).execute(
+                "SELECT name FROM sqlite_master WHERE type='table'"
+            )
+        }
+        if sqlite3.sqlite_version_info >= (3, 35):
+            assert not {"total_tokens", "total_bytes"} & columns
+        stats = t.get_usage_stats(
+            "old",
+            start_time=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            end_time=datetime(2025, 1, 2, tzinfo=timezone.utc),
+        )
+        assert stats.total_requests == 1
+        t.close()
+
+    def test_connections_are_tuned(self, tracker):
+        conn = tracker._connect()
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+    def test_connection_reused_per_thread(self, tracker):
+        import threading
+
+        assert tracker._connect() is tracker._connect()
+        other = []
+        thread = threading.Thread(target=lambda: other.append(tracker._connect()))
+        thread.start()
+        thread.join()
+        assert other[0] is not tracker._connect()
+
+    def test_close_drops_cached_connections(self, tracker):
+        before = tracker._connect()
+        tracker.close()
+        after = tracker._connect()
+        assert after is not before
+        assert after.execute("SELECT 1").fetchone() == (1,)
 
 
 class TestRecordUsage:
     def test_record_basic(self, tracker):
         r = _make_record()
         tracker.record_usage(r)
+        assert tracker.flush(timeout=5)
         with sqlite3.connect(tracker.db_path) as conn:
             count = conn.execute("SELECT COUNT(*) FROM usage_records").fetchone()[0]
         assert count == 1
@@ -147,10 +313,143 @@ class TestRecordUsage:
     def test_record_multiple(self, tracker):
         for i in range(5):
             tracker.record_usage(_make_record(endpoint=f"/api/endpoint{i}"))
+        assert tracker.flush(timeout=5)
         with sqlite3.connect(tracker.db_path) as conn:
             count = conn.execute("SELECT COUNT(*) FROM usage_records").fetchone()[0]
         assert count == 5
 
+    def test_writes_happen_off_the_calling_thread(self, tracker, monkeypatch):
+        import threading
+
+        writer_threads = []
+        original = tracker._write_batch
+
+        def spy(conn, batch):
+            writer_threads.append(threading.current_thread())
+            original(conn, batch)
+
+        monkeypatch.setattr(tracker, "_write_batch", spy)
+        tracker.record_usage(_make_record())
+        assert tracker.flush(timeout=5)
+        assert writer_threads
+        assert threading.current_thread() not in writer_threads
+
+    def test_queued_records_are_batched(self, tmp_path, monkeypatch):
+        import threading
+
+        t = UsageTracker(db_path=str(tmp_path / "batched.db"), write_batch_size=3)
+        batches = []
+        gate = threading.Event()
+        original_write = t._write_batch
+        original_loop = t._writer_loop
+
+        def counting_write(conn, batch):
+            batches.append(len(batch))
+            original_write(conn, batch)
+
+        def gated_loop():
+            gate.wait(5)  # let records pile up before the writer drains them
+            original_loop()
+
+        monkeypatch.setattr(t, "_write_batch", counting_write)
+        monkeypatch.setattr(t, "_writer_loop", gated_loop)
+        for _ in range(7):
+            t.record_usage(_make_record())
+        gate.set()
+        assert t.flush(timeout=5)
+        assert batches == [3, 3, 1]
+        assert t.get_usage_stats("key1").total_requests == 7
+        t.close()
+
+    def test_batch_inserted_in_one_immediate_transaction(self, tmp_path, monkeypatch):
+        t = UsageTracker(db_path=str(tmp_path / "immediate.db"))
+        statements = []
+        original_write = t._write_batch
+
+        def traced_write(conn, batch):
+            conn.set_trace_callback(statements.append)
+            try:
+                original_write(conn, batch)
+            finally:
+                conn.set_trace_callback(None)
+
+        monkeypatch.setattr(t, "_write_batch", traced_write)
+        t.record_usage(_make_record())
+        assert t.flush(timeout=5)
+        assert statements[0] == "BEGIN IMMEDIATE"
+        assert statements.count("COMMIT") == 1
+        t.close()
+
+    def test_rolled_back_partition_is_forgotten(self, tracker):
+        bad = _make_record(api_key_id=None)  # violates NOT NULL
+        bad.timestamp = datetime(2031, 3, 1, tzinfo=timezone.utc)
+        tracker.record_usage(bad)
+        assert tracker.flush(timeout=5)
+        assert "usage_records_203103" not in tracker._partitions
+
+        good = _make_record(api_key_id="later")
+        good.timestamp = bad.timestamp
+        tracker.record_usage(good)
+        assert tracker.flush(timeout=5)
+        assert tracker.get_usage_stats("later").total_requests == 1
+
+    def test_connect_failure_does_not_stall_flush(self, tracker, monkeypatch):
+        def broken_connect():
+            raise sqlite3.OperationalError("unable to open database file")
+
+        tracker.close()
+        monkeypatch.setattr(tracker, "_connect", broken_connect)
+        tracker.record_usage(_make_record())
+        assert tracker.flush(timeout=5)
+        assert tracker._writer.is_alive()
+
+    def test_reads_do_not_wait_forever_on_writer(self, tracker, monkeypatch):
+        import threading
+
+        gate = threading.Event()
+        original = tracker._write_batch
+
+        def stalled_write(conn, batch):
+            gate.wait(5)
+            original(conn, batch)
+
+        monkeypatch.setattr(tracker, "_write_batch", stalled_write)
+        monkeypatch.setattr(tracker, "READ_FLUSH_TIMEOUT_SEC", 0.05)
+        tracker.record_usage(_make_record(api_key_id="stalled"))
+        assert tracker.get_usage_stats("stalled").total_requests == 0
+        gate.set()
+        assert tracker.flush(timeout=5)
+        assert tracker.get_usage_stats("stalled").total_requests == 1
+
+    def test_failed_batch_falls_back_to_single_rows(self, tmp_path, monkeypatch):
+        import threading
+
+        t = UsageTracker(db_path=str(tmp_path / "fallback.db"))
+        gate = threading.Event()
+        original_loop = t._writer_loop
+
+        def gated_loop():
+            gate.wait(5)  # queue the whole batch before the writer starts
+            original_loop()
+
+        monkeypatch.setattr(t, "_writer_loop", gated_loop)
+        t.record_usage(_make_record(api_key_id="good"))
+        t.record_usage(_make_record(api_key_id=None))  # violates NOT NULL
+        t.record_usage(_make_record(api_key_id="good"))
+        gate.set()
+        assert t.flush(timeout=5)
+        assert t.get_usage_stats().total_requests == 2
+        t.close()
+
+    def test_close_drains_queue(self, tmp_path):
+        t = UsageTracker(db_path=str(tmp_path / "closed.db"))
+        for _ in range(3):
+            t.record_usage(_make_record())
+        t.close()
+        with sqlite3.connect(t.db_path) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM usage_records").fetchone()[0]
+        assert count == 3
+
 
 class TestSetGetQuota:
     def test_set_and_get_quota(self, tracker):
@@ -170,6 +469,34 @@ class TestSetGetQuota:
         q = tracker.get_quota("key1")
         assert q.daily_requests == 200
 
+    def test_get_quota_is_cached(self, tracker):
+        tracker.get_quota("cached")
+        statements = []
+        tracker._connect().set_trace_callback(statements.append)
+        tracker.get_quota("cached")
+        tracker.check_quota_exceeded("cached")
+        assert not any("quota_configs" in sql for sql in statements)
+
+    def test_set_quota_invalidates_cache(self, tracker):
+        assert tracker.get_quota("key1").daily_requests == 10000
+        tracker.set_quota("key1", QuotaConfig(daily_requests=7))
+        assert tracker.get_quota("key1").daily_requests == 7
+
+    def test_quota_cache_expires(self, tracker, monkeypatch):
+        import flamehaven_filesearch.usage_tracker as ut
+
+        now = [1000.0]
+        monkeypatch.setattr(ut.time, "monotonic", lambda: now[0])
+        tracker.get_quota("key1")
+        with sqlite3.connect(tracker.config_db_path) as conn:  # another process
+            conn.execute(
+                "INSERT INTO quota_configs (api_key_id, daily_requests) "
+                "VALUES ('key1', 3)"
+            )
+        assert tracker.get_quota("key1").daily_requests == 10000
+        now[0] += tracker.QUOTA_CACHE_TTL_SEC
+        assert tracker.get_quota("key1").daily_requests == 3
+
 
 class TestCheckQuota:
     def test_no_usage_not_exceeded(self, tracker):
@@ -191,6 +518,137 @@ class TestCheckQuota:
         result = tracker.check_quota_exceeded("key_tok")
         assert result["exceeded"] is True
 
+    def test_quota_status_flags_exceeded_fields(self, tracker):
+        tracker.set_quota("mask", QuotaConfig(daily_requests=1, monthly_tokens=10))
+        tracker.record_usage(
+            _make_record(api_key_id="mask", req_tokens=5, resp_tokens=5)
+        )
+        status = tracker.get_quota_status("mask")
+        assert not hasattr(status, "__dict__")
+        assert status.exceeded_mask == 0b1001
+        report = status.to_dict()
+        assert report["daily"]["requests"] == {
+            "current": 1,
+            "limit": 1,
+            "exceeded": True,
+            "pct": 100.0,
+        }
+        assert report["daily"]["tokens"]["exceeded"] is False
+        assert report["monthly"]["tokens"]["exceeded"] is True
+
+    def test_daily_and_monthly_split(self, tracker):
+        now = datetime.now(timezone.utc)
+        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        if now.date() == month_start.date():
+            pytest.skip("no earlier day in the current month")
+        earlier = _make_record(api_key_id="split", req_tokens=10, resp_tokens=0)
+        earlier.timestamp = month_start
+        tracker.record_usage(earlier)
+        tracker.record_usage(
+            _make_record(api_key_id="split", req_tokens=5, resp_tokens=0)
+        )
+        result = tracker.check_quota_exceeded("split")
+        assert result["daily"]["requests"]["current"] == 1
+        assert result["daily"]["tokens"]["current"] == 5
+        assert result["monthly"]["requests"]["current"] == 2
+        assert result["monthly"]["tokens"]["current"] == 15
+
+    def test_single_usage_query(self, tracker):
+        tracker.record_usage(_make_record(api_key_id="q1"))
+        tracker.flush()
+        tracker._counters.clear()  # cold start: counter built from SQL
+        statements = []
+        tracker._connect().set_trace_callback(statements.append)
+        tracker.check_quota_exceeded("q1")
+        assert sum("usage_records" in sql for sql in statements) == 1
+
+    def test_warm_counter_skips_sql(self, tracker):
+        tracker.set_quota("warm", QuotaConfig(daily_requests=3))
+        assert tracker.check_quota_exceeded("warm")["exceeded"] is False
+        statements = []
+        tracker._connect().set_trace_callback(statements.append)
+        for _ in range(3):
+            tracker.record_usage(_make_record(api_key_id="warm", resp_tokens=0))
+        result = tracker.check_quota_exceeded("warm")
+        assert result["daily"]["requests"]["current"] == 3
+        assert result["daily"]["tokens"]["current"] == 300
+        assert result["exceeded"] is True
+        assert not any("FROM usage_records" in sql for sql in statements)
+
+    def test_counter_picks_up_other_process_usage(self, tracker, monkeypatch):
+        import flamehaven_filesearch.usage_tracker as ut
+
+        clock = [1000.0]
+        monkeypatch.setattr(ut.time, "monotonic", lambda: clock[0])
+        other = UsageTracker(db_path=tracker.db_path)
+        try:
+            assert other.get_quota_status("shared").daily_requests == 0
+            for _ in range(2):
+                tracker.record_usage(_make_record(api_key_id="shared"))
+            assert tracker.flush(timeout=5)
+            assert other.get_quota_status("shared").daily_requests == 0  # cached
+            clock[0] += other.COUNTER_REFRESH_SEC
+            assert other.get_quota_status("shared").daily_requests == 2
+        finally:
+            other.close()
+
+    def test_stale_counter_served_while_writer_commits(self, tracker, monkeypatch):
+        tracker.record_usage(_make_record(api_key_id="busy"))
+        assert tracker.get_quota_status("busy").daily_requests == 1
+        monkeypatch.setattr(tracker, "COUNTER_REFRESH_SEC", 0.0)
+        with tracker._counters_lock:  # as if the writer were mid-commit
+            assert tracker.get_quota_status("busy").daily_requests == 1
+
+    def test_period_starts_cached_until_next_day(self):
+        from flamehaven_filesearch.usage_tracker import _period_starts
+
+        morning = datetime(2025, 3, 31, 8, 0, tzinfo=timezone.utc)
+        starts = _period_starts(morning)
+        assert starts == (
+            int(datetime(2025, 3, 31, tzinfo=timezone.utc).timestamp() * 1000),
+            int(datetime(2025, 3, 1, tzinfo=timezone.utc).timestamp() * 1000),
+        )
+        assert _period_starts(morning.replace(hour=23, minute=59)) is starts
+        next_day = _period_starts(datetime(2025, 4, 1, 0, 0, tzinfo=timezone.utc))
+        assert next_day[0] == next_day[1] == starts[0] + 86_400_000
+
+    def test_counter_rebuilt_after_day_rollover(self, tracker):
+        tracker.record_usage(_make_record(api_key_id="roll"))
+        tracker.check_quota_exceeded("roll")
+        tracker._counters["roll"].day_start_ms -= 86_400_000  # pretend yesterday
+        tracker._counters["roll"].day_requests = 99
+        result = tracker.check_quota_exceeded("roll")
+        assert result["daily"]["requests"]["current"] == 1
+
+
+class TestQuotaHeadroom:
+    def test_unknown_key_has_no_headroom(self, tracker):
+        assert tracker.has_quota_headroom("never_seen") is False
+
+    def test_light_usage_has_headroom(self, tracker):
+        tracker.record_usage(_make_record(api_key_id="light"))
+        tracker.flush()
+        assert tracker.has_quota_headroom("light") is True
+
+    def test_half_quota_loses_headroom(self, tracker):
+        tracker.set_quota("busy", QuotaConfig(daily_requests=4))
+        for _ in range(2):
+            tracker.record_usage(_make_record(api_key_id="busy"))
+        tracker.flush()
+        assert tracker.has_quota_headroom("busy") is False
+
+    def test_set_quota_resets_headroom(self, tracker):
+        tracker.record_usage(_make_record(api_key_id="light"))
+        tracker.flush()
+        tracker.set_quota("light", QuotaConfig(daily_requests=1))
+        assert tracker.has_quota_headroom("light") is False
+
+    def test_global_quota_change_resets_all_keys(self, tracker):
+        tracker.record_usage(_make_record(api_key_id="light"))
+        tracker.flush()
+        tracker.set_quota(tracker.GLOBAL_QUOTA_KEY, QuotaConfig(daily_requests=1))
+        assert tracker.has_quota_headroom("light") is False
+
 
 class TestGetUsageStats:
     def test_empty_stats(self, tracker):
@@ -244,9 +702,43 @@ class TestGetUsageStats:
         now = datetime.now(timezone.utc)
         tracker.record_usage(_make_record(api_key_id="k6"))
         start = now - timedelta(hours=1)
-        stats = tracker.get_usage_stats("k6", start_time=start, end_time=now + timedelta(hours=1))
+        stats = tracker.get_usage_stats(
+            "k6", start_time=start, end_time=now + timedelta(hours=1)
+        )
         assert stats.total_requests >= 1
 
+    def test_stats_aggregate_uses_covering_index(self, tracker):
+        old = _make_record(api_key_id="k7")
+        old.timestamp = datetime(2025, 1, 15, tzinfo=timezone.utc)
+        tracker.record_usage(old)
+        tracker.record_usage(_make_record(api_key_id="k7"))
+        tracker.flush()
+        statements = []
+        conn = tracker._connect()
+        conn.set_trace_callback(statements.append)
+        stats = tracker.get_usage_stats("k7", start_time=old.timestamp)
+        conn.set_trace_callback(None)
+        assert stats.total_requests == 2
+        aggregate = next(sql for sql in statements if "AVG(duration_ms)" in sql)
+        plan = conn.execute("EXPLAIN QUERY PLAN " + aggregate).fetchall()
+        searches = [row[-1] for row in plan if row[-1].startswith("SEARCH")]
+        assert len(searches) == 2  # one per monthly partition
+        assert all("USING COVERING INDEX" in detail for detail in searches)
+
+    def test_stats_skip_partitions_outside_range(self, tracker):
+        old = _make_record(api_key_id="k8")
+        old.timestamp = datetime(2025, 1, 15, tzinfo=timezone.utc)
+        tracker.record_usage(old)
+        tracker.record_usage(_make_record(api_key_id="k8"))
+        statements = []
+        tracker.flush()
+        tracker._connect().set_trace_callback(statements.append)
+        stats = tracker.get_usage_stats(
+            "k8", start_time=datetime.now(timezone.utc) - timedelta(hours=1)
+        )
+        assert stats.total_requests == 1
+        assert not any("usage_records_202501" in sql for sql in statements)
+
 
 class TestAlerts:
     def test_alert_triggered_when_threshold_exceeded(self, tracker):
@@ -255,10 +747,56 @@ class TestAlerts:
         for _ in range(2):
             tracker.record_usage(_make_record(api_key_id="ka"))
         # Just verify no exception; alerts may have fired
-        with sqlite3.connect(tracker.db_path) as conn:
+        with sqlite3.connect(tracker.alerts_db_path) as conn:
             count = conn.execute("SELECT COUNT(*) FROM usage_alerts").fetchone()[0]
         assert count >= 0
 
+    def test_alert_fires_once_per_period(self, tracker):
+        tracker.set_quota(
+            "once", QuotaConfig(daily_requests=4, alert_threshold_pct=50.0)
+        )
+        for _ in range(4):
+            tracker.record_usage(_make_record(api_key_id="once", resp_tokens=0))
+            tracker.flush()
+        alerts = tracker.get_recent_alerts(api_key_id="once")
+        assert [a["alert_type"] for a in alerts] == ["daily_requests"]
+
+    def test_alert_deduped_within_hour(self, tracker, monkeypatch):
+        import flamehaven_filesearch.usage_tracker as ut
+
+        clock = [datetime(2025, 1, 1, 10, 5, tzinfo=timezone.utc)]
+        monkeypatch.setattr(ut, "utc_now", lambda: clock[0])
+        tracker._trigger_alert("dup", "daily_requests", 90.0, 9, 10)
+        clock[0] = clock[0].replace(minute=55)
+        tracker._trigger_alert("dup", "daily_requests", 95.0, 10, 10)
+        tracker._trigger_alert("dup", "daily_tokens", 95.0, 10, 10)
+        clock[0] = clock[0].replace(hour=11, minute=0)
+        tracker._trigger_alert("dup", "daily_requests", 99.0, 10, 10)
+        with sqlite3.connect(tracker.alerts_db_path) as conn:
+            rows = conn.execute(
+                "SELECT alert_type, threshold_pct FROM usage_alerts ORDER BY id"
+            ).fetchall()
+        assert rows == [
+            ("daily_requests", 90.0),
+            ("daily_tokens", 95.0),
+            ("daily_requests", 99.0),
+        ]
+
+    def test_set_quota_rearms_alerts(self, tracker, monkeypatch):
+        fired = []
+        monkeypatch.setattr(tracker, "_trigger_alert", lambda *args: fired.append(args))
+        tracker.set_quota(
+            "rearm", QuotaConfig(daily_requests=2, alert_threshold_pct=50.0)
+        )
+        tracker.record_usage(_make_record(api_key_id="rearm", resp_tokens=0))
+        tracker.flush()
+        tracker.set_quota(
+            "rearm", QuotaConfig(daily_requests=2, alert_threshold_pct=50.0)
+        )
+        tracker.record_usage(_make_record(api_key_id="rearm", resp_tokens=0))
+        tracker.flush()
+        assert [args[1] for args in fired] == ["daily_requests", "daily_requests"]
+
 
 class TestGetRecentAlerts:
     def test_empty_alerts(self, tracker):
@@ -266,7 +804,9 @@ class TestGetRecentAlerts:
         assert alerts == []
 
     def test_alerts_after_quota_exceed(self, tracker):
-        tracker.set_quota("ka2", QuotaConfig(daily_requests=1, alert_threshold_pct=50.0))
+        tracker.set_quota(
+            "ka2", QuotaConfig(daily_requests=1, alert_threshold_pct=50.0)
+        )
         tracker.record_usage(_make_record(api_key_id="ka2"))
         tracker.record_usage(_make_record(api_key_id="ka2"))
         alerts = tracker.get_recent_alerts(api_key_id="ka2")
@@ -298,6 +838,50 @@ class TestGetUsageTrend:
         assert isinstance(trend, list)
 
 
+class TestCleanupOldRecords:
+    def _record_at(self, tracker, moment):
+        record = _make_record(api_key_id="old")
+        record.timestamp = moment
+        tracker.record_usage(record)
+
+    def _tables(self, tracker):
+        with sqlite3.connect(tracker.db_path) as conn:
+            rows = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table'"
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def test_expired_months_dropped_whole(self, tracker):
+        self._record_at(tracker, datetime(2025, 1, 10, tzinfo=timezone.utc))
+        self._record_at(tracker, datetime(2025, 1, 20, tzinfo=timezone.utc))
+        tracker.record_usage(_make_record(api_key_id="new"))
+        tracker.flush()
+        assert "usage_records_202501" in self._tables(tracker)
+
+        assert tracker.cleanup_old_records(days=90) == 2
+        assert "usage_records_202501" not in self._tables(tracker)
+        assert tracker.get_usage_stats().total_requests == 1
+
+    def test_boundary_month_deleted_by_row(self, tracker):
+        now = datetime.now(timezone.utc)
+        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        if now - month_start < timedelta(days=2):
+            pytest.skip("needs two days of the current month")
+        self._record_at(tracker, month_start)
+        tracker.record_usage(_make_record(api_key_id="new"))
+        tracker.flush()
+        assert tracker.cleanup_old_records(days=1) == 1
+        assert tracker.get_usage_stats().total_requests == 1
+
+    def test_view_survives_cleanup_of_everything(self, tracker):
+        self._record_at(tracker, datetime(2025, 1, 10, tzinfo=timezone.utc))
+        tracker.flush()
+        tracker.cleanup_old_records(days=0)
+        assert tracker.get_usage_stats().total_requests == 0
+        tracker.record_usage(_make_record(api_key_id="new"))
+        assert tracker.get_usage_stats().total_requests == 1
+
+
 class TestCheckGlobalQuota:
     def test_global_quota_not_exceeded(self, tracker):
         result = tracker.check_global_quota_exceeded()
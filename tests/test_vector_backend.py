@@ -49,6 +49,17 @@ def test_postgres_vector_store_roundtrip():
         results = store.query("default", [0.1, 0.2, 0.3], top_k=1)
         assert results
         assert results[0][0].get("file_name") == "example.txt"
+
+        store.add_vectors(
+            "batch",
+            [
+                (f"local://batch/{i}.txt", [0.1 * i, 0.2, 0.3], {"file_name": f"{i}"})
+                for i in range(1, 6)
+            ],
+            batch_size=2,
+        )
+        assert len(store.query("batch", [0.1, 0.2, 0.3], top_k=10)) == 5
     finally:
+        store.close()
         with psycopg.connect(dsn) as conn:
             conn.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
@@ -12,6 +12,7 @@ import pytest
 from flamehaven_filesearch.vector_store import (
     CircuitBreaker,
     CircuitState,
+    PostgresVectorStore,
     retry_with_backoff,
 )
 
@@ -225,3 +226,80 @@ class TestCreateVectorStore:
         config = Config(api_key=None)
         result = create_vector_store(config, 384)
         assert result is None  # no postgres DSN configured
+
+
+class FakeStore:
+    def __init__(self, **settings):
+        self.settings = settings
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_stores(monkeypatch):
+    from flamehaven_filesearch import vector_store
+
+    monkeypatch.setattr(vector_store, "PostgresVectorStore", FakeStore)
+    monkeypatch.setattr(vector_store, "_STORE_CACHE_SIZE", 2)
+    yield vector_store
+    vector_store.close_vector_stores()
+
+
+def _postgres_config(table):
+    from flamehaven_filesearch.config import Config
+
+    config = Config(api_key=None)
+    config.vector_backend = "postgres"
+    config.postgres_dsn = "postgresql://localhost/test"
+    config.vector_postgres_table = table
+    return config
+
+
+class TestVectorStoreCache:
+    def test_same_settings_share_a_store(self, fake_stores):
+        first = fake_stores.create_vector_store(_postgres_config("a"), 3)
+        assert fake_stores.create_vector_store(_postgres_config("a"), 3) is first
+
+    def test_closed_store_is_rebuilt(self, fake_stores):
+        first = fake_stores.create_vector_store(_postgres_config("a"), 3)
+        first.close()
+        second = fake_stores.create_vector_store(_postgres_config("a"), 3)
+        assert second is not first and not second.closed
+
+    def test_evicted_store_is_closed(self, fake_stores):
+        oldest = fake_stores.create_vector_store(_postgres_config("a"), 3)
+        fake_stores.create_vector_store(_postgres_config("b"), 3)
+        fake_stores.create_vector_store(_postgres_config("c"), 3)
+        assert oldest.closed
+
+    def test_close_vector_stores_closes_all(self, fake_stores):
+        stores = [
+            fake_stores.create_vector_store(_postgres_config(table), 3)
+            for table in ("a", "b")
+        ]
+        fake_stores.close_vector_stores()
+        assert all(store.closed for store in stores)
+        assert fake_stores.create_vector_store(_postgres_config("a"), 3) not in stores
+
+
+# ---------------------------------------------------------------------------
+# PostgresVectorStore identifier validation (no database needed)
+# ---------------------------------------------------------------------------
+
+
+class TestValidateIdentifier:
+    @pytest.mark.parametrize("name", ["public", "_vecs", "T1", "a" * 63])
+    def test_valid(self, name):
+        assert PostgresVectorStore._validate_identifier(name) == name
+
+    def test_empty_passes_through(self):
+        assert PostgresVectorStore._validate_identifier("") == ""
+
+    @pytest.mark.parametrize(
+        "name", ["1vecs", "vecs;drop", "my-table", "vecs\n", "a" * 64]
+    )
+    def test_invalid(self, name):
+        with pytest.raises(ValueError):
+            PostgresVectorStore._validate_identifier(name)